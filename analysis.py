@@ -3,8 +3,12 @@ Analysis module for musician network statistics.
 Handles top musicians, session musicians, and detailed musician analysis.
 """
 
+import numpy as np
 import pandas as pd
 
+from data_processor import split_filter_values
+from graph_metrics import csr_from_pairs
+
 
 def analyze_top_musicians(network_df, collection_df):
     """
@@ -119,19 +123,88 @@ def get_musician_debug_info(musician_name, network_df, musician_stats_df):
     }
 
 
-def get_top_musicians_by_metric(musician_stats_df, metric='total_records', limit=20):
+def _rank_keys(values):
+    """Sort keys for a metric column: missing values rank below every number."""
+    values = np.asarray(values, dtype=np.float64)
+    return np.where(np.isnan(values), -np.inf, values)
+
+
+def top_positions(values, k, offset=0):
+    """
+    Row positions of the largest values, for ranks offset to offset + k.
+    
+    Uses np.partition to find the cut-off value, so only the rows above it
+    are sorted. Ties keep row order, as in build_metric_ranks.
+    
+    Args:
+        values: Numeric array
+        k: Number of positions to return
+        offset: Number of top positions to skip
+        
+    Returns:
+        numpy.ndarray of row positions, highest value first
+    """
+    keys = _rank_keys(values)
+    end = min(max(offset + k, 0), len(keys))
+    if end == 0:
+        return np.zeros(0, dtype=np.int64)
+    if end < len(keys):
+        threshold = np.partition(keys, len(keys) - end)[len(keys) - end]
+        candidates = np.flatnonzero(keys >= threshold)
+    else:
+        candidates = np.arange(len(keys))
+    order = candidates[np.argsort(-keys[candidates], kind='stable')]
+    return order[offset:end].astype(np.int64)
+
+
+def build_metric_ranks(musician_stats_df, metrics=None):
+    """
+    Precompute the order of the musicians for each ranking metric.
+    
+    Args:
+        musician_stats_df: Statistics DataFrame
+        metrics: Columns to rank; defaults to every numeric column
+                 (total_records, as_session_musician, session_ratio, ...
+                 and the centrality columns)
+        
+    Returns:
+        Dictionary of metric -> int32 array of row positions, highest value
+        first (ties keep row order); the top k rows of a metric are
+        ranks[metric][:k]
+    """
+    if metrics is None:
+        metrics = [
+            column for column in musician_stats_df.columns
+            if pd.api.types.is_numeric_dtype(musician_stats_df[column])
+            and not pd.api.types.is_bool_dtype(musician_stats_df[column])
+        ]
+    return {
+        metric: np.argsort(-_rank_keys(musician_stats_df[metric]), kind='stable').astype(np.int32)
+        for metric in metrics
+    }
+
+
+def get_top_musicians_by_metric(musician_stats_df, metric='total_records', limit=20, offset=0, ranks=None):
     """
     Get top musicians by a specific metric.
     
     Args:
         musician_stats_df: Statistics DataFrame
-        metric: Metric to sort by ('total_records', 'as_session_musician', etc.)
+        metric: Metric to sort by ('total_records', 'as_session_musician', etc.,
+                or a centrality column added by graph_metrics.add_centrality_metrics)
         limit: Number of musicians to return
+        offset: Number of top musicians to skip (for paging)
+        ranks: Optional dictionary from build_metric_ranks; metrics it covers
+               are read in O(limit), others are selected with a partition
         
     Returns:
         pandas.DataFrame of top musicians
     """
-    return musician_stats_df.sort_values(metric, ascending=False).head(limit)
+    if ranks is not None and metric in ranks:
+        positions = ranks[metric][offset:offset + limit]
+    else:
+        positions = top_positions(musician_stats_df[metric], limit, offset)
+    return musician_stats_df.iloc[positions]
 
 
 def get_collaboration_stats(network_df):
@@ -158,14 +231,103 @@ def search_musicians(musician_stats_df, search_term, limit=10):
     
     Args:
         musician_stats_df: Statistics DataFrame
-        search_term: String to search for in musician names
+        search_term: Text to search for in musician names (matched literally)
         limit: Maximum number of results
         
     Returns:
         pandas.DataFrame of matching musicians
     """
     matching_musicians = musician_stats_df[
-        musician_stats_df['musician'].str.contains(search_term, case=False, na=False)
+        musician_stats_df['musician'].str.contains(search_term, case=False, na=False, regex=False)
     ].sort_values('total_records', ascending=False).head(limit)
     
-    return matching_musicians 
+    return matching_musicians
+
+
+def build_musician_filter_matrices(network_df, collection_df, musician_stats_df, custom_filter_data):
+    """
+    Build sparse musician aggregates for filtering the statistics in the browser.
+    
+    The matrices share one row per musician/record appearance ("pair"), so the
+    filtered record counts for any combination of role and custom filters are
+    a masked row-sum of musician_records:
+    
+        musician_records: musicians x records (rows in musician_stats_df order);
+                          data is 1 where the musician is the record's main artist
+        pair_roles: pairs x roles, the roles credited on each appearance
+        record_values: per custom column, records x values (value indices
+                       follow custom_filter_data[column])
+        record_artists: main artist of each record, as an index into artists
+    
+    Args:
+        network_df: DataFrame from create_network_data
+        collection_df: Original collection DataFrame
+        musician_stats_df: DataFrame from analyze_top_musicians
+        custom_filter_data: Dictionary from get_custom_filter_data
+        
+    Returns:
+        Dictionary of label lists and CSR (indptr, indices[, data]) arrays
+    """
+    # Records are keyed as in analyze_top_musicians
+    record_keys = network_df['main_artist'].astype(str) + ' - ' + network_df['album'].astype(str)
+    record_codes, record_labels = pd.factorize(record_keys)
+    role_codes, role_labels = pd.factorize(network_df['role'])
+    artist_codes, artist_labels = pd.factorize(network_df['main_artist'])
+    record_artists = np.zeros(len(record_labels), dtype=np.int64)
+    record_artists[record_codes] = artist_codes
+    
+    musician_index = pd.Series(np.arange(len(musician_stats_df)), index=musician_stats_df['musician'])
+    musician_codes = musician_index.reindex(network_df['musician']).to_numpy()
+    known = ~np.isnan(musician_codes) & (role_codes >= 0)
+    musician_codes = musician_codes[known].astype(np.int64)
+    record_codes = record_codes[known]
+    role_codes = role_codes[known]
+    
+    # One pair per musician/record, in CSR order (sorted by musician, then record)
+    n_musicians = len(musician_stats_df)
+    n_records = max(len(record_labels), 1)
+    unique_keys, pair_codes = np.unique(musician_codes * n_records + record_codes, return_inverse=True)
+    pair_musicians = unique_keys // n_records
+    pair_records = unique_keys % n_records
+    
+    musician_names = musician_stats_df['musician'].to_numpy()
+    record_array = np.asarray(record_labels)
+    is_main = np.fromiter(
+        (record_array[r].startswith(f"{musician_names[m]} - ") for m, r in zip(pair_musicians, pair_records)),
+        dtype=np.uint8,
+        count=len(unique_keys)
+    )
+    record_indptr = np.zeros(n_musicians + 1, dtype=np.int64)
+    np.cumsum(np.bincount(pair_musicians, minlength=n_musicians), out=record_indptr[1:])
+    
+    role_indptr, role_indices = csr_from_pairs(pair_codes, role_codes, len(unique_keys))
+    
+    # Custom column values per record, expanded as the filter lists are
+    record_position = pd.Series(np.arange(len(record_labels)), index=record_labels)
+    collection_keys = collection_df['Artist'].astype(str) + ' - ' + collection_df['Album'].astype(str)
+    collection_records = record_position.reindex(collection_keys).to_numpy()
+    record_values = {}
+    for column, values in custom_filter_data.items():
+        value_index = {value: i for i, value in enumerate(values)}
+        rows, columns = [], []
+        for record, cell in zip(collection_records, collection_df[column]):
+            if np.isnan(record) or pd.isna(cell):
+                continue
+            for value in split_filter_values(cell):
+                if value in value_index:
+                    rows.append(int(record))
+                    columns.append(value_index[value])
+        indptr, indices = csr_from_pairs(
+            np.asarray(rows, dtype=np.int64), np.asarray(columns, dtype=np.int64), len(record_labels)
+        )
+        record_values[column] = {'indptr': indptr, 'indices': indices}
+    
+    return {
+        'roles': role_labels.tolist(),
+        'record_count': len(record_labels),
+        'musician_records': {'indptr': record_indptr, 'indices': pair_records, 'data': is_main},
+        'pair_roles': {'indptr': role_indptr, 'indices': role_indices},
+        'record_values': record_values,
+        'artists': artist_labels.tolist(),
+        'record_artists': record_artists
+    }
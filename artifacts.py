@@ -0,0 +1,407 @@
+"""
+Memory-mapped artifact module for musician network analysis.
+Persists the processed network (node and link attribute columns, CSR
+adjacency, musician statistics) as .npy files with dictionary-encoded
+strings, so any number of read-only query workers can open them with mmap
+and share one page-cached copy instead of each loading the network.
+"""
+
+import bisect
+import json
+import os
+from collections.abc import Mapping, Sequence
+from numbers import Number
+from pathlib import Path
+
+import numpy as np
+
+
+ARTIFACT_FORMAT = 'network-artifacts-v1'
+MANIFEST_NAME = 'manifest.json'
+
+# Network entries stored in the manifest rather than as columns
+NETWORK_METADATA = ('categories', 'genres', 'styles', 'clean_roles', 'community_categories', 'community_count')
+EGO_INDEX_ARRAYS = ('indptr', 'indices', 'link_ids', 'weights')
+
+
+class StringDictionary(Sequence):
+    """
+    Sorted unique strings stored as one UTF-8 buffer plus offsets.
+
+    Lookups decode only the strings they touch, so the buffer can stay
+    memory-mapped.
+    """
+
+    def __init__(self, data, offsets):
+        self.data = data
+        self.offsets = offsets
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, position):
+        return bytes(self.data[self.offsets[position]:self.offsets[position + 1]]).decode('utf-8')
+
+    def find(self, value):
+        """Position of value in the dictionary, or -1."""
+        position = bisect.bisect_left(self, value)
+        if position < len(self) and self[position] == value:
+            return position
+        return -1
+
+
+class StringColumn(Sequence):
+    """String column: one dictionary code per row."""
+
+    def __init__(self, codes, dictionary):
+        self.codes = codes
+        self.dictionary = dictionary
+
+    def __len__(self):
+        return len(self.codes)
+
+    def __getitem__(self, row):
+        return self.dictionary[self.codes[row]]
+
+
+class StringListColumn(Sequence):
+    """String list column: dictionary codes of all rows plus per-row offsets."""
+
+    def __init__(self, offsets, codes, dictionary):
+        self.offsets = offsets
+        self.codes = codes
+        self.dictionary = dictionary
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, row):
+        return [self.dictionary[code] for code in self.codes[self.offsets[row]:self.offsets[row + 1]]]
+
+
+class IndexListColumn(Sequence):
+    """Integer list column (genre/style indices): values of all rows plus per-row offsets."""
+
+    def __init__(self, offsets, values):
+        self.offsets = offsets
+        self.values = values
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, row):
+        return self.values[self.offsets[row]:self.offsets[row + 1]].tolist()
+
+
+class RowIndex(Mapping):
+    """
+    Read-only mapping of a unique string column's values to row numbers.
+
+    Uses binary search over the column's dictionary, so workers share the
+    mapped arrays instead of each building a dict.
+    """
+
+    def __init__(self, column, rows):
+        self.column = column
+        self.rows = rows
+
+    def __getitem__(self, value):
+        position = self.column.dictionary.find(value)
+        if position < 0:
+            raise KeyError(value)
+        return int(self.rows[position])
+
+    def __iter__(self):
+        return iter(self.column.dictionary)
+
+    def __len__(self):
+        return len(self.column.dictionary)
+
+
+class RecordView(Sequence):
+    """
+    Rows of a stored table, built as dictionaries on access.
+
+    Behaves like the list of node, link or statistics records it was saved
+    from, so code written against network_data works unchanged.
+    """
+
+    def __init__(self, rows, columns, kinds, present):
+        self.rows = rows
+        self.columns = columns
+        self.kinds = kinds
+        self.present = present
+
+    def __len__(self):
+        return self.rows
+
+    def __getitem__(self, row):
+        if isinstance(row, slice):
+            return [self[i] for i in range(*row.indices(self.rows))]
+        if row < 0:
+            row += self.rows
+        if not 0 <= row < self.rows:
+            raise IndexError(row)
+        record = {}
+        for name, column in self.columns.items():
+            mask = self.present.get(name)
+            if mask is not None and not mask[row]:
+                continue
+            kind = self.kinds[name]
+            if kind == 'number':
+                record[name] = column[row].item()
+            elif kind == 'json':
+                record[name] = json.loads(column[row])
+            else:
+                record[name] = column[row]
+        return record
+
+
+def _column_kind(values):
+    """Storage kind of a column, as in columnar._encode_columns."""
+    present = [value for value in values if value is not None]
+    if all(isinstance(value, str) for value in present):
+        return 'string'
+    if all(isinstance(value, list) and all(isinstance(item, str) for item in value) for value in present):
+        return 'list'
+    if all(isinstance(value, list) and all(isinstance(item, int) for item in value) for value in present):
+        # Genre/style indices into the network's dictionaries
+        return 'index_list'
+    if all(isinstance(value, (Number, np.number)) and not isinstance(value, bool) for value in present):
+        return 'number'
+    # Mixed or nested values are stored as JSON text
+    return 'json'
+
+
+def _encode_strings(strings):
+    """Sorted dictionary of strings and the code of each input string."""
+    dictionary, codes = np.unique(np.asarray(strings, dtype=object), return_inverse=True)
+    encoded = [value.encode('utf-8') for value in dictionary]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(value) for value in encoded], out=offsets[1:])
+    data = np.frombuffer(b''.join(encoded), dtype=np.uint8)
+    return data, offsets, codes.astype(np.int32).reshape(-1)
+
+
+def _save_table(directory, table, records):
+    """Write one .npy file per column part; returns the table's manifest entry."""
+    names = []
+    for record in records:
+        for name in record:
+            if name not in names:
+                names.append(name)
+
+    kinds = {}
+    masked = []
+    for name in names:
+        values = [record.get(name) for record in records]
+        kind = kinds[name] = _column_kind(values)
+        arrays = {}
+        if kind == 'number':
+            arrays['values'] = np.asarray([0 if value is None else value for value in values])
+        elif kind == 'string':
+            data, offsets, codes = _encode_strings([value or '' for value in values])
+            arrays.update(data=data, offsets=offsets, codes=codes)
+            if len(offsets) - 1 == len(values):
+                # Unique column (node ids, musician names): row of each code for RowIndex
+                arrays['rows'] = np.argsort(codes).astype(np.int64)
+        elif kind == 'index_list':
+            rows = [value or [] for value in values]
+            row_offsets = np.zeros(len(rows) + 1, dtype=np.int64)
+            np.cumsum([len(row) for row in rows], out=row_offsets[1:])
+            arrays.update(codes=np.asarray([item for row in rows for item in row], dtype=np.int32),
+                          row_offsets=row_offsets)
+        elif kind == 'list':
+            rows = [value or [] for value in values]
+            data, offsets, codes = _encode_strings([item for row in rows for item in row] or [''])
+            row_offsets = np.zeros(len(rows) + 1, dtype=np.int64)
+            np.cumsum([len(row) for row in rows], out=row_offsets[1:])
+            arrays.update(data=data, offsets=offsets, codes=codes[:row_offsets[-1]], row_offsets=row_offsets)
+        else:
+            data, offsets, codes = _encode_strings([json.dumps(value) for value in values])
+            arrays.update(data=data, offsets=offsets, codes=codes)
+
+        if any(value is None for value in values):
+            masked.append(name)
+            arrays['present'] = np.array([value is not None for value in values], dtype=bool)
+        for part, array in arrays.items():
+            np.save(directory / f"{table}.{name}.{part}.npy", array, allow_pickle=False)
+
+    return {'rows': len(records), 'columns': kinds, 'masked': masked}
+
+
+def _save_link_attributes(directory, link_attributes):
+    """Write the build_link_attributes columns, numbered in manifest order."""
+    for position, attribute in enumerate(link_attributes.values()):
+        # Values are already sorted and unique, so the dictionary keeps their codes
+        data, offsets, _ = _encode_strings(list(attribute['values']) or [''])
+        arrays = {
+            'data': data,
+            'offsets': offsets if attribute['values'] else offsets[:1],
+            'row_offsets': np.asarray(attribute['offsets'], dtype=np.int64),
+            'codes': np.asarray(attribute['codes'], dtype=np.int32),
+        }
+        for part, array in arrays.items():
+            np.save(directory / f"link_attributes.{position}.{part}.npy", array, allow_pickle=False)
+    return list(link_attributes)
+
+
+def save_network_artifacts(directory, network_data, musician_stats_df, ego_index=None, metric_ranks=None):
+    """
+    Persist the processed network as memory-mappable .npy files.
+
+    Writes the node, link and statistics tables column by column (numbers
+    as typed arrays; strings, string lists and nested values dictionary
+    encoded), the links' custom column values, the CSR adjacency from
+    graph_metrics.build_ego_index, the statistics rank arrays and a
+    manifest. The manifest is written last, so a directory without one is
+    incomplete.
+
+    Args:
+        directory: Output directory (created if missing)
+        network_data: Dictionary from create_echarts_network_data
+        musician_stats_df: DataFrame from analyze_top_musicians
+        ego_index: Optional result of build_ego_index (built if not given)
+        metric_ranks: Optional result of analysis.build_metric_ranks (built
+                      if not given)
+
+    Returns:
+        Path of the manifest file
+    """
+    from analysis import build_metric_ranks
+    from graph_metrics import build_ego_index
+
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    # Mark the directory incomplete and drop the files of a previous save
+    (directory / MANIFEST_NAME).unlink(missing_ok=True)
+    for prefix in ('nodes', 'links', 'link_attributes', 'stats', 'ranks', 'adjacency'):
+        for old in directory.glob(f"{prefix}.*.npy"):
+            old.unlink()
+    if ego_index is None:
+        ego_index = build_ego_index(network_data)
+    if metric_ranks is None:
+        metric_ranks = build_metric_ranks(musician_stats_df)
+
+    tables = {
+        'nodes': _save_table(directory, 'nodes', network_data['nodes']),
+        'links': _save_table(directory, 'links', network_data['links']),
+        'stats': _save_table(directory, 'stats', musician_stats_df.to_dict('records')),
+    }
+    for name in EGO_INDEX_ARRAYS:
+        np.save(directory / f"adjacency.{name}.npy", np.asarray(ego_index[name]), allow_pickle=False)
+    # Rank files are numbered, since metric names come from the data
+    for position, metric in enumerate(metric_ranks):
+        np.save(directory / f"ranks.{position}.npy", np.asarray(metric_ranks[metric]), allow_pickle=False)
+
+    manifest = {
+        'format': ARTIFACT_FORMAT,
+        'tables': tables,
+        'link_attributes': _save_link_attributes(directory, network_data.get('link_attributes', {})),
+        'ranks': list(metric_ranks),
+        'metadata': {key: network_data[key] for key in NETWORK_METADATA if key in network_data},
+    }
+    path = directory / MANIFEST_NAME
+    tmp = path.with_suffix('.tmp')
+    tmp.write_text(json.dumps(manifest), encoding='utf-8')
+    os.replace(tmp, path)
+    return path
+
+
+def _open_table(directory, table, entry, mmap_mode):
+    def load(name, part):
+        return np.load(directory / f"{table}.{name}.{part}.npy", mmap_mode=mmap_mode, allow_pickle=False)
+
+    columns = {}
+    present = {}
+    for name, kind in entry['columns'].items():
+        if kind == 'number':
+            columns[name] = load(name, 'values')
+        elif kind == 'index_list':
+            columns[name] = IndexListColumn(load(name, 'row_offsets'), load(name, 'codes'))
+        else:
+            dictionary = StringDictionary(load(name, 'data'), load(name, 'offsets'))
+            if kind == 'list':
+                columns[name] = StringListColumn(load(name, 'row_offsets'), load(name, 'codes'), dictionary)
+            else:
+                columns[name] = StringColumn(load(name, 'codes'), dictionary)
+        if name in entry['masked']:
+            present[name] = load(name, 'present')
+    return RecordView(entry['rows'], columns, entry['columns'], present)
+
+
+def _row_index(directory, view, table, name, mmap_mode):
+    """RowIndex over a unique string column (empty if the table has no rows)."""
+    if name not in view.columns:
+        empty = StringDictionary(np.zeros(0, dtype=np.uint8), np.zeros(1, dtype=np.int64))
+        return RowIndex(StringColumn(np.zeros(0, dtype=np.int32), empty), np.zeros(0, dtype=np.int64))
+    rows = np.load(directory / f"{table}.{name}.rows.npy", mmap_mode=mmap_mode, allow_pickle=False)
+    return RowIndex(view.columns[name], rows)
+
+
+def open_network_artifacts(directory, mmap_mode='r'):
+    """
+    Open artifacts written by save_network_artifacts.
+
+    Every array is memory-mapped read-only, so the operating system keeps a
+    single copy in the page cache for all processes that open the same
+    directory. Records are only decoded when accessed.
+
+    Args:
+        directory: Directory holding the artifacts
+        mmap_mode: Passed to numpy.load; None reads the arrays into memory
+
+    Returns:
+        Dictionary with:
+            network: nodes and links as RecordViews, link_attributes
+                     (values as StringDictionary) plus the network
+                     metadata; usable wherever network_data is expected
+                     for read-only queries (e.g. graph_metrics.ego_network)
+            ego_index: CSR adjacency with a RowIndex node_index, as from
+                       build_ego_index
+            stats: RecordView of the musician statistics rows
+            stats_index: RowIndex of musician name -> stats row
+            ranks: Stats row positions per metric, highest first (as from
+                   analysis.build_metric_ranks); the top k musicians are
+                   stats[i] for i in ranks[metric][:k]
+            columns: Column arrays per table, for vectorized access
+    """
+    directory = Path(directory)
+    manifest = json.loads((directory / MANIFEST_NAME).read_text(encoding='utf-8'))
+    if manifest.get('format') != ARTIFACT_FORMAT:
+        raise ValueError(f"Unsupported artifact format in {directory}: {manifest.get('format')}")
+
+    tables = {
+        table: _open_table(directory, table, entry, mmap_mode)
+        for table, entry in manifest['tables'].items()
+    }
+    ego_index = {
+        name: np.load(directory / f"adjacency.{name}.npy", mmap_mode=mmap_mode, allow_pickle=False)
+        for name in EGO_INDEX_ARRAYS
+    }
+    ego_index['node_index'] = _row_index(directory, tables['nodes'], 'nodes', 'id', mmap_mode)
+
+    def load(position, part):
+        return np.load(directory / f"link_attributes.{position}.{part}.npy", mmap_mode=mmap_mode, allow_pickle=False)
+
+    link_attributes = {
+        column: {
+            'values': StringDictionary(load(position, 'data'), load(position, 'offsets')),
+            'offsets': load(position, 'row_offsets'),
+            'codes': load(position, 'codes'),
+        }
+        for position, column in enumerate(manifest.get('link_attributes', []))
+    }
+
+    return {
+        'network': {'nodes': tables['nodes'], 'links': tables['links'], 'link_attributes': link_attributes,
+                    **manifest['metadata']},
+        'ego_index': ego_index,
+        'stats': tables['stats'],
+        'stats_index': _row_index(directory, tables['stats'], 'stats', 'musician', mmap_mode),
+        'ranks': {
+            metric: np.load(directory / f"ranks.{position}.npy", mmap_mode=mmap_mode, allow_pickle=False)
+            for position, metric in enumerate(manifest.get('ranks', []))
+        },
+        'columns': {table: view.columns for table, view in tables.items()},
+    }
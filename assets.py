@@ -0,0 +1,196 @@
+"""
+Front-end asset module for musician network analysis.
+Resolves chart library script tags (CDN, local copies or inlined),
+minifies the page's own JavaScript and CSS, and reports page weight.
+"""
+
+import gzip
+import os
+import re
+import shutil
+
+
+# Pinned chart libraries used by the generated page
+VENDOR_LIBRARIES = [
+    {
+        'name': 'echarts',
+        'version': '5.4.3',
+        'filename': 'echarts-5.4.3.min.js',
+        'url': 'https://cdn.jsdelivr.net/npm/echarts@5.4.3/dist/echarts.min.js'
+    },
+]
+
+# WebGL graph renderer, loaded only by pages that use the 'webgl' renderer
+WEBGL_LIBRARIES = [
+    {
+        'name': 'echarts-gl',
+        'version': '2.0.9',
+        'filename': 'echarts-gl-2.0.9.min.js',
+        'url': 'https://cdn.jsdelivr.net/npm/echarts-gl@2.0.9/dist/echarts-gl.min.js'
+    },
+]
+
+ASSET_MODES = ('cdn', 'local', 'inline')
+LOCAL_ASSETS_DIRNAME = 'assets'
+
+
+def fetch_vendor_assets(vendor_dir, libraries=VENDOR_LIBRARIES + WEBGL_LIBRARIES):
+    """
+    Download the pinned chart libraries into vendor_dir.
+
+    Run this once on a machine with network access, then copy vendor_dir to
+    offline machines.
+
+    Returns:
+        List of downloaded file paths
+    """
+    # Imported here: urllib.request is slow to load and only needed for downloads
+    import urllib.request
+    
+    os.makedirs(vendor_dir, exist_ok=True)
+    paths = []
+    for library in libraries:
+        path = os.path.join(vendor_dir, library['filename'])
+        with urllib.request.urlopen(library['url']) as response, open(path, 'wb') as f:
+            shutil.copyfileobj(response, f)
+        paths.append(path)
+    return paths
+
+
+def get_page_libraries(renderer='canvas'):
+    """Return the libraries a page needs for the given chart renderer."""
+    if renderer == 'webgl':
+        return VENDOR_LIBRARIES + WEBGL_LIBRARIES
+    return VENDOR_LIBRARIES
+
+
+def _vendor_path(vendor_dir, library):
+    path = os.path.join(vendor_dir, library['filename'])
+    if not os.path.exists(path):
+        raise FileNotFoundError(
+            f"{library['name']} {library['version']} not found at '{path}'. "
+            f"Run 'python main.py --fetch-assets' on a machine with network access "
+            f"or download {library['url']} there."
+        )
+    return path
+
+
+def get_library_tags(mode='cdn', vendor_dir='vendor', output_path=None, libraries=VENDOR_LIBRARIES):
+    """
+    Build the <script> tags that load the chart libraries.
+
+    Args:
+        mode: 'cdn' to load from jsDelivr, 'local' to copy the pinned files
+              next to the output and reference them relatively, or 'inline'
+              to embed them in the page
+        vendor_dir: Directory holding the pinned library files
+        output_path: Output HTML path (required for 'local')
+        libraries: Library descriptions to load
+
+    Returns:
+        HTML string of script tags
+    """
+    if mode not in ASSET_MODES:
+        raise ValueError(f"Unknown asset mode '{mode}' (expected one of {', '.join(ASSET_MODES)})")
+
+    tags = []
+    for library in libraries:
+        if mode == 'cdn':
+            tags.append(f'<script src="{library["url"]}"></script>')
+        elif mode == 'local':
+            source = _vendor_path(vendor_dir, library)
+            assets_dir = os.path.join(os.path.dirname(os.path.abspath(output_path)), LOCAL_ASSETS_DIRNAME)
+            os.makedirs(assets_dir, exist_ok=True)
+            target = os.path.join(assets_dir, library['filename'])
+            if not os.path.exists(target) or os.path.getsize(target) != os.path.getsize(source):
+                shutil.copyfile(source, target)
+            tags.append(f'<script src="{LOCAL_ASSETS_DIRNAME}/{library["filename"]}"></script>')
+        else:
+            with open(_vendor_path(vendor_dir, library), encoding='utf-8') as f:
+                code = f.read()
+            # A literal closing tag inside the library would end the script early
+            code = code.replace('</script', '<\\/script')
+            tags.append(f'<script>/* {library["name"]} {library["version"]} */\n{code}\n</script>')
+
+    return '\n    '.join(tags)
+
+
+def minify_css(css):
+    """Strip comments and redundant whitespace from a stylesheet."""
+    css = re.sub(r'/\*.*?\*/', '', css, flags=re.S)
+    css = re.sub(r'\s+', ' ', css)
+    css = re.sub(r'\s*([{};,>])\s*', r'\1', css)
+    css = re.sub(r':\s+', ':', css)
+    css = css.replace(';}', '}')
+    return css.strip()
+
+
+def minify_js(js):
+    """
+    Conservatively minify JavaScript.
+
+    Only removes indentation, blank lines and whole-line // comments. Line
+    breaks are kept so automatic semicolon insertion behaves as before, and
+    nothing inside a line is touched, so strings and regexes stay intact.
+    """
+    lines = []
+    for line in js.split('\n'):
+        stripped = line.strip()
+        if not stripped or stripped.startswith('//'):
+            continue
+        lines.append(stripped)
+    return '\n'.join(lines)
+
+
+def minify_html_page(html):
+    """Minify the <style> blocks and inline <script> blocks of a page."""
+    html = re.sub(
+        r'(<style>)(.*?)(</style>)',
+        lambda m: m.group(1) + minify_css(m.group(2)) + m.group(3),
+        html,
+        flags=re.S
+    )
+    return re.sub(
+        r'(<script>)(.*?)(</script>)',
+        lambda m: m.group(1) + minify_js(m.group(2)) + m.group(3),
+        html,
+        flags=re.S
+    )
+
+
+def page_weight_report(output_path, mode='cdn', libraries=VENDOR_LIBRARIES, bandwidth_mbps=10):
+    """
+    Report the weight of a generated page and an estimated load latency.
+
+    Args:
+        output_path: Generated HTML file
+        mode: Asset mode the page was generated with
+        libraries: Libraries the page loads
+        bandwidth_mbps: Link speed used to estimate transfer time
+
+    Returns:
+        Dictionary with html_bytes, gzip_bytes, asset_bytes, external_requests
+        and estimated_transfer_ms
+    """
+    with open(output_path, 'rb') as f:
+        content = f.read()
+    html_bytes = len(content)
+    gzip_bytes = len(gzip.compress(content, compresslevel=6))
+
+    asset_bytes = 0
+    external_requests = 0
+    if mode == 'local':
+        assets_dir = os.path.join(os.path.dirname(os.path.abspath(output_path)), LOCAL_ASSETS_DIRNAME)
+        for library in libraries:
+            asset_bytes += os.path.getsize(os.path.join(assets_dir, library['filename']))
+    elif mode == 'cdn':
+        external_requests = len(libraries)
+
+    transfer_bytes = html_bytes + asset_bytes
+    return {
+        'html_bytes': html_bytes,
+        'gzip_bytes': gzip_bytes,
+        'asset_bytes': asset_bytes,
+        'external_requests': external_requests,
+        'estimated_transfer_ms': transfer_bytes * 8 / (bandwidth_mbps * 1e6) * 1000
+    }
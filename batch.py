@@ -0,0 +1,139 @@
+"""
+Batch module for musician network analysis.
+Generates reports for many collections in one run: reads a manifest of
+input/output pairs and processes them on a pool of long-lived worker
+processes, so interpreter start-up, imports and the parsing caches (role
+names, musician entries, normalized names) are paid once per worker rather
+than once per collection.
+"""
+
+import csv
+import importlib
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+
+SUMMARY_COLUMNS = ['input', 'output', 'status', 'seconds', 'records', 'error']
+
+
+def load_manifest(path):
+    """
+    Read a batch manifest.
+
+    The manifest is a CSV file with input and output columns. Relative
+    paths are resolved against the manifest's directory.
+
+    Args:
+        path: Manifest CSV path
+
+    Returns:
+        List of (input path, output path) tuples
+    """
+    base = Path(path).resolve().parent
+    with open(path, newline='', encoding='utf-8') as f:
+        reader = csv.DictReader(f)
+        missing = {'input', 'output'} - set(reader.fieldnames or [])
+        if missing:
+            raise ValueError(f"Manifest {path} is missing columns: {', '.join(sorted(missing))}")
+        return [
+            (str(base / row['input'].strip()), str(base / row['output'].strip()))
+            for row in reader if row['input'] and row['input'].strip()
+        ]
+
+
+def _warm_worker(modules):
+    """Pool initializer: import the pipeline modules once per worker."""
+    for name in modules:
+        importlib.import_module(name)
+
+
+def _run_entry(function, input_path, output_path):
+    """Run one collection, turning any failure into an error summary row."""
+    start = time.perf_counter()
+    try:
+        records = function(input_path, output_path)
+        status, error = 'ok', ''
+    except Exception as e:
+        records, status, error = None, 'error', f"{type(e).__name__}: {e}"
+    return {
+        'input': input_path,
+        'output': output_path,
+        'status': status,
+        'seconds': round(time.perf_counter() - start, 3),
+        'records': records,
+        'error': error,
+    }
+
+
+def run_batch(entries, function, workers=1, warm_modules=(), on_done=None):
+    """
+    Generate the report of every manifest entry.
+
+    A failing collection is recorded in the summary and the batch carries
+    on; this includes a worker process dying, which fails the collections
+    it was running.
+
+    Args:
+        entries: List of (input path, output path) tuples from load_manifest
+        function: function(input path, output path) generating one report
+                  and returning its number of records; must be picklable
+                  (a module-level function or a functools.partial of one)
+        workers: Number of worker processes; 1 runs in the calling process
+        warm_modules: Modules each worker imports before its first collection
+        on_done: Optional callback(summary row), called as each collection
+                 finishes
+
+    Returns:
+        List of summary dictionaries (SUMMARY_COLUMNS), in manifest order
+    """
+    summary = [None] * len(entries)
+
+    def finish(position, row):
+        summary[position] = row
+        if on_done:
+            on_done(row)
+
+    if workers <= 1:
+        _warm_worker(warm_modules)
+        for position, (input_path, output_path) in enumerate(entries):
+            finish(position, _run_entry(function, input_path, output_path))
+        return summary
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_warm_worker,
+                             initargs=(tuple(warm_modules),)) as pool:
+        futures = {
+            pool.submit(_run_entry, function, input_path, output_path): position
+            for position, (input_path, output_path) in enumerate(entries)
+        }
+        for future in as_completed(futures):
+            position = futures[future]
+            try:
+                row = future.result()
+            except Exception as e:
+                input_path, output_path = entries[position]
+                row = {
+                    'input': input_path,
+                    'output': output_path,
+                    'status': 'error',
+                    'seconds': None,
+                    'records': None,
+                    'error': f"{type(e).__name__}: {e}",
+                }
+            finish(position, row)
+
+    return summary
+
+
+def save_summary(summary, path):
+    """
+    Write the batch summary to a CSV file.
+
+    Returns:
+        path
+    """
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=SUMMARY_COLUMNS)
+        writer.writeheader()
+        writer.writerows(summary)
+    return path
@@ -0,0 +1,300 @@
+"""
+Columnar encoding module for musician network analysis.
+Encodes the ECharts node and link arrays as base64 typed-array columns plus
+a shared string dictionary, which the page decodes with typed-array views
+instead of parsing one large JSON literal.
+"""
+
+import base64
+from numbers import Number
+
+import numpy as np
+
+
+PAYLOAD_FORMAT = 'columnar-v1'
+
+# Numeric node attributes kept at single precision in the browser
+FLOAT_DTYPE = '<f4'
+
+
+class StringTable:
+    """Dictionary of unique strings, referenced by index from the columns."""
+
+    def __init__(self):
+        self.strings = []
+        self.index = {}
+
+    def add(self, value):
+        position = self.index.get(value)
+        if position is None:
+            position = len(self.strings)
+            self.index[value] = position
+            self.strings.append(value)
+        return position
+
+
+def _encode_array(values, dtype):
+    array = np.asarray(values, dtype=dtype)
+    return {
+        'type': _TYPE_NAMES[np.dtype(dtype).str],
+        'data': base64.b64encode(array.tobytes()).decode('ascii')
+    }
+
+
+_TYPE_NAMES = {'|u1': 'u8', '<u2': 'u16', '<u4': 'u32', '<i4': 'i32', '<f4': 'f32', '<f8': 'f64'}
+
+
+def _integer_dtype(values):
+    low = min(values, default=0)
+    high = max(values, default=0)
+    if low >= 0:
+        if high < 2 ** 8:
+            return '|u1'
+        if high < 2 ** 16:
+            return '<u2'
+        if high < 2 ** 32:
+            return '<u4'
+    elif -2 ** 31 <= low and high < 2 ** 31:
+        return '<i4'
+    return '<f8'
+
+
+def _encode_list_column(rows, strings):
+    """Encode a column of string lists as offsets plus string indices."""
+    offsets = [0]
+    values = []
+    for row in rows:
+        values.extend(strings.add(str(value)) for value in row)
+        offsets.append(len(values))
+    return {
+        'kind': 'list',
+        'offsets': _encode_array(offsets, '<u4'),
+        'values': _encode_array(values, '<u4')
+    }
+
+
+def _encode_index_list_column(rows):
+    """Encode a column of integer lists (genre/style indices) as offsets plus values."""
+    offsets = [0]
+    values = []
+    for row in rows:
+        values.extend(row)
+        offsets.append(len(values))
+    return {
+        'kind': 'index_list',
+        'offsets': _encode_array(offsets, '<u4'),
+        'values': _encode_array(values, _integer_dtype(values))
+    }
+
+
+def _encode_columns(records, strings, skip=()):
+    """
+    Encode a list of dictionaries column by column.
+
+    Numbers become typed arrays, strings become string indices, and lists
+    become offset/value pairs (integer lists keep their values). Keys missing from some records get a
+    presence mask so the decoder can leave them out again.
+    """
+    keys = []
+    for record in records:
+        for key in record:
+            if key not in keys and key not in skip:
+                keys.append(key)
+
+    columns = {}
+    for key in keys:
+        values = [record.get(key) for record in records]
+        present = [value for value in values if value is not None]
+
+        if not present:
+            continue
+        if all(isinstance(value, list) and all(isinstance(item, int) for item in value) for value in present) \
+                and any(present):
+            column = _encode_index_list_column([value or [] for value in values])
+        elif all(isinstance(value, list) for value in present):
+            column = _encode_list_column([value or [] for value in values], strings)
+        elif all(isinstance(value, str) for value in present):
+            column = {
+                'kind': 'string',
+                'values': _encode_array([strings.add(value or '') for value in values], '<u4')
+            }
+        elif all(isinstance(value, Number) and not isinstance(value, bool) for value in present):
+            if all(float(value).is_integer() for value in present):
+                dtype = _integer_dtype([int(value) for value in present])
+            else:
+                dtype = FLOAT_DTYPE
+            column = {
+                'kind': 'number',
+                'values': _encode_array([0 if value is None else value for value in values], dtype)
+            }
+        else:
+            # Mixed or nested values are passed through untouched
+            column = {'kind': 'json', 'values': values}
+
+        if len(present) < len(values):
+            column['present'] = _encode_array([value is not None for value in values], '|u1')
+        columns[key] = column
+    return columns
+
+
+def _encode_link_attributes(link_attributes):
+    """Encode build_link_attributes columns as value lists plus offset/code arrays."""
+    return {
+        column: {
+            'values': attribute['values'],
+            'offsets': _encode_array(attribute['offsets'], '<u4'),
+            'codes': _encode_integers(attribute['codes'])
+        }
+        for column, attribute in link_attributes.items()
+    }
+
+
+def encode_network_payload(network_data):
+    """
+    Encode ECharts network data as a columnar payload.
+
+    Node and link attributes become typed-array columns; link source and
+    target become node indices; every string is stored once in a shared
+    dictionary. Remaining top-level keys (categories, filter lists, tier and
+    community summaries) are passed through as JSON.
+
+    Args:
+        network_data: Dictionary from create_echarts_network_data
+
+    Returns:
+        JSON-serializable dictionary
+    """
+    nodes = network_data['nodes']
+    links = network_data['links']
+    strings = StringTable()
+
+    node_index = {node['id']: i for i, node in enumerate(nodes)}
+    name_is_id = all(node.get('name') == node['id'] for node in nodes)
+
+    node_columns = _encode_columns(nodes, strings, skip=('name',) if name_is_id else ())
+    link_columns = _encode_columns(links, strings, skip=('source', 'target'))
+    link_columns['source'] = {
+        'kind': 'node',
+        'values': _encode_array([node_index[link['source']] for link in links], '<u4')
+    }
+    link_columns['target'] = {
+        'kind': 'node',
+        'values': _encode_array([node_index[link['target']] for link in links], '<u4')
+    }
+
+    return {
+        'format': PAYLOAD_FORMAT,
+        'node_count': len(nodes),
+        'link_count': len(links),
+        'name_is_id': name_is_id,
+        'nodes': node_columns,
+        'links': link_columns,
+        'link_attributes': _encode_link_attributes(network_data.get('link_attributes', {})),
+        'strings': strings.strings,
+        'meta': {key: value for key, value in network_data.items()
+                 if key not in ('nodes', 'links', 'link_attributes')}
+    }
+
+
+def _encode_integers(values):
+    """Encode an integer array with the smallest type that holds it."""
+    values = np.asarray(values)
+    return _encode_array(values, _integer_dtype([int(values.min()), int(values.max())] if len(values) else []))
+
+
+def _encode_csr(matrix):
+    """Encode CSR indptr/indices (and optional data) arrays with compact types."""
+    return {key: _encode_integers(values) for key, values in matrix.items()}
+
+
+def encode_ego_index(index, max_nodes, max_depth):
+    """
+    Encode the CSR neighbour arrays from graph_metrics.build_ego_index for the page.
+
+    Args:
+        index: Dictionary from build_ego_index
+        max_nodes: Node budget for ego networks in the page
+        max_depth: Deepest neighbourhood offered in the page
+
+    Returns:
+        JSON-serializable dictionary
+    """
+    encoded = _encode_csr({key: index[key] for key in ('indptr', 'indices', 'link_ids')})
+    encoded['max_nodes'] = max_nodes
+    encoded['max_depth'] = max_depth
+    return encoded
+
+
+def encode_record_graph(graph):
+    """
+    Encode the musician-record graph from paths.build_record_graph for the page.
+
+    Args:
+        graph: Dictionary from build_record_graph
+
+    Returns:
+        JSON-serializable dictionary
+    """
+    return {
+        'musicians': [str(name) for name in graph['musicians']],
+        'records': [str(record) for record in graph['records']],
+        'musician_records': _encode_csr(graph['musician_records']),
+        'record_musicians': _encode_csr(graph['record_musicians'])
+    }
+
+
+def encode_musician_aggregates(aggregates):
+    """
+    Encode the sparse matrices from build_musician_filter_matrices for the page.
+
+    Args:
+        aggregates: Dictionary from analysis.build_musician_filter_matrices
+
+    Returns:
+        JSON-serializable dictionary
+    """
+    return {
+        'roles': aggregates['roles'],
+        'record_count': aggregates['record_count'],
+        'musician_records': _encode_csr(aggregates['musician_records']),
+        'pair_roles': _encode_csr(aggregates['pair_roles']),
+        'record_values': {
+            column: _encode_csr(matrix) for column, matrix in aggregates['record_values'].items()
+        },
+        'artists': aggregates['artists'],
+        'record_artists': _encode_integers(aggregates['record_artists'])
+    }
+
+
+def encode_period_snapshots(snapshots):
+    """
+    Encode the period increments from temporal.build_period_snapshots for the page.
+
+    Args:
+        snapshots: Dictionary from build_period_snapshots
+
+    Returns:
+        JSON-serializable dictionary
+    """
+    return {
+        'year_column': snapshots['year_column'],
+        'labels': snapshots['labels'],
+        'summary': snapshots['summary'],
+        'link_deltas': _encode_csr(snapshots['link_deltas']),
+        'musician_deltas': _encode_csr(snapshots['musician_deltas']),
+        'record_periods': _encode_integers(snapshots['record_periods'])
+    }
+
+
+def encode_metric_ranks(ranks, metrics):
+    """
+    Encode rank arrays from analysis.build_metric_ranks for the page.
+
+    Args:
+        ranks: Dictionary from build_metric_ranks
+        metrics: Metrics the page reads; others are left out
+
+    Returns:
+        JSON-serializable dictionary
+    """
+    return {metric: _encode_integers(ranks[metric]) for metric in metrics if metric in ranks}
@@ -7,6 +7,33 @@ DEFAULT_CSV_PATH = 'vinyl-collection.csv'
 DEFAULT_OUTPUT_PATH = 'musician_network_complete_analysis.html'
 NETWORK_CSV_PATH = 'musician_network.csv'
 TRIPLES_CSV_PATH = 'musician_graph_triples.csv'
+ALIASES_CSV_PATH = 'musician_aliases.csv'
+
+# Front-end asset settings
+ASSET_MODE = 'cdn'          # 'cdn', 'local' (copied next to the output) or 'inline'
+VENDOR_DIR = 'vendor'       # Pinned chart library files for 'local' and 'inline'
+MINIFY_OUTPUT = False
+NETWORK_PAYLOAD = 'json'    # 'json' literal or 'binary' typed-array columns
+CHART_RENDERER = 'auto'     # 'canvas', 'webgl' (ECharts-GL) or 'auto'
+WEBGL_NODE_THRESHOLD = 10000  # 'auto' switches to WebGL above this many nodes
+REPORT_BANDWIDTH_MBPS = 10  # Link speed used for the estimated load time
+
+# Pipeline settings
+PIPELINE_JOBS = 0               # Stages run concurrently; 0 uses one per CPU core, 1 runs them in order
+PIPELINE_EXECUTOR = 'thread'    # 'thread' pool keeps the parsing caches warm across runs; 'process' pool doesn't
+ENABLE_PIPELINE_CACHE = True    # Reuse stage results whose input, settings and code are unchanged
+PIPELINE_CACHE_DIR = '.pipeline_cache'
+PIPELINE_CACHE_ENTRIES = 4      # Cached results kept per stage (e.g. for alternating inputs)
+BATCH_SUMMARY_PATH = 'batch_summary.csv'
+
+# Query server settings
+SERVER_HOST = '127.0.0.1'
+SERVER_PORT = 8765
+SERVER_CACHE_SIZE = 256
+
+# Watch mode settings (seconds)
+WATCH_POLL_INTERVAL = 1.0
+WATCH_DEBOUNCE = 2.0
 
 # Analysis parameters
 SESSION_MUSICIAN_MIN_RECORDS = 2
@@ -14,6 +41,44 @@ SESSION_MUSICIAN_MIN_RATIO = 0.7
 TOP_MUSICIANS_LIMIT = 20
 SEARCH_RESULTS_LIMIT = 10
 
+# Entity resolution parameters (musician name canonicalization)
+ENABLE_ENTITY_RESOLUTION = True
+ENTITY_MERGE_RULES = ('disambiguator', 'normalized', 'token_order')  # Add 'phonetic' for fuzzy merges
+ENTITY_SIMILARITY_THRESHOLD = 0.9   # Minimum spelling similarity for the phonetic rule
+ENTITY_MAX_BLOCK_SIZE = 50          # Larger phonetic blocks are not compared pairwise
+
+# Graph metrics parameters
+PAGERANK_DAMPING = 0.85
+CENTRALITY_MAX_ITER = 100
+CENTRALITY_TOLERANCE = 1e-8
+BETWEENNESS_SAMPLES = 32
+RANDOM_SEED = 42
+
+# Community detection parameters
+COMMUNITY_MAX_ITER = 20
+MAX_COMMUNITY_CATEGORIES = 10
+
+# Level-of-detail parameters
+LOD_NODE_METRIC = 'core'            # 'core' (k-core number) or any numeric node attribute
+LOD_TIER_SIZES = [200, 1000, 5000]  # Nodes per tier; a final tier holds the full network
+LOD_LINK_MIN_VALUES = [3, 2, 1]     # Minimum link value per tier (must not increase)
+LOD_LINK_BUDGET = 3000              # Links rendered before the page falls back to a coarser tier
+
+# Time snapshot parameters
+ENABLE_TIME_SNAPSHOTS = True
+YEAR_COLUMN = 'Year'   # Collection column with the release year
+PERIOD_YEARS = 10      # Snapshot period length: 10 for decades, 1 for single years
+
+# Ego network parameters
+EGO_MAX_NODES = 500   # Node budget for k-hop ego networks (page and /ego endpoint)
+EGO_MAX_DEPTH = 3     # Deepest neighbourhood offered in the Debug tab and by /ego
+
+# Similar-musician parameters (MinHash LSH)
+SIMILARITY_PERMUTATIONS = 64   # Hash functions per feature group (collaborators, roles, genres/styles)
+SIMILARITY_BAND_ROWS = 4       # Signature columns per LSH band
+SIMILARITY_LIMIT = 10          # Neighbours returned by /similar
+SIMILARITY_MAX_K = 100         # Largest k accepted by /similar
+
 # Network visualization parameters
 MAX_ARTIST_SYMBOL_SIZE = 35
 MIN_ARTIST_SYMBOL_SIZE = 12
@@ -25,8 +90,18 @@ MUSICIAN_SIZE_MULTIPLIER = 2
 # Colors
 MUSICIAN_COLOR = '#ff7f0e'  # Orange
 ARTIST_COLOR = '#1f77b4'   # Blue
+COMMUNITY_COLORS = [
+    '#1f77b4', '#ff7f0e', '#2ca02c', '#d62728', '#9467bd',
+    '#8c564b', '#e377c2', '#bcbd22', '#17becf', '#aec7e8',
+    '#7f7f7f'  # Other communities
+]
 
 # HTML generation settings
 ENABLE_DEBUG_MODE = True
 INCLUDE_CHARTS = True
-INCLUDE_SESSION_ANALYSIS = True 
+INCLUDE_SESSION_ANALYSIS = True
+COMPUTE_GRAPH_METRICS = True
+DETECT_COMMUNITIES = True
+ENABLE_DETAIL_TIERS = True
+ENABLE_PATH_FINDER = True   # Embed the musician-record graph for collaboration paths
+
@@ -3,9 +3,13 @@ Data processing module for musician network analysis.
 Handles CSV loading, musician parsing, and network data generation.
 """
 
+import numpy as np
 import pandas as pd
 import re
-from collections import defaultdict
+from functools import lru_cache
+
+
+MUSICIAN_PATTERN = re.compile(r'^([^(]+?)(?:\s*\((\d+)\))?\s*\(([^)]+)\)$')
 
 
 def load_collection_data(csv_path):
@@ -28,6 +32,20 @@ def parse_musicians(musicians_str, main_artist):
     if pd.isna(musicians_str):
         return []
     
+    return [
+        {'musician': full_name, 'role': role, 'main_artist': main_artist}
+        for full_name, role in _parse_musician_entries(musicians_str)
+    ]
+
+
+@lru_cache(maxsize=65536)
+def _parse_musician_entries(musicians_str):
+    """
+    Parse a musician string into (name, role) pairs.
+    
+    Cached because the same credit strings recur across re-runs (watch and
+    batch modes) and across reissues of the same record.
+    """
     musician_entries = musicians_str.split(';')
     parsed_data = []
     
@@ -37,8 +55,7 @@ def parse_musicians(musicians_str, main_artist):
             continue
             
         # Pattern: Name (optional number) (roles)
-        pattern = r'^([^(]+?)(?:\s*\((\d+)\))?\s*\(([^)]+)\)$'
-        match = re.match(pattern, entry)
+        match = MUSICIAN_PATTERN.match(entry)
         
         if match:
             name = match.group(1).strip()
@@ -50,13 +67,9 @@ def parse_musicians(musicians_str, main_artist):
             
             for role in roles:
                 if role:
-                    parsed_data.append({
-                        'musician': full_name,
-                        'role': role,
-                        'main_artist': main_artist
-                    })
+                    parsed_data.append((full_name, role))
     
-    return parsed_data
+    return tuple(parsed_data)
 
 
 def create_network_data(collection_df):
@@ -90,27 +103,24 @@ def clean_role_name(role):
     """Remove bracket information from role names to group similar roles."""
     if pd.isna(role):
         return role
+    return _clean_role(str(role))
+
+
+@lru_cache(maxsize=None)
+def _clean_role(role):
     # Remove everything in brackets and parentheses
-    cleaned = re.sub(r'\s*\[.*?\]', '', str(role))
+    cleaned = re.sub(r'\s*\[.*?\]', '', role)
     cleaned = re.sub(r'\s*\(.*?\)', '', cleaned)
     return cleaned.strip()
 
 
-def create_echarts_network_data(network_df, collection_df):
+def build_artist_info(collection_df):
     """
-    Create complete data structure for ECharts with proper node categorization.
+    Build the artist-to-genre/style/album mapping from the collection.
     
     Returns:
-        Dictionary with nodes, links, categories, genres, styles, and clean_roles
+        Dictionary of artist -> {'genres': list, 'styles': list, 'albums': list}
     """
-    # Add cleaned role names
-    filtered_df = network_df.copy()
-    filtered_df['clean_role'] = filtered_df['role'].apply(clean_role_name)
-    
-    # Get all main artists
-    main_artists = set(filtered_df['main_artist'].unique())
-    
-    # Create artist-to-genre/style mapping
     artist_info = {}
     for _, row in collection_df.iterrows():
         artist = row['Artist']
@@ -140,6 +150,49 @@ def create_echarts_network_data(network_df, collection_df):
         artist_info[artist]['genres'] = list(artist_info[artist]['genres'])
         artist_info[artist]['styles'] = list(artist_info[artist]['styles'])
     
+    return artist_info
+
+
+def create_echarts_network_data(network_df, collection_df):
+    """
+    Create complete data structure for ECharts with proper node categorization.
+    
+    Node genres and styles are sorted indices into the returned genres and
+    styles lists (see attribute_bits); a link's genres and styles are those
+    of its target artist node. The links' custom column values are kept out
+    of the link dictionaries, in link_attributes (see build_link_attributes).
+    
+    Returns:
+        Dictionary with nodes, links, link_attributes, categories, genres,
+        styles, and clean_roles
+    """
+    # Add cleaned role names
+    filtered_df = network_df.copy()
+    filtered_df['clean_role'] = filtered_df['role'].apply(clean_role_name)
+    
+    # Get all main artists
+    main_artists = set(filtered_df['main_artist'].unique())
+    
+    # Create artist-to-genre/style mapping
+    artist_info = build_artist_info(collection_df)
+    
+    # Genre/style dictionaries of the artists in the network. Nodes store
+    # sorted indices into them; links read them from their artist (target)
+    # node instead of carrying copies
+    network_info = [artist_info[artist] for artist in main_artists if artist in artist_info]
+    all_genres = sorted({genre for info in network_info for genre in info['genres']})
+    all_styles = sorted({style for info in network_info for style in info['styles']})
+    genre_index = {genre: i for i, genre in enumerate(all_genres)}
+    style_index = {style: i for i, style in enumerate(all_styles)}
+    artist_genre_ids = {
+        artist: sorted(genre_index[genre] for genre in artist_info[artist]['genres'])
+        for artist in main_artists if artist in artist_info
+    }
+    artist_style_ids = {
+        artist: sorted(style_index[style] for style in artist_info[artist]['styles'])
+        for artist in main_artists if artist in artist_info
+    }
+    
     # Create nodes
     nodes = []
     node_ids = set()
@@ -149,8 +202,6 @@ def create_echarts_network_data(network_df, collection_df):
         if artist not in node_ids:
             musician_count = filtered_df[filtered_df['main_artist'] == artist]['musician'].nunique()
             
-            artist_genres = artist_info.get(artist, {}).get('genres', [])
-            artist_styles = artist_info.get(artist, {}).get('styles', [])
             artist_albums = artist_info.get(artist, {}).get('albums', [])
             
             # Get roles for this artist
@@ -162,8 +213,8 @@ def create_echarts_network_data(network_df, collection_df):
                 'category': 'artist',
                 'symbolSize': min(12 + musician_count * 1.5, 35),
                 'value': musician_count,
-                'genres': artist_genres,
-                'styles': artist_styles,
+                'genres': artist_genre_ids.get(artist, []),
+                'styles': artist_style_ids.get(artist, []),
                 'albums': artist_albums,
                 'roles': artist_roles
             })
@@ -180,9 +231,8 @@ def create_echarts_network_data(network_df, collection_df):
             musician_styles = set()
             
             for artist in musician_artists:
-                if artist in artist_info:
-                    musician_genres.update(artist_info[artist]['genres'])
-                    musician_styles.update(artist_info[artist]['styles'])
+                musician_genres.update(artist_genre_ids.get(artist, []))
+                musician_styles.update(artist_style_ids.get(artist, []))
             
             # Get roles for this musician
             musician_roles = filtered_df[filtered_df['musician'] == musician]['clean_role'].unique().tolist()
@@ -193,78 +243,41 @@ def create_echarts_network_data(network_df, collection_df):
                 'category': 'musician',
                 'symbolSize': min(8 + artist_count * 2, 25),
                 'value': artist_count,
-                'genres': list(musician_genres),
-                'styles': list(musician_styles),
+                'genres': sorted(musician_genres),
+                'styles': sorted(musician_styles),
                 'collaborations': list(musician_artists),
                 'roles': musician_roles
             })
             node_ids.add(musician)
     
-    # Create links
-    links = []
-    link_counts = defaultdict(int)
+    # Create links: one per musician/artist pair (only if both nodes exist),
+    # in order of the pair's first credit
+    linked_df = filtered_df[filtered_df['musician'].isin(node_ids) & filtered_df['main_artist'].isin(node_ids)]
+    pairs = linked_df.groupby(['musician', 'main_artist'], sort=False, dropna=False)
+    link_ids = pairs.ngroup().to_numpy()
+    grouped = pairs.agg(roles=('role', list), clean_roles=('clean_role', list), albums=('album', list))
+    links = [
+        {
+            'source': musician,
+            'target': artist,
+            'value': len(roles),
+            'roles': roles,
+            'clean_roles': clean_roles,
+            'albums': albums
+        }
+        for (musician, artist), roles, clean_roles, albums in zip(
+            grouped.index, grouped['roles'], grouped['clean_roles'], grouped['albums']
+        )
+    ]
     
-    for _, row in filtered_df.iterrows():
-        musician = row['musician']
-        artist = row['main_artist']
-        role = row['role']
-        clean_role = row['clean_role']
-        album = row['album']
-        
-        # Only create links if both nodes exist
-        if musician in node_ids and artist in node_ids:
-            link_key = f"{musician}_{artist}"
-            link_counts[link_key] += 1
-            
-            if link_counts[link_key] == 1:
-                # Get genres/styles for this connection
-                connection_genres = artist_info.get(artist, {}).get('genres', [])
-                connection_styles = artist_info.get(artist, {}).get('styles', [])
-                
-                # Get custom filter data for this connection
-                custom_data = {}
-                for col in filtered_df.columns:
-                    if col not in ['musician', 'role', 'main_artist', 'album', 'clean_role']:
-                        custom_data[col] = row[col]
-                
-                links.append({
-                    'source': musician,
-                    'target': artist,
-                    'value': 1,
-                    'roles': [role],
-                    'clean_roles': [clean_role],
-                    'albums': [album],
-                    'genres': connection_genres,
-                    'styles': connection_styles,
-                    'custom_data': custom_data
-                })
-            else:
-                # Find existing link and add role/album/custom data
-                for link in links:
-                    if link['source'] == musician and link['target'] == artist:
-                        link['roles'].append(role)
-                        link['clean_roles'].append(clean_role)
-                        link['albums'].append(album)
-                        link['value'] += 1
-                        # Merge custom data
-                        for col in filtered_df.columns:
-                            if col not in ['musician', 'role', 'main_artist', 'album', 'clean_role']:
-                                if col not in link['custom_data']:
-                                    link['custom_data'][col] = []
-                                if isinstance(link['custom_data'][col], list):
-                                    link['custom_data'][col].append(row[col])
-                                else:
-                                    link['custom_data'][col] = [link['custom_data'][col], row[col]]
-                        break
-    
-    # Get all unique genres, styles, and clean roles for filters
-    all_genres = set()
-    all_styles = set()
-    all_clean_roles = set()
+    # Custom filter columns of each link, stored column by column
+    custom_columns = [col for col in filtered_df.columns
+                      if col not in ['musician', 'role', 'main_artist', 'album', 'clean_role']]
+    link_attributes = build_link_attributes(linked_df, link_ids, len(links), custom_columns)
     
+    # Get all unique clean roles for filters
+    all_clean_roles = set()
     for node in nodes:
-        all_genres.update(node.get('genres', []))
-        all_styles.update(node.get('styles', []))
         all_clean_roles.update(node.get('roles', []))
     
     categories = [
@@ -275,13 +288,113 @@ def create_echarts_network_data(network_df, collection_df):
     return {
         'nodes': nodes,
         'links': links,
+        'link_attributes': link_attributes,
         'categories': categories,
-        'genres': sorted(list(all_genres)),
-        'styles': sorted(list(all_styles)),
+        'genres': all_genres,
+        'styles': all_styles,
         'clean_roles': sorted(list(all_clean_roles))
     } 
 
 
+def build_link_attributes(network_df, link_ids, link_count, columns):
+    """
+    Store the custom column values of the links column by column.
+    
+    Each column is dictionary encoded: the sorted unique values (cells
+    expanded with split_filter_values, missing and empty values dropped)
+    plus, per link, the sorted unique value codes of its credits. Link i's
+    codes are codes[offsets[i]:offsets[i + 1]].
+    
+    Args:
+        network_df: Credit rows (one per musician credit)
+        link_ids: Link index of each row
+        link_count: Number of links
+        columns: Custom columns to encode
+    
+    Returns:
+        Dictionary of column -> dictionary with values (list of strings),
+        offsets (int64 array, link_count + 1) and codes (int32 array)
+    """
+    link_ids = np.asarray(link_ids, dtype=np.int64)
+    link_attributes = {}
+    
+    for column in columns:
+        # Split each distinct cell once; rows refer to their cell by code
+        cell_codes, cells = pd.factorize(network_df[column])
+        cell_values = [
+            [part for part in split_filter_values(cell) if part and part.strip()] for cell in cells
+        ]
+        values = sorted({part for parts in cell_values for part in parts})
+        position = {value: i for i, value in enumerate(values)}
+        cell_lengths = np.array([len(parts) for parts in cell_values], dtype=np.int64)
+        cell_offsets = np.zeros(len(cells) + 1, dtype=np.int64)
+        np.cumsum(cell_lengths, out=cell_offsets[1:])
+        cell_parts = np.array([position[part] for parts in cell_values for part in parts], dtype=np.int64)
+        
+        # One (link, value code) pair per value of every row, deduplicated
+        present = cell_codes >= 0
+        row_cells = cell_codes[present]
+        counts = cell_lengths[row_cells]
+        pair_links = np.repeat(link_ids[present], counts)
+        first = np.repeat(cell_offsets[row_cells] - (np.cumsum(counts) - counts), counts)
+        pair_codes = cell_parts[first + np.arange(len(first), dtype=np.int64)]
+        pairs = np.unique(pair_links * max(len(values), 1) + pair_codes)
+        
+        offsets = np.searchsorted(pairs // max(len(values), 1), np.arange(link_count + 1)).astype(np.int64)
+        link_attributes[column] = {
+            'values': values,
+            'offsets': offsets,
+            'codes': (pairs % max(len(values), 1)).astype(np.int32)
+        }
+    
+    return link_attributes
+
+
+def link_attribute_values(attribute, link):
+    """Custom column values of one link, from a build_link_attributes column."""
+    codes = attribute['codes'][attribute['offsets'][link]:attribute['offsets'][link + 1]]
+    return [attribute['values'][code] for code in codes]
+
+
+def link_attribute_mask(attribute, selected):
+    """
+    Boolean array of the links with any of the selected values in one
+    build_link_attributes column (links without a value never match).
+    """
+    selected = set(selected)
+    chosen = np.fromiter((value in selected for value in attribute['values']), dtype=bool,
+                         count=len(attribute['values']))
+    offsets = np.asarray(attribute['offsets'])
+    hits = np.zeros(len(attribute['codes']) + 1, dtype=np.int64)
+    np.cumsum(chosen[np.asarray(attribute['codes'])], out=hits[1:])
+    return hits[offsets[1:]] > hits[offsets[:-1]]
+
+
+def attribute_bits(ids):
+    """
+    Bitset of a node's genre or style indices, as a Python integer.
+    
+    Membership of index i is bits >> i & 1; a node has any of a set of
+    values if bits & attribute_bits(values) is non-zero.
+    """
+    bits = 0
+    for i in ids:
+        bits |= 1 << i
+    return bits
+
+
+def split_filter_values(value):
+    """
+    Expand one collection cell into the values offered by the custom filters.
+    
+    Comma-separated strings are split into their parts; anything else is
+    converted to a single string.
+    """
+    if isinstance(value, str) and ',' in value:
+        return [part.strip() for part in value.split(',')]
+    return [str(value)]
+
+
 def get_custom_filter_data(collection_df):
     """
     Extract column data for custom filtering.
@@ -305,12 +418,7 @@ def get_custom_filter_data(collection_df):
         # For columns that might contain comma-separated values, split them
         expanded_values = set()
         for value in unique_values:
-            if isinstance(value, str) and ',' in value:
-                # Split by comma and add each part
-                parts = [part.strip() for part in value.split(',')]
-                expanded_values.update(parts)
-            else:
-                expanded_values.add(str(value))
+            expanded_values.update(split_filter_values(value))
         
         # Convert to sorted list, removing empty strings
         sorted_values = sorted([v for v in expanded_values if v and v.strip()])
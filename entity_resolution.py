@@ -0,0 +1,217 @@
+"""
+Entity resolution module for musician network analysis.
+Canonicalizes musician names between parsing and network generation:
+normalizes spelling, finds candidate duplicates by blocking on token and
+phonetic keys, merges them with configurable rules, and keeps an alias table.
+"""
+
+import re
+import unicodedata
+from collections import Counter, defaultdict
+from difflib import SequenceMatcher
+from functools import lru_cache
+
+import pandas as pd
+
+
+# Merge rules, applied in this order:
+#   disambiguator: "Name (2)" is the same musician as "Name"
+#   normalized: names equal after case, diacritic and punctuation folding
+#   token_order: same tokens in any order ("Davis, Miles" / "Miles Davis")
+#   phonetic: same phonetic key and similar spelling ("Jon Hendricks" / "John Hendricks")
+MERGE_RULES = ('disambiguator', 'normalized', 'token_order', 'phonetic')
+
+# Exact rules only: the phonetic rule can merge distinct people, so it is opt-in
+DEFAULT_MERGE_RULES = ('disambiguator', 'normalized', 'token_order')
+
+DISAMBIGUATOR_PATTERN = re.compile(r'\s*\(\d+\)$')
+_SOUNDEX_CODES = {
+    **dict.fromkeys('bfpv', '1'), **dict.fromkeys('cgjkqsxz', '2'), **dict.fromkeys('dt', '3'),
+    'l': '4', **dict.fromkeys('mn', '5'), 'r': '6'
+}
+
+
+@lru_cache(maxsize=None)
+def normalize_name(name, strip_disambiguator=True):
+    """
+    Fold a musician name for comparison.
+    
+    Removes a Discogs "(n)" disambiguator (optionally), diacritics and
+    punctuation, and lowercases and collapses whitespace:
+    "Thélonious  Monk (2)" -> "thelonious monk".
+    """
+    if strip_disambiguator:
+        name = DISAMBIGUATOR_PATTERN.sub('', name)
+    name = unicodedata.normalize('NFKD', name)
+    name = ''.join(char for char in name if not unicodedata.combining(char))
+    name = re.sub(r"['’.]", '', name.casefold())
+    name = re.sub(r'[^\w]+', ' ', name)
+    return name.strip()
+
+
+def _soundex(token):
+    """American Soundex code of one token ('' for tokens without letters)."""
+    letters = [char for char in token if char.isalpha()]
+    if not letters:
+        return ''
+    code = letters[0].upper()
+    previous = _SOUNDEX_CODES.get(letters[0], '')
+    for char in letters[1:]:
+        digit = _SOUNDEX_CODES.get(char, '')
+        if digit and digit != previous:
+            code += digit
+        if char not in 'hw':
+            previous = digit
+    return (code + '000')[:4]
+
+
+def token_key(normalized):
+    """Blocking key insensitive to word order."""
+    return ' '.join(sorted(normalized.split()))
+
+
+def phonetic_key(normalized):
+    """
+    Blocking key of the sorted Soundex codes of the name's tokens.
+    
+    Tokens without letters (numbers) are kept verbatim, so "Player 1" and
+    "Player 11" never share a block.
+    """
+    return ' '.join(sorted(_soundex(token) or token for token in normalized.split()))
+
+
+class _UnionFind:
+    def __init__(self, size):
+        self.parent = list(range(size))
+    
+    def find(self, item):
+        root = item
+        while self.parent[root] != root:
+            root = self.parent[root]
+        while self.parent[item] != root:
+            self.parent[item], item = root, self.parent[item]
+        return root
+    
+    def union(self, a, b):
+        a, b = self.find(a), self.find(b)
+        if a != b:
+            self.parent[max(a, b)] = min(a, b)
+
+
+def resolve_names(name_counts, rules=DEFAULT_MERGE_RULES, similarity_threshold=0.9, max_block_size=50, preferred=()):
+    """
+    Group name variants that refer to the same musician.
+    
+    Exact rules merge names with equal keys in one pass over the unique
+    names. The phonetic rule only compares names inside the same phonetic
+    block, and skips blocks larger than max_block_size, so the work stays
+    near-linear in the number of unique names.
+    
+    Args:
+        name_counts: Mapping of name -> number of credits
+        rules: Merge rules to apply (see MERGE_RULES)
+        similarity_threshold: Minimum difflib similarity of the normalized
+                              names for the phonetic rule
+        max_block_size: Largest phonetic block compared pairwise
+        preferred: Names that become canonical whenever a group contains
+                   one (e.g. the spellings used as main artist)
+        
+    Returns:
+        pandas.DataFrame with columns alias, canonical and credits, one row
+        per name; the canonical name of a group is its preferred variant if
+        it has one, otherwise its most credited "First Last" variant
+    """
+    unknown = set(rules) - set(MERGE_RULES)
+    if unknown:
+        raise ValueError(f"Unknown merge rules: {', '.join(sorted(unknown))}")
+    
+    names = list(name_counts)
+    groups = _UnionFind(len(names))
+    strip = 'disambiguator' in rules
+    normalized = [normalize_name(name, strip) for name in names]
+    
+    def merge_on(keys):
+        first = {}
+        for i, key in enumerate(keys):
+            if not key:
+                continue
+            if key in first:
+                groups.union(first[key], i)
+            else:
+                first[key] = i
+    
+    if strip and 'normalized' not in rules:
+        merge_on([DISAMBIGUATOR_PATTERN.sub('', name) for name in names])
+    if 'normalized' in rules:
+        merge_on(normalized)
+    if 'token_order' in rules:
+        merge_on([token_key(name) for name in normalized])
+    
+    if 'phonetic' in rules:
+        blocks = defaultdict(dict)
+        for i, name in enumerate(normalized):
+            if name:
+                # One representative per distinct normalized spelling
+                blocks[phonetic_key(name)].setdefault(name, i)
+        for block in blocks.values():
+            if len(block) < 2 or len(block) > max_block_size:
+                continue
+            members = list(block.items())
+            for a in range(len(members)):
+                matcher = SequenceMatcher(None, b=members[a][0])
+                for b in range(a + 1, len(members)):
+                    matcher.set_seq1(members[b][0])
+                    if matcher.quick_ratio() >= similarity_threshold and matcher.ratio() >= similarity_threshold:
+                        groups.union(members[a][1], members[b][1])
+    
+    members_by_root = defaultdict(list)
+    for i in range(len(names)):
+        members_by_root[groups.find(i)].append(i)
+    
+    preferred = set(preferred)
+    canonical = {}
+    for members in members_by_root.values():
+        # Preferred, then "First Last" over "Last, First", then most credited
+        # variant, preferring names without a disambiguator
+        best = min(members, key=lambda i: (
+            names[i] not in preferred, ',' in names[i], -name_counts[names[i]],
+            bool(DISAMBIGUATOR_PATTERN.search(names[i])), names[i]
+        ))
+        for i in members:
+            canonical[names[i]] = names[best]
+    
+    return pd.DataFrame({
+        'alias': names,
+        'canonical': [canonical[name] for name in names],
+        'credits': [name_counts[name] for name in names]
+    })
+
+
+def canonicalize_musicians(network_df, rules=DEFAULT_MERGE_RULES, similarity_threshold=0.9, max_block_size=50):
+    """
+    Replace musician name variants in the network data with canonical names.
+    
+    A musician who is also a main artist keeps their main artist spelling,
+    so self-credits stay self-credits. Credits that become identical after
+    merging (the same musician, role and record) are dropped.
+    
+    Args:
+        network_df: DataFrame from create_network_data
+        rules, similarity_threshold, max_block_size: As for resolve_names
+        
+    Returns:
+        Tuple of (canonicalized network DataFrame, alias DataFrame from
+        resolve_names)
+    """
+    if network_df.empty:
+        return network_df, pd.DataFrame(columns=['alias', 'canonical', 'credits'])
+    
+    aliases = resolve_names(
+        Counter(network_df['musician']), rules, similarity_threshold, max_block_size,
+        preferred=set(network_df['main_artist'].dropna())
+    )
+    mapping = dict(zip(aliases['alias'], aliases['canonical']))
+    
+    resolved_df = network_df.assign(musician=network_df['musician'].map(mapping))
+    resolved_df = resolved_df.drop_duplicates(subset=['musician', 'role', 'main_artist', 'album'])
+    return resolved_df.reset_index(drop=True), aliases
@@ -0,0 +1,640 @@
+"""
+Graph metrics module for musician network analysis.
+Builds a sparse adjacency matrix over the musician-artist network and
+computes centrality measures on it with NumPy/SciPy.
+"""
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+
+CENTRALITY_COLUMNS = ['degree', 'weighted_degree', 'pagerank', 'eigenvector', 'betweenness']
+
+
+def csr_from_pairs(rows, columns, n_rows):
+    """Build CSR indptr/indices from (row, column) pairs, deduplicated and sorted."""
+    pairs = np.unique(np.stack([rows, columns], axis=1).reshape(-1, 2), axis=0)
+    indptr = np.zeros(n_rows + 1, dtype=np.int64)
+    np.cumsum(np.bincount(pairs[:, 0], minlength=n_rows), out=indptr[1:])
+    return indptr, pairs[:, 1]
+
+
+def row_positions(indptr, rows):
+    """Positions in the CSR entry arrays of all entries in the given rows."""
+    starts = indptr[rows]
+    lengths = indptr[rows + 1] - starts
+    offsets = np.repeat(starts - np.cumsum(lengths) + lengths, lengths)
+    return offsets + np.arange(lengths.sum())
+
+
+def build_adjacency(network_df):
+    """
+    Build a symmetric sparse adjacency matrix from the network connections.
+
+    Musicians and main artists share one node namespace, so a musician who is
+    also a main artist is a single node (as in the ECharts network). Edge
+    weights count the credits between a musician and a main artist.
+
+    Args:
+        network_df: DataFrame from create_network_data
+
+    Returns:
+        Tuple of (scipy.sparse.csr_matrix adjacency, numpy array of node names)
+    """
+    musicians = network_df['musician'].to_numpy(dtype=object)
+    artists = network_df['main_artist'].to_numpy(dtype=object)
+
+    # Credits on a musician's own record are not collaborations
+    keep = musicians != artists
+    musicians = musicians[keep]
+    artists = artists[keep]
+
+    codes, names = pd.factorize(np.concatenate([artists, musicians]))
+    n_edges = len(artists)
+    rows = codes[n_edges:]
+    cols = codes[:n_edges]
+    n_nodes = len(names)
+
+    weights = np.ones(n_edges, dtype=np.float64)
+    adjacency = sparse.coo_matrix((weights, (rows, cols)), shape=(n_nodes, n_nodes)).tocsr()
+    adjacency = (adjacency + adjacency.T).tocsr()
+
+    return adjacency, np.asarray(names, dtype=object)
+
+
+def pagerank(adjacency, damping=0.85, max_iter=100, tol=1e-8):
+    """
+    Compute PageRank by power iteration.
+
+    Args:
+        adjacency: Symmetric sparse adjacency matrix (weighted)
+        damping: Damping factor
+        max_iter: Maximum number of iterations
+        tol: L1 convergence tolerance
+
+    Returns:
+        numpy array of PageRank scores summing to 1
+    """
+    n = adjacency.shape[0]
+    if n == 0:
+        return np.zeros(0)
+
+    out_weight = np.asarray(adjacency.sum(axis=1)).ravel()
+    dangling = out_weight == 0
+    inv_out = np.divide(1.0, out_weight, out=np.zeros(n), where=~dangling)
+
+    rank = np.full(n, 1.0 / n)
+    for _ in range(max_iter):
+        # The matrix is symmetric, so A @ x equals A.T @ x
+        spread = adjacency @ (rank * inv_out)
+        new_rank = damping * (spread + rank[dangling].sum() / n) + (1 - damping) / n
+        if np.abs(new_rank - rank).sum() < tol:
+            rank = new_rank
+            break
+        rank = new_rank
+
+    return rank / rank.sum()
+
+
+def eigenvector_centrality(adjacency, max_iter=100, tol=1e-8):
+    """
+    Compute eigenvector centrality by power iteration.
+
+    Iterates on (A + I) rather than A: the musician-artist graph is
+    bipartite, so plain power iteration would oscillate between the two
+    sides instead of converging.
+
+    Args:
+        adjacency: Symmetric sparse adjacency matrix (weighted)
+        max_iter: Maximum number of iterations
+        tol: L1 convergence tolerance
+
+    Returns:
+        numpy array of centrality scores with unit L2 norm
+    """
+    n = adjacency.shape[0]
+    if n == 0:
+        return np.zeros(0)
+
+    vector = np.full(n, 1.0 / np.sqrt(n))
+    for _ in range(max_iter):
+        new_vector = adjacency @ vector + vector
+        norm = np.linalg.norm(new_vector)
+        if norm == 0:
+            return new_vector
+        new_vector /= norm
+        if np.abs(new_vector - vector).sum() < n * tol:
+            vector = new_vector
+            break
+        vector = new_vector
+
+    return vector
+
+
+def approximate_betweenness(adjacency, samples=32, batch_size=32, seed=42):
+    """
+    Estimate normalized betweenness centrality from sampled BFS sources.
+
+    Runs Brandes' algorithm on the unweighted graph from a random sample of
+    source nodes. Sources are processed in batches as dense columns so each
+    BFS level is a single sparse matrix product.
+
+    Args:
+        adjacency: Symmetric sparse adjacency matrix
+        samples: Number of source nodes to sample (all nodes if larger than n)
+        batch_size: Number of sources expanded together
+        seed: Random seed for source sampling
+
+    Returns:
+        numpy array of normalized betweenness estimates
+    """
+    n = adjacency.shape[0]
+    betweenness = np.zeros(n)
+    if n < 3:
+        return betweenness
+
+    # Path counts only feed ratios, so single precision halves the cost of
+    # every sparse product without visibly changing the estimate
+    binary = adjacency.astype(np.float32)
+    binary.data[:] = 1.0
+
+    rng = np.random.default_rng(seed)
+    k = min(samples, n)
+    sources = rng.choice(n, size=k, replace=False)
+
+    for start in range(0, k, batch_size):
+        batch = sources[start:start + batch_size]
+        b = len(batch)
+        columns = np.arange(b)
+
+        dist = np.full((n, b), -1, dtype=np.int32)
+        sigma = np.zeros((n, b), dtype=np.float32)
+        dist[batch, columns] = 0
+        sigma[batch, columns] = 1.0
+
+        # Forward pass: count shortest paths level by level
+        frontier = sigma.copy()
+        depth = 0
+        while True:
+            reached = binary @ frontier
+            new_mask = (dist == -1) & (reached > 0)
+            if not new_mask.any():
+                break
+            depth += 1
+            dist[new_mask] = depth
+            frontier = np.where(new_mask, reached, 0.0).astype(np.float32)
+            sigma += frontier
+
+        # Backward pass: accumulate dependencies from the deepest level up,
+        # only multiplying out the rows that sit on the level above
+        delta = np.zeros((n, b), dtype=np.float32)
+        safe_sigma = np.where(sigma > 0, sigma, 1.0)
+        for level in range(depth, 0, -1):
+            coef = np.where(dist == level, (1.0 + delta) / safe_sigma, 0.0).astype(np.float32)
+            parent_mask = dist == level - 1
+            parent_rows = np.flatnonzero(parent_mask.any(axis=1))
+            contrib = binary[parent_rows] @ coef
+            delta[parent_rows] += np.where(parent_mask[parent_rows], sigma[parent_rows] * contrib, 0.0)
+
+        delta[batch, columns] = 0.0
+        betweenness += delta.sum(axis=1, dtype=np.float64)
+
+    # Extrapolate from k sources; undirected pairs are counted twice
+    scale = n / k / ((n - 1) * (n - 2))
+    return betweenness * scale
+
+
+def compute_centrality_metrics(network_df, damping=0.85, max_iter=100, tol=1e-8,
+                               betweenness_samples=32, seed=42):
+    """
+    Compute centrality metrics for every node in the network.
+
+    Args:
+        network_df: DataFrame from create_network_data
+        damping: PageRank damping factor
+        max_iter: Maximum power iterations for PageRank and eigenvector centrality
+        tol: Convergence tolerance for power iterations
+        betweenness_samples: Number of sampled sources for betweenness
+        seed: Random seed for betweenness sampling
+
+    Returns:
+        pandas.DataFrame with columns: node, degree, weighted_degree,
+        pagerank, eigenvector, betweenness
+    """
+    adjacency, names = build_adjacency(network_df)
+
+    degree = np.diff(adjacency.indptr)
+    weighted_degree = np.asarray(adjacency.sum(axis=1)).ravel()
+
+    return pd.DataFrame({
+        'node': names,
+        'degree': degree.astype(np.int64),
+        'weighted_degree': weighted_degree.astype(np.int64),
+        'pagerank': pagerank(adjacency, damping, max_iter, tol),
+        'eigenvector': eigenvector_centrality(adjacency, max_iter, tol),
+        'betweenness': approximate_betweenness(adjacency, betweenness_samples, seed=seed)
+    })
+
+
+def add_centrality_metrics(musician_stats_df, network_df, **kwargs):
+    """
+    Join centrality metrics onto the musician statistics frame.
+
+    Args:
+        musician_stats_df: DataFrame from analyze_top_musicians
+        network_df: DataFrame from create_network_data
+        **kwargs: Passed through to compute_centrality_metrics
+
+    Returns:
+        pandas.DataFrame with the centrality columns added
+    """
+    metrics_df = compute_centrality_metrics(network_df, **kwargs)
+    merged = musician_stats_df.merge(
+        metrics_df.rename(columns={'node': 'musician'}),
+        on='musician',
+        how='left'
+    )
+    # Musicians only credited on their own records have no collaboration edges
+    merged[CENTRALITY_COLUMNS] = merged[CENTRALITY_COLUMNS].fillna(0)
+    merged[['degree', 'weighted_degree']] = merged[['degree', 'weighted_degree']].astype(np.int64)
+    return merged
+
+
+def build_link_adjacency(network_data):
+    """
+    Build a symmetric sparse adjacency matrix over the ECharts network.
+
+    Rows and columns follow the order of network_data['nodes'] and edge
+    weights are the link values.
+
+    Args:
+        network_data: Dictionary from create_echarts_network_data
+
+    Returns:
+        scipy.sparse.csr_matrix adjacency
+    """
+    nodes = network_data['nodes']
+    links = network_data['links']
+    node_index = {node['id']: i for i, node in enumerate(nodes)}
+
+    rows = np.fromiter((node_index[link['source']] for link in links), dtype=np.int64, count=len(links))
+    cols = np.fromiter((node_index[link['target']] for link in links), dtype=np.int64, count=len(links))
+    weights = np.fromiter((link['value'] for link in links), dtype=np.float64, count=len(links))
+
+    n_nodes = len(nodes)
+    adjacency = sparse.coo_matrix((weights, (rows, cols)), shape=(n_nodes, n_nodes)).tocsr()
+    return (adjacency + adjacency.T).tocsr()
+
+
+def label_propagation(adjacency, max_iter=20, seed=42):
+    """
+    Detect communities with semi-synchronous weighted label propagation.
+
+    Each iteration every node computes the label carrying the most edge
+    weight among its neighbours; a random half of the nodes adopt it. Updating
+    only half the nodes avoids the two-cycle oscillation synchronous label
+    propagation falls into on bipartite graphs. Ties are broken by a seeded
+    random key, so results are deterministic for a given seed. All work is
+    done on arrays the size of the edge list.
+
+    Args:
+        adjacency: Symmetric sparse adjacency matrix (weighted, CSR)
+        max_iter: Maximum number of propagation rounds
+        seed: Random seed for update order and tie-breaking
+
+    Returns:
+        numpy array of community ids, numbered by community size (0 = largest)
+    """
+    n = adjacency.shape[0]
+    if n == 0:
+        return np.zeros(0, dtype=np.int64)
+
+    rng = np.random.default_rng(seed)
+    rows = np.repeat(np.arange(n, dtype=np.int64), np.diff(adjacency.indptr))
+    cols = adjacency.indices.astype(np.int64)
+    weights = adjacency.data
+    has_neighbours = np.diff(adjacency.indptr) > 0
+
+    labels = np.arange(n, dtype=np.int64)
+    for _ in range(max_iter):
+        # Total weight of each (node, neighbour label) pair
+        keys, inverse = np.unique(rows * n + labels[cols], return_inverse=True)
+        key_weights = np.bincount(inverse, weights=weights)
+        key_nodes = keys // n
+        key_labels = keys % n
+
+        # Pick the heaviest label per node, breaking ties randomly
+        order = np.lexsort((rng.random(len(keys)), -key_weights, key_nodes))
+        first = np.ones(len(order), dtype=bool)
+        first[1:] = key_nodes[order][1:] != key_nodes[order][:-1]
+        best = labels.copy()
+        best[key_nodes[order][first]] = key_labels[order][first]
+
+        # A node is settled when its current label is already among the heaviest
+        max_weight = np.zeros(n)
+        np.maximum.at(max_weight, key_nodes, key_weights)
+        current = key_labels == labels[key_nodes]
+        current_weight = np.zeros(n)
+        current_weight[key_nodes[current]] = key_weights[current]
+        unsettled = has_neighbours & (current_weight < max_weight)
+        if not unsettled.any():
+            break
+
+        update = unsettled & (rng.random(n) < 0.5)
+        labels[update] = best[update]
+
+    _, communities, sizes = np.unique(labels, return_inverse=True, return_counts=True)
+    # Renumber so community 0 is the largest; ties keep first-seen order
+    rank = np.empty(len(sizes), dtype=np.int64)
+    rank[np.argsort(-sizes, kind='stable')] = np.arange(len(sizes))
+    return rank[communities.ravel()]
+
+
+def assign_communities(network_data, max_iter=20, seed=42, max_categories=10, colors=None):
+    """
+    Detect communities and attach them to the ECharts network data.
+
+    Adds a 'community' id to every node and a 'community_categories' list that
+    the page can use as ECharts categories. The largest communities each get a
+    category named after their best-connected node; the rest share an
+    'Other communities' category.
+
+    Args:
+        network_data: Dictionary from create_echarts_network_data (modified in place)
+        max_iter: Maximum label propagation rounds
+        seed: Random seed for label propagation
+        max_categories: Number of communities given their own category
+        colors: Optional list of category colors
+
+    Returns:
+        The same network_data dictionary
+    """
+    adjacency = build_link_adjacency(network_data)
+    communities = label_propagation(adjacency, max_iter=max_iter, seed=seed)
+    weighted_degree = np.asarray(adjacency.sum(axis=1)).ravel()
+
+    nodes = network_data['nodes']
+    for node, community in zip(nodes, communities):
+        node['community'] = int(community)
+
+    n_communities = int(communities.max()) + 1 if len(communities) else 0
+    categories = []
+    for community in range(min(n_communities, max_categories)):
+        members = np.flatnonzero(communities == community)
+        hub = nodes[members[np.argmax(weighted_degree[members])]]['name']
+        categories.append({'name': f"Community {community + 1} ({hub})", 'size': int(len(members))})
+    if n_communities > max_categories:
+        categories.append({
+            'name': 'Other communities',
+            'size': int((communities >= max_categories).sum())
+        })
+
+    if colors:
+        for i, category in enumerate(categories):
+            category['itemStyle'] = {'color': colors[i % len(colors)]}
+
+    network_data['community_categories'] = categories
+    network_data['community_count'] = n_communities
+    return network_data
+
+
+def core_numbers(adjacency):
+    """
+    Compute the k-core number of every node.
+
+    Peels all nodes whose remaining degree is at most k in one vectorized
+    step and raises k once nothing more can be peeled. Each round only
+    decrements the degrees of the peeled nodes' neighbours and only checks
+    those neighbours for the next round, so every edge is touched a constant
+    number of times however many rounds the peeling takes.
+
+    Args:
+        adjacency: Symmetric sparse adjacency matrix (CSR)
+
+    Returns:
+        numpy array of core numbers
+    """
+    n = adjacency.shape[0]
+    binary = adjacency.astype(np.int64)
+    binary.data[:] = 1
+    binary.setdiag(0)
+    binary.eliminate_zeros()
+    indptr, indices = binary.indptr, binary.indices
+
+    degree = np.diff(indptr).astype(np.int64)
+    core = np.zeros(n, dtype=np.int64)
+    alive = np.ones(n, dtype=bool)
+    slot = np.zeros(n, dtype=np.int64)
+
+    k = 0
+    while alive.any():
+        k = max(k, degree[alive].min())
+        peel = np.flatnonzero(alive & (degree <= k))
+        while peel.size:
+            core[peel] = k
+            alive[peel] = False
+
+            # Gather the peeled rows' neighbours straight from the CSR arrays
+            neighbours = indices[row_positions(indptr, peel)]
+            np.subtract.at(degree, neighbours, 1)
+
+            # A node next to several peeled nodes is a candidate only once
+            peel = neighbours[alive[neighbours] & (degree[neighbours] <= k)]
+            order = np.arange(peel.size)
+            slot[peel] = order
+            peel = peel[slot[peel] == order]
+
+    return core
+
+
+def assign_detail_tiers(network_data, metric='core', tier_sizes=(200, 1000, 5000),
+                        link_min_values=(3, 2, 1), link_budget=3000):
+    """
+    Assign level-of-detail tiers to nodes and links of the ECharts network.
+
+    Nodes are ranked by the chosen metric and tier t holds the top
+    tier_sizes[t] of them; a final tier holds everything. A link belongs to
+    the first tier that contains both endpoints and whose minimum link value
+    it meets. The page renders the finest tier that fits its link budget.
+
+    Args:
+        network_data: Dictionary from create_echarts_network_data (modified in place)
+        metric: Node attribute to rank by; 'core' ranks by k-core number,
+                then by node value
+        tier_sizes: Number of nodes in each tier before the final one
+        link_min_values: Minimum link value in each tier before the final one
+        link_budget: Number of links the page renders before coarsening
+
+    Returns:
+        The same network_data dictionary
+    """
+    if np.any(np.diff(tier_sizes) <= 0):
+        raise ValueError(f"Detail tier sizes must increase from tier to tier, got {list(tier_sizes)}")
+    if np.any(np.diff(link_min_values) > 0):
+        raise ValueError(f"Detail tier minimum link values must not increase from tier to tier, got {list(link_min_values)}")
+
+    nodes = network_data['nodes']
+    links = network_data['links']
+    adjacency = build_link_adjacency(network_data)
+    cores = core_numbers(adjacency)
+
+    for node, core in zip(nodes, cores):
+        node['core'] = int(core)
+
+    values = np.array([node['value'] for node in nodes], dtype=np.float64)
+    if metric == 'core':
+        order = np.lexsort((-values, -cores))
+    else:
+        scores = np.array([node.get(metric, 0) for node in nodes], dtype=np.float64)
+        order = np.lexsort((-values, -scores))
+    rank = np.empty(len(nodes), dtype=np.int64)
+    rank[order] = np.arange(len(nodes))
+
+    node_tier = np.searchsorted(np.asarray(tier_sizes), rank, side='right')
+
+    node_index = {node['id']: i for i, node in enumerate(nodes)}
+    sources = np.fromiter((node_index[link['source']] for link in links), dtype=np.int64, count=len(links))
+    targets = np.fromiter((node_index[link['target']] for link in links), dtype=np.int64, count=len(links))
+    link_values = np.fromiter((link['value'] for link in links), dtype=np.int64, count=len(links))
+    value_tier = (np.asarray(link_min_values)[None, :] > link_values[:, None]).sum(axis=1)
+    link_tier = np.maximum(np.maximum(node_tier[sources], node_tier[targets]), value_tier)
+
+    # Drop trailing tiers that add nothing over the previous one
+    tiers = []
+    for tier in range(len(tier_sizes) + 1):
+        node_count = int((node_tier <= tier).sum())
+        link_count = int((link_tier <= tier).sum())
+        tiers.append({
+            'tier': tier,
+            'max_nodes': int(tier_sizes[tier]) if tier < len(tier_sizes) else len(nodes),
+            'min_link_value': int(link_min_values[tier]) if tier < len(link_min_values) else 1,
+            'nodes': node_count,
+            'links': link_count
+        })
+        if node_count == len(nodes) and link_count == len(links):
+            break
+    last_tier = len(tiers) - 1
+
+    for node, tier in zip(nodes, node_tier):
+        node['tier'] = int(min(tier, last_tier))
+    for link, tier in zip(links, link_tier):
+        link['tier'] = int(min(tier, last_tier))
+
+    network_data['detail_levels'] = {
+        'metric': metric,
+        'link_budget': link_budget,
+        'tiers': tiers
+    }
+    return network_data
+
+
+def build_ego_index(network_data):
+    """
+    Build CSR neighbour arrays over the ECharts network for ego-network queries.
+
+    Rows follow the order of network_data['nodes']. Each entry records the
+    neighbouring node, the index of the link it comes from, and the link value.
+
+    Args:
+        network_data: Dictionary from create_echarts_network_data
+
+    Returns:
+        Dictionary with indptr, indices, link_ids and weights arrays, and a
+        node_index mapping node ids to rows
+    """
+    nodes = network_data['nodes']
+    links = network_data['links']
+    node_index = {node['id']: i for i, node in enumerate(nodes)}
+
+    sources = np.fromiter((node_index[link['source']] for link in links), dtype=np.int64, count=len(links))
+    targets = np.fromiter((node_index[link['target']] for link in links), dtype=np.int64, count=len(links))
+    values = np.fromiter((link['value'] for link in links), dtype=np.float64, count=len(links))
+
+    rows = np.concatenate([sources, targets])
+    cols = np.concatenate([targets, sources])
+    link_ids = np.concatenate([np.arange(len(links)), np.arange(len(links))])
+    order = np.lexsort((cols, rows))
+
+    indptr = np.zeros(len(nodes) + 1, dtype=np.int64)
+    np.cumsum(np.bincount(rows, minlength=len(nodes)), out=indptr[1:])
+
+    return {
+        'indptr': indptr,
+        'indices': cols[order],
+        'link_ids': link_ids[order],
+        'weights': np.concatenate([values, values])[order],
+        'node_index': node_index
+    }
+
+
+def ego_network(network_data, center, depth=2, max_nodes=500, index=None):
+    """
+    Extract the k-hop neighbourhood of a musician or artist.
+
+    Breadth-first search over the CSR arrays, one vectorized step per hop.
+    When a hop would exceed max_nodes, the new nodes most strongly attached
+    to the nodes found so far (by total link value) are kept and the result
+    is marked truncated. The subgraph is induced: every link between two
+    returned nodes is included.
+
+    Args:
+        network_data: Dictionary from create_echarts_network_data
+        center: Node id (musician or artist name)
+        depth: Number of hops
+        max_nodes: Node budget, including the center
+        index: Optional result of build_ego_index, reused across queries
+
+    Returns:
+        Dictionary with center, depth, nodes (each with a 'hop' distance),
+        links and truncated
+    """
+    if index is None:
+        index = build_ego_index(network_data)
+    if center not in index['node_index']:
+        raise KeyError(center)
+
+    indptr = index['indptr']
+    indices = index['indices']
+    hops = np.full(len(indptr) - 1, -1, dtype=np.int64)
+    start = index['node_index'][center]
+    hops[start] = 0
+
+    frontier = np.array([start], dtype=np.int64)
+    found = 1
+    truncated = False
+    for hop in range(1, depth + 1):
+        if len(frontier) == 0 or truncated:
+            break
+        positions = row_positions(indptr, frontier)
+        neighbours = indices[positions]
+        is_new = hops[neighbours] < 0
+        candidates, inverse = np.unique(neighbours[is_new], return_inverse=True)
+
+        budget = max_nodes - found
+        if len(candidates) > budget:
+            attachment = np.bincount(inverse, weights=index['weights'][positions][is_new], minlength=len(candidates))
+            keep = np.sort(np.argsort(-attachment, kind='stable')[:max(budget, 0)])
+            candidates = candidates[keep]
+            truncated = True
+
+        hops[candidates] = hop
+        found += len(candidates)
+        frontier = candidates
+
+    selected = np.flatnonzero(hops >= 0)
+    selected = selected[np.argsort(hops[selected], kind='stable')]
+
+    positions = row_positions(indptr, selected)
+    induced = positions[hops[indices[positions]] >= 0]
+    link_ids = np.unique(index['link_ids'][induced])
+
+    nodes = network_data['nodes']
+    links = network_data['links']
+    return {
+        'center': center,
+        'depth': depth,
+        'nodes': [dict(nodes[i], hop=int(hops[i])) for i in selected],
+        'links': [links[i] for i in link_ids],
+        'truncated': truncated
+    }
@@ -4,6 +4,17 @@ Creates the complete interactive HTML file with all tabs and functionality.
 """
 
 import json
+import os
+import tempfile
+
+from assets import get_library_tags, get_page_libraries, minify_html_page, minify_js
+from columnar import (
+    encode_ego_index, encode_metric_ranks, encode_musician_aggregates, encode_network_payload,
+    encode_period_snapshots, encode_record_graph
+)
+
+# Rankings the page reads (Top Musicians chart and Session Musicians list)
+PAGE_RANK_METRICS = ('total_records', 'session_ratio')
 
 
 def get_html_template():
@@ -15,8 +26,7 @@ def get_html_template():
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>Musician Network - Complete Analysis</title>
-    <script src="https://cdn.jsdelivr.net/npm/echarts@5.4.3/dist/echarts.min.js"></script>
-    <script src="https://cdn.jsdelivr.net/npm/chart.js"></script>
+    {library_scripts}
     <style>
         body {
             margin: 0;
@@ -645,6 +655,26 @@ def get_html_template():
                 <button class="add-filter-btn" onclick="addCustomFilter()">+ Add Custom Filter</button>
             </div>
             
+            <div class="control-group" id="colorModeGroup">
+                <label for="colorModeSelect">Color Nodes By:</label>
+                <select id="colorModeSelect" onchange="setColorMode(this.value)">
+                    <option value="type">Musician / Artist</option>
+                    <option value="community">Community</option>
+                </select>
+            </div>
+            
+            <div class="control-group" id="periodGroup">
+                <label for="periodSlider">Released Up To: <span id="periodLabel">All years</span></label>
+                <input type="range" id="periodSlider" min="0" max="0" value="0" step="1" oninput="setPeriod(this.value)">
+            </div>
+            
+            <div class="control-group" id="detailLevelGroup">
+                <label for="detailLevelSelect">Detail Level:</label>
+                <select id="detailLevelSelect" onchange="setDetailMode(this.value)">
+                    <option value="auto">Auto</option>
+                </select>
+            </div>
+            
             <button onclick="resetFilters()" class="reset-button">Reset Filters</button>
         </div>
         
@@ -653,6 +683,7 @@ def get_html_template():
             <span class="stats-item">Artists: <span class="stats-value" id="artistCount">0</span></span>
             <span class="stats-item">Connections: <span class="stats-value" id="connectionCount">0</span></span>
             <span class="stats-item">Active Filters: <span class="stats-value" id="activeFilters">None</span></span>
+            <span class="stats-item">Detail: <span class="stats-value" id="detailLevel">Full network</span></span>
         </div>
         </div>
         
@@ -752,19 +783,66 @@ def get_html_template():
     <script>
         // Global data variables
         let fullNetworkData = {network_data_placeholder};
-        let currentData = JSON.parse(JSON.stringify(fullNetworkData));
+        let currentData = getUnfilteredData();
         let myChart;
         let selectedRoles = new Set();
         let customFilters = []; // Array of custom filter objects
         let nextCustomFilterId = 1;
+        let colorMode = 'type'; // 'type' or 'community'
+        let detailMode = 'auto'; // 'auto' or a tier index
+        let activeTier = null;
+        let chartView = {}; // Current zoom and center of the network chart
+        let filterWorker = null;
+        let filterRequestId = 0; // Only the result for the latest request is applied
+        let filteredMusicianStats = null; // Musician lists from the latest filter result
+        let renderedChart = null; // Nodes, links and color mode currently drawn
+        let filterDebounceTimer = null;
+        const FILTER_DEBOUNCE_MS = 150; // Quiet time after the last filter click before filtering
         
         // Analysis data
         let musicianStatsData = {musician_stats_placeholder};
         let sessionMusiciansData = {session_musicians_placeholder};
         
+        // Stats positions per metric, highest first (see analysis.build_metric_ranks)
+        let musicianRanksData = {musician_ranks_placeholder};
+        let musicianRanks = {}; // Decoded on first use
+        const TOP_MUSICIANS_CHART_SIZE = 15;
+        // Session musician rule (config.SESSION_MUSICIAN_MIN_RECORDS / _MIN_RATIO)
+        const SESSION_RULE = {session_rule_placeholder};
+        
         // Custom filter data
         let customFilterData = {custom_filter_data_placeholder};
         
+        // Artist genre/style filters, offered next to the custom columns and tested
+        // against per-node bitsets of the network's genre and style dictionaries
+        const artistAttributeColumns = {};
+        [['Artist Genres', 'genres'], ['Artist Styles', 'styles']].forEach(([column, key]) => {
+            if (fullNetworkData[key] && fullNetworkData[key].length > 0 && !(column in customFilterData)) {
+                customFilterData[column] = fullNetworkData[key];
+                artistAttributeColumns[column] = key;
+            }
+        });
+        
+        // 'canvas' (ECharts graph series) or 'webgl' (ECharts-GL graphGL series)
+        const chartRenderer = {chart_renderer_placeholder};
+        
+        // Sparse musician/record/role/value matrices for the scatter plot (see analysis.py)
+        let musicianAggregates = {musician_aggregates_placeholder};
+        
+        // CSR neighbour arrays for k-hop ego networks (see graph_metrics.build_ego_index)
+        let egoIndexData = {ego_index_placeholder};
+        let egoIndex = null; // Decoded on first use
+        let egoView = null; // Center and hop distances while an ego network is shown
+        
+        // Per-period increments for cumulative time snapshots (see temporal.py)
+        let periodSnapshots = {period_snapshots_placeholder};
+        let selectedPeriod = null; // Period index shown, or null for all years
+        let periodLinks = new Map(); // Link copies carrying a period's value, reused while it is unchanged
+        
+        // Bipartite musician-record graph for collaboration paths (see paths.py)
+        let recordGraphData = {record_graph_placeholder};
+        let recordGraph = null; // Decoded on first use
+        
         // Initialize ECharts
         myChart = echarts.init(document.getElementById('container'));
         
@@ -773,17 +851,23 @@ def get_html_template():
         
         // Initialize everything
         populateFilters();
+        filterWorker = createFilterWorker();
         updateChart();
         updateStats();
+        console.log(`Page ready in ${Math.round(performance.now())} ms`);
         
         // Event listeners
         
         myChart.on('click', function(params) {
-            if (params.dataType === 'node') {
+            if (isNodeEvent(params)) {
                 showNodeDetails(params.data);
             }
         });
         
+        myChart.on('graphRoam', function(params) {
+            onChartRoam(params);
+        });
+        
         window.addEventListener('resize', function() {
             myChart.resize();
         });
@@ -802,6 +886,127 @@ def get_html_template():
 def get_javascript_functions():
     """Return all JavaScript functions for the HTML file."""
     return '''
+        // Decode a columnar network payload (see columnar.py) into node and link objects.
+        // Numeric columns are read through typed-array views over the decoded base64
+        // buffers; strings are shared references into one dictionary table.
+        function decodeTypedArray(column) {
+            const typedArrays = {
+                u8: Uint8Array, u16: Uint16Array, u32: Uint32Array,
+                i32: Int32Array, f32: Float32Array, f64: Float64Array
+            };
+            const binary = atob(column.data);
+            const bytes = new Uint8Array(binary.length);
+            for (let i = 0; i < binary.length; i++) {
+                bytes[i] = binary.charCodeAt(i);
+            }
+            return new typedArrays[column.type](bytes.buffer);
+        }
+        
+        function decodeNetworkPayload(payload) {
+            const start = performance.now();
+            const strings = payload.strings;
+            const toTypedArray = decodeTypedArray;
+            
+            function listReader(column) {
+                const offsets = toTypedArray(column.offsets);
+                const values = toTypedArray(column.values);
+                return i => {
+                    const list = new Array(offsets[i + 1] - offsets[i]);
+                    for (let j = offsets[i], k = 0; j < offsets[i + 1]; j++, k++) {
+                        list[k] = strings[values[j]];
+                    }
+                    return list;
+                };
+            }
+            
+            function columnReader(column) {
+                if (column.kind === 'list') return listReader(column);
+                if (column.kind === 'index_list') {
+                    const offsets = toTypedArray(column.offsets);
+                    const values = toTypedArray(column.values);
+                    return i => Array.from(values.subarray(offsets[i], offsets[i + 1]));
+                }
+                if (column.kind === 'json') return i => column.values[i];
+                const values = toTypedArray(column.values);
+                if (column.kind === 'string') return i => strings[values[i]];
+                return i => values[i];
+            }
+            
+            function decodeRecords(columns, count) {
+                const readers = Object.keys(columns).map(key => ({
+                    key: key,
+                    read: columnReader(columns[key]),
+                    present: columns[key].present ? toTypedArray(columns[key].present) : null
+                }));
+                const records = new Array(count);
+                for (let i = 0; i < count; i++) {
+                    const record = {};
+                    readers.forEach(reader => {
+                        if (!reader.present || reader.present[i]) {
+                            record[reader.key] = reader.read(i);
+                        }
+                    });
+                    records[i] = record;
+                }
+                return records;
+            }
+            
+            const linkColumns = Object.assign({}, payload.links);
+            const sources = toTypedArray(linkColumns.source.values);
+            const targets = toTypedArray(linkColumns.target.values);
+            delete linkColumns.source;
+            delete linkColumns.target;
+            
+            const nodes = decodeRecords(payload.nodes, payload.node_count);
+            if (payload.name_is_id) {
+                nodes.forEach(node => { node.name = node.id; });
+            }
+            
+            const links = decodeRecords(linkColumns, payload.link_count);
+            links.forEach((link, i) => {
+                link.source = nodes[sources[i]].id;
+                link.target = nodes[targets[i]].id;
+            });
+            
+            // Custom column values stay columnar: typed offset/code arrays per column
+            const linkAttributes = {};
+            Object.keys(payload.link_attributes).forEach(column => {
+                const attribute = payload.link_attributes[column];
+                linkAttributes[column] = {
+                    values: attribute.values,
+                    offsets: toTypedArray(attribute.offsets),
+                    codes: toTypedArray(attribute.codes)
+                };
+            });
+            
+            console.log(`Decoded ${nodes.length} nodes and ${links.length} links in ${Math.round(performance.now() - start)} ms`);
+            return Object.assign({}, payload.meta, { nodes: nodes, links: links, link_attributes: linkAttributes });
+        }
+        
+        // Genre or style names of a node, which stores indices into the network's dictionaries
+        function attributeNames(node, key) {
+            return (node[key] || []).map(i => fullNetworkData[key][i]);
+        }
+        
+        // Per-node bitsets of genre or style indices, words 32-bit words per node
+        function buildAttributeBitsets(key) {
+            const words = Math.max(1, Math.ceil(fullNetworkData[key].length / 32));
+            const bits = new Uint32Array(fullNetworkData.nodes.length * words);
+            fullNetworkData.nodes.forEach((node, n) => {
+                (node[key] || []).forEach(i => { bits[n * words + (i >>> 5)] |= 1 << (i & 31); });
+            });
+            return { words: words, bits: bits };
+        }
+        
+        function getUnfilteredData() {
+            // Filtering never mutates node or link objects, so a shallow view is enough
+            return {
+                nodes: fullNetworkData.nodes,
+                links: fullNetworkData.links,
+                categories: fullNetworkData.categories
+            };
+        }
+        
         // Tab switching
         function showTab(tabName) {
             // Hide all tabs
@@ -839,6 +1044,143 @@ def get_javascript_functions():
             populateRoleOptions(roles);
             updateRoleFilterDisplay();
             updateRoleCheckboxes();
+            
+            // Community coloring is only available when communities were detected
+            if (!fullNetworkData.community_categories) {
+                document.getElementById('colorModeGroup').style.display = 'none';
+            }
+            
+            populateDetailLevels();
+            populatePeriods();
+        }
+        
+        // Time snapshots: the slider runs over the periods, its last stop shows all years
+        function populatePeriods() {
+            if (!periodSnapshots) {
+                document.getElementById('periodGroup').style.display = 'none';
+                return;
+            }
+            const slider = document.getElementById('periodSlider');
+            slider.max = periodSnapshots.labels.length;
+            slider.value = periodSnapshots.labels.length;
+        }
+        
+        function setPeriod(value) {
+            const position = Number(value);
+            selectedPeriod = position < periodSnapshots.labels.length ? position : null;
+            document.getElementById('periodLabel').textContent = selectedPeriod === null
+                ? 'All years'
+                : `${periodSnapshots.labels[selectedPeriod]} (${periodSnapshots.summary.links[selectedPeriod]} links)`;
+            // Snapshots are cheap to switch, so the slider skips the debounce
+            filterData(0);
+        }
+        
+        function getPeriodLink(index, value) {
+            const link = fullNetworkData.links[index];
+            if (link.value === value) return link;
+            const cached = periodLinks.get(index);
+            if (cached && cached.value === value) return cached;
+            const periodLink = Object.assign({}, link, { value: value });
+            periodLinks.set(index, periodLink);
+            return periodLink;
+        }
+        
+        // Level of detail: render the finest precomputed tier that fits the link budget
+        function populateDetailLevels() {
+            const levels = fullNetworkData.detail_levels;
+            if (!levels) {
+                document.getElementById('detailLevelGroup').style.display = 'none';
+                return;
+            }
+            
+            const select = document.getElementById('detailLevelSelect');
+            levels.tiers.forEach(tier => {
+                const option = document.createElement('option');
+                option.value = tier.tier;
+                option.textContent = tier.tier === levels.tiers.length - 1
+                    ? `Full network (${tier.links} links)`
+                    : `Tier ${tier.tier + 1} (${tier.nodes} nodes, ${tier.links} links)`;
+                select.appendChild(option);
+            });
+        }
+        
+        function setDetailMode(mode) {
+            detailMode = mode;
+            updateChart();
+        }
+        
+        function getDetailTier(links) {
+            const levels = fullNetworkData.detail_levels;
+            if (!levels) return null;
+            
+            const lastTier = levels.tiers.length - 1;
+            if (detailMode !== 'auto') return Number(detailMode);
+            
+            // Cumulative link counts per tier for the currently filtered links
+            const cumulative = new Array(levels.tiers.length).fill(0);
+            links.forEach(link => cumulative[link.tier]++);
+            for (let t = 1; t <= lastTier; t++) {
+                cumulative[t] += cumulative[t - 1];
+            }
+            
+            let budgetTier = 0;
+            while (budgetTier < lastTier && cumulative[budgetTier + 1] <= levels.link_budget) {
+                budgetTier++;
+            }
+            
+            // Zooming in refines one tier per doubling, up to a hard cap
+            const zoomBonus = Math.max(0, Math.floor(Math.log2(chartView.zoom || 1)));
+            let tier = Math.min(lastTier, budgetTier + zoomBonus);
+            while (tier > budgetTier && cumulative[tier] > levels.link_budget * 4) {
+                tier--;
+            }
+            return tier;
+        }
+        
+        function getChartData() {
+            const tier = getDetailTier(currentData.links);
+            activeTier = tier;
+            
+            const levels = fullNetworkData.detail_levels;
+            if (tier === null || tier === levels.tiers.length - 1) {
+                return currentData;
+            }
+            
+            const links = currentData.links.filter(link => link.tier <= tier);
+            const connectedNodeNames = new Set();
+            links.forEach(link => {
+                connectedNodeNames.add(link.source);
+                connectedNodeNames.add(link.target);
+            });
+            
+            return {
+                nodes: currentData.nodes.filter(node => connectedNodeNames.has(node.name)),
+                links: links,
+                categories: currentData.categories
+            };
+        }
+        
+        function updateDetailDisplay(chartData) {
+            const display = document.getElementById('detailLevel');
+            const levels = fullNetworkData.detail_levels;
+            if (activeTier === null || activeTier === levels.tiers.length - 1) {
+                display.textContent = 'Full network';
+            } else {
+                display.textContent = `Tier ${activeTier + 1} (${chartData.links.length} of ${currentData.links.length} links)`;
+            }
+        }
+        
+        function onChartRoam(params) {
+            // Track the view from the event itself: getOption() would clone every node and link
+            if (params.zoom != null) {
+                chartView.zoom = (chartView.zoom || 1) * params.zoom;
+            }
+            chartView.center = myChart.convertFromPixel(
+                { seriesIndex: 0 }, [myChart.getWidth() / 2, myChart.getHeight() / 2]
+            );
+            if (detailMode === 'auto' && getDetailTier(currentData.links) !== activeTier) {
+                updateChart();
+            }
         }
         
         function populateRoleOptions(roles) {
@@ -1333,88 +1675,525 @@ def get_javascript_functions():
             filterData();
         }
         
-        function filterData() {
-            // Start with all nodes (no node-level filtering needed)
-            let filteredNodes = fullNetworkData.nodes;
+        // Filter worker: owns compact copies of the links and musician statistics,
+        // applies the role and custom filters and answers with index lists.
+        // This function is serialized into the worker, so it must not use page globals.
+        function networkFilterWorker(scope) {
+            let links = [];
+            let nodeCount = 0;
+            let musicians = [];
+            let musicianNodes = null; // Node index of each musician, -1 if it has none
+            let ranks = null; // Musicians by total_records and session_ratio, highest first
+            let topCount = 0;
+            let sessionRule = null; // minRecords and minRatio, as analysis.get_session_musicians
+            let roleCount = 0;
+            let customValues = {};
+            let linkAttributes = {}; // Per custom column: values, and per link offsets into codes
+            let attributes = {}; // Bitsets of the artist genre/style filter columns
+            let aggregates = null;
+            let snapshots = null;
+            let snapshotPeriod = -1; // Last period whose increments are summed in
+            let linkValues = null; // Cumulative link values up to snapshotPeriod
+            let musicianTotals = null; // Cumulative record counts up to snapshotPeriod
+            let musicianMain = null;
+            let pendingRequest = null;
+            
+            function toTypedArray(column) {
+                const typedArrays = {
+                    u8: Uint8Array, u16: Uint16Array, u32: Uint32Array,
+                    i32: Int32Array, f32: Float32Array, f64: Float64Array
+                };
+                const binary = atob(column.data);
+                const bytes = new Uint8Array(binary.length);
+                for (let i = 0; i < binary.length; i++) {
+                    bytes[i] = binary.charCodeAt(i);
+                }
+                return new typedArrays[column.type](bytes.buffer);
+            }
+            
+            function decodeMatrix(matrix) {
+                const decoded = {};
+                Object.keys(matrix).forEach(key => { decoded[key] = toTypedArray(matrix[key]); });
+                return decoded;
+            }
+            
+            function init(data) {
+                const nodeIndex = new Map(data.nodeNames.map((name, i) => [name, i]));
+                const indexOf = name => nodeIndex.has(name) ? nodeIndex.get(name) : -1;
+                nodeCount = data.nodeNames.length;
+                links = data.links.map(link => ({
+                    source: indexOf(link.source),
+                    target: indexOf(link.target),
+                    roles: link.roles
+                }));
+                roleCount = new Set(data.links.flatMap(link => link.roles || [])).size;
+                musicians = data.musicians;
+                musicianNodes = Int32Array.from(musicians, musician => indexOf(musician.musician));
+                ranks = data.ranks;
+                topCount = data.topCount;
+                sessionRule = data.sessionRule;
+                customValues = data.customValues;
+                Object.keys(data.linkAttributes || {}).forEach(column => {
+                    const attribute = data.linkAttributes[column];
+                    linkAttributes[column] = {
+                        values: attribute.values,
+                        offsets: Uint32Array.from(attribute.offsets),
+                        codes: Uint32Array.from(attribute.codes)
+                    };
+                });
+                attributes = data.attributes;
+                
+                if (data.aggregates) {
+                    const recordValues = {};
+                    Object.keys(data.aggregates.record_values).forEach(column => {
+                        recordValues[column] = decodeMatrix(data.aggregates.record_values[column]);
+                    });
+                    aggregates = {
+                        roleIndex: new Map(data.aggregates.roles.map((role, i) => [role, i])),
+                        roleCount: data.aggregates.roles.length,
+                        recordCount: data.aggregates.record_count,
+                        musicianRecords: decodeMatrix(data.aggregates.musician_records),
+                        pairRoles: decodeMatrix(data.aggregates.pair_roles),
+                        recordValues: recordValues,
+                        recordArtists: Int32Array.from(
+                            toTypedArray(data.aggregates.record_artists),
+                            artist => indexOf(data.aggregates.artists[artist])
+                        )
+                    };
+                }
+                
+                if (data.snapshots) {
+                    snapshots = {
+                        periodCount: data.snapshots.labels.length,
+                        links: decodeMatrix(data.snapshots.link_deltas),
+                        musicians: decodeMatrix(data.snapshots.musician_deltas),
+                        recordPeriods: toTypedArray(data.snapshots.record_periods)
+                    };
+                    linkValues = new Int32Array(links.length);
+                    musicianTotals = new Int32Array(musicians.length);
+                    musicianMain = new Int32Array(musicians.length);
+                }
+            }
+            
+            function addPeriod(period, sign) {
+                const linkDeltas = snapshots.links;
+                for (let j = linkDeltas.indptr[period]; j < linkDeltas.indptr[period + 1]; j++) {
+                    linkValues[linkDeltas.indices[j]] += sign * linkDeltas.data[j];
+                }
+                const musicianDeltas = snapshots.musicians;
+                for (let j = musicianDeltas.indptr[period]; j < musicianDeltas.indptr[period + 1]; j++) {
+                    musicianTotals[musicianDeltas.indices[j]] += sign * musicianDeltas.data[j];
+                    musicianMain[musicianDeltas.indices[j]] += sign * musicianDeltas.main[j];
+                }
+            }
+            
+            // Each snapshot builds on its neighbour: moving the slider adds or removes
+            // only the increments of the periods passed over
+            function moveToPeriod(period) {
+                while (snapshotPeriod < period) addPeriod(++snapshotPeriod, 1);
+                while (snapshotPeriod > period) addPeriod(snapshotPeriod--, -1);
+            }
+            
+            function attributeMask(attribute, column, values) {
+                const mask = new Uint32Array(attribute.words);
+                customValues[column].forEach((value, i) => {
+                    if (values.has(value)) mask[i >>> 5] |= 1 << (i & 31);
+                });
+                return mask;
+            }
             
-            // Get node names for link filtering
-            const nodeNames = new Set(filteredNodes.map(node => node.name));
+            function nodeHasAttribute(filter, node) {
+                const words = filter.attribute.words;
+                const bits = filter.attribute.bits;
+                for (let w = 0; w < words; w++) {
+                    if (bits[node * words + w] & filter.mask[w]) return true;
+                }
+                return false;
+            }
             
-            // Filter links
-            let filteredLinks = fullNetworkData.links.filter(link => {
-                // Only include links between filtered nodes
-                if (!nodeNames.has(link.source) || !nodeNames.has(link.target)) {
-                    return false;
+            function rowMatches(matrix, row, selected) {
+                for (let j = matrix.indptr[row]; j < matrix.indptr[row + 1]; j++) {
+                    if (selected[matrix.indices[j]]) return true;
                 }
+                return false;
+            }
+            
+            // Scatter plot counts from the precomputed matrices: the filtered record
+            // counts of every musician are a masked row-sum of musicianRecords
+            function aggregateScatter(roles, customFilters, period) {
+                const musicianRecords = aggregates.musicianRecords;
                 
-                // Role filter
-                if (selectedRoles.size > 0 && link.roles) {
-                    const hasSelectedRole = link.roles.some(role => selectedRoles.has(role));
-                    if (!hasSelectedRole) {
-                        return false;
+                // Appearances credited with a selected role
+                let pairPass = null;
+                if (roles && roles.size < roleCount) {
+                    const selected = new Uint8Array(aggregates.roleCount);
+                    roles.forEach(role => {
+                        if (aggregates.roleIndex.has(role)) selected[aggregates.roleIndex.get(role)] = 1;
+                    });
+                    pairPass = new Uint8Array(musicianRecords.indices.length);
+                    for (let p = 0; p < pairPass.length; p++) {
+                        pairPass[p] = rowMatches(aggregates.pairRoles, p, selected) ? 1 : 0;
                     }
                 }
                 
-                // Custom filters - only apply if there are actually configured filters
-                if (customFilters.length > 0) {
-                    const activeCustomFilters = customFilters.filter(filter => 
-                        filter.column && 
-                        filter.selectedValues.size > 0 && 
-                        filter.selectedValues.size < (customFilterData[filter.column] ? customFilterData[filter.column].length : 0)
-                    );
-                    
-                    for (const filter of activeCustomFilters) {
-                        if (link.custom_data) {
-                            const linkValues = link.custom_data[filter.column];
-                            if (linkValues) {
-                                let hasSelectedValue = false;
-                                if (Array.isArray(linkValues)) {
-                                    // Check if any value in the array matches selected values
-                                    hasSelectedValue = linkValues.some(value => {
-                                        if (typeof value === 'string' && value.includes(',')) {
-                                            // Handle comma-separated values
-                                            const parts = value.split(',').map(p => p.trim());
-                                            return parts.some(part => filter.selectedValues.has(part));
-                                        }
-                                        return filter.selectedValues.has(String(value));
-                                    });
-                                } else {
-                                    // Single value
-                                    if (typeof linkValues === 'string' && linkValues.includes(',')) {
-                                        // Handle comma-separated values
-                                        const parts = linkValues.split(',').map(p => p.trim());
-                                        hasSelectedValue = parts.some(part => filter.selectedValues.has(part));
-                                    } else {
-                                        hasSelectedValue = filter.selectedValues.has(String(linkValues));
-                                    }
-                                }
-                                if (!hasSelectedValue) {
-                                    return false; // This link doesn't match this custom filter
-                                }
-                            }
+                // Records released up to the period, with a selected value for every
+                // active custom filter
+                let recordPass = null;
+                if (period !== null) {
+                    recordPass = Uint8Array.from(snapshots.recordPeriods, recordPeriod => recordPeriod <= period ? 1 : 0);
+                }
+                customFilters.forEach(filter => {
+                    if (filter.attribute) {
+                        // Records whose main artist has a selected genre/style
+                        if (!recordPass) recordPass = new Uint8Array(aggregates.recordCount).fill(1);
+                        for (let r = 0; r < aggregates.recordCount; r++) {
+                            const artist = aggregates.recordArtists[r];
+                            if (recordPass[r] && (artist < 0 || !nodeHasAttribute(filter, artist))) recordPass[r] = 0;
+                        }
+                        return;
+                    }
+                    const matrix = aggregates.recordValues[filter.column];
+                    if (!matrix) return;
+                    const selected = Uint8Array.from(customValues[filter.column], value => filter.values.has(value) ? 1 : 0);
+                    if (!recordPass) recordPass = new Uint8Array(aggregates.recordCount).fill(1);
+                    for (let r = 0; r < aggregates.recordCount; r++) {
+                        if (recordPass[r] && !rowMatches(matrix, r, selected)) recordPass[r] = 0;
+                    }
+                });
+                
+                const indices = [];
+                const totals = [];
+                const asMain = [];
+                for (let i = 0; i < musicians.length; i++) {
+                    let total = 0;
+                    let main = 0;
+                    for (let p = musicianRecords.indptr[i]; p < musicianRecords.indptr[i + 1]; p++) {
+                        if (pairPass && !pairPass[p]) continue;
+                        if (recordPass && !recordPass[musicianRecords.indices[p]]) continue;
+                        total++;
+                        main += musicianRecords.data[p];
+                    }
+                    if (total > 0) {
+                        indices.push(i);
+                        totals.push(total);
+                        asMain.push(main);
+                    }
+                }
+                return {
+                    scatterIndices: Uint32Array.from(indices),
+                    scatterTotals: Uint32Array.from(totals),
+                    scatterMain: Uint32Array.from(asMain)
+                };
+            }
+            
+            // Per link state for one custom filter: LINK_MATCH, LINK_NO_MATCH or, for
+            // links without a value for the column, LINK_NO_VALUE
+            const LINK_NO_MATCH = 0, LINK_MATCH = 1, LINK_NO_VALUE = 2;
+            function linkValueStates(column, values) {
+                const states = new Uint8Array(links.length).fill(LINK_NO_VALUE);
+                const attribute = linkAttributes[column];
+                if (!attribute) return states;
+                const selected = Uint8Array.from(attribute.values, value => values.has(value) ? 1 : 0);
+                const offsets = attribute.offsets;
+                const codes = attribute.codes;
+                for (let i = 0; i < links.length; i++) {
+                    if (offsets[i] === offsets[i + 1]) continue;
+                    states[i] = LINK_NO_MATCH;
+                    for (let j = offsets[i]; j < offsets[i + 1]; j++) {
+                        if (selected[codes[j]]) {
+                            states[i] = LINK_MATCH;
+                            break;
+                        }
+                    }
+                }
+                return states;
+            }
+            
+            function matchesRoles(link, roles) {
+                return !link.roles || link.roles.some(role => roles.has(role));
+            }
+            
+            // Links without a value for the column pass unless strict is set; artist
+            // genre/style filters test the bitset of the link's artist (target) node
+            function matchesCustomFilter(link, i, filter, strict) {
+                if (filter.attribute) return link.target >= 0 && nodeHasAttribute(filter, link.target);
+                const state = filter.states[i];
+                return state === LINK_NO_VALUE ? !strict : state === LINK_MATCH;
+            }
+            
+            function applyFilter(request) {
+                const roles = request.roles ? new Set(request.roles) : null;
+                const customFilters = request.customFilters.map(filter => {
+                    const values = new Set(filter.values);
+                    const attribute = attributes[filter.column] || null;
+                    return {
+                        column: filter.column,
+                        values: values,
+                        attribute: attribute,
+                        mask: attribute ? attributeMask(attribute, filter.column, values) : null,
+                        states: attribute ? null : linkValueStates(filter.column, values)
+                    };
+                });
+                const period = snapshots && request.period !== null && request.period !== undefined ? request.period : null;
+                if (period !== null) moveToPeriod(period);
+                
+                // Links that pass every filter, and the nodes they touch
+                const linkIndices = [];
+                const visibleNodes = new Uint8Array(nodeCount);
+                links.forEach((link, i) => {
+                    if (link.source < 0 || link.target < 0) return;
+                    if (period !== null && linkValues[i] === 0) return;
+                    if (roles && !matchesRoles(link, roles)) return;
+                    if (!customFilters.every(filter => matchesCustomFilter(link, i, filter, false))) return;
+                    linkIndices.push(i);
+                    visibleNodes[link.source] = 1;
+                    visibleNodes[link.target] = 1;
+                });
+                const nodeIndices = [];
+                for (let i = 0; i < nodeCount; i++) {
+                    if (visibleNodes[i]) nodeIndices.push(i);
+                }
+                
+                // Musicians that are visible in the filtered network
+                const visibleMusicians = [];
+                musicians.forEach((musician, i) => {
+                    if (musicianNodes[i] >= 0 && visibleNodes[musicianNodes[i]]) visibleMusicians.push(i);
+                });
+                const totalRecords = i => period !== null ? musicianTotals[i] : musicians[i].total_records;
+                const sessionRatio = i => period === null ? musicians[i].session_ratio
+                    : musicianTotals[i] > 0 ? (musicianTotals[i] - musicianMain[i]) / musicianTotals[i] : 0;
+                const isSession = i => totalRecords(i) >= sessionRule.minRecords && sessionRatio(i) >= sessionRule.minRatio;
+                let sessionMusicians;
+                let topMusicians;
+                if (period === null) {
+                    // Walk the precomputed rankings instead of sorting
+                    const visible = new Uint8Array(musicians.length);
+                    visibleMusicians.forEach(i => { visible[i] = 1; });
+                    sessionMusicians = ranks.session_ratio.filter(i => visible[i] && isSession(i));
+                    topMusicians = [];
+                    for (let k = 0; k < ranks.total_records.length && topMusicians.length < topCount; k++) {
+                        if (visible[ranks.total_records[k]]) topMusicians.push(ranks.total_records[k]);
+                    }
+                } else {
+                    // Snapshot counts change with the period, so these are sorted
+                    sessionMusicians = visibleMusicians.filter(isSession)
+                        .sort((a, b) => sessionRatio(b) - sessionRatio(a));
+                    topMusicians = visibleMusicians.slice()
+                        .sort((a, b) => totalRecords(b) - totalRecords(a)).slice(0, topCount);
+                }
+                
+                const result = {
+                    requestId: request.requestId,
+                    linkIndices: Uint32Array.from(linkIndices),
+                    nodeIndices: Uint32Array.from(nodeIndices),
+                    musicianIndices: Uint32Array.from(visibleMusicians),
+                    sessionIndices: Uint32Array.from(sessionMusicians),
+                    topIndices: Uint32Array.from(topMusicians)
+                };
+                const filtered = customFilters.length > 0 || (roles && roles.size < roleCount);
+                if (period !== null) {
+                    result.linkValues = Uint32Array.from(linkIndices, i => linkValues[i]);
+                    result.periodTotals = Uint32Array.from(musicianTotals);
+                    result.periodMain = Uint32Array.from(musicianMain);
+                    if (!filtered || !aggregates) {
+                        // The snapshot's running totals are the scatter counts; without
+                        // aggregates, role and custom filters are then not applied to them
+                        const scatterMusicians = [];
+                        for (let i = 0; i < musicians.length; i++) {
+                            if (musicianTotals[i] > 0) scatterMusicians.push(i);
                         }
+                        result.scatterIndices = Uint32Array.from(scatterMusicians);
+                        return result;
                     }
                 }
                 
-                return true;
-            });
+                if (aggregates) {
+                    return Object.assign(result, aggregateScatter(roles, customFilters, period));
+                }
+                
+                // Without aggregates the scatter plot keeps unfiltered counts: each active
+                // filter is applied directly to the musicians' links, so musicians stay in
+                // even when the network view hides their node
+                const directFilters = customFilters.map(filter => (link, i) => matchesCustomFilter(link, i, filter, true));
+                if (roles && roles.size < roleCount) {
+                    directFilters.push(link => link.roles && matchesRoles(link, roles));
+                }
+                let scatterMusicians = musicians.map((musician, i) => i);
+                directFilters.forEach(matches => {
+                    const touched = new Uint8Array(nodeCount);
+                    links.forEach((link, i) => {
+                        if (link.source >= 0 && link.target >= 0 && matches(link, i)) {
+                            touched[link.source] = 1;
+                            touched[link.target] = 1;
+                        }
+                    });
+                    scatterMusicians = scatterMusicians.filter(i => musicianNodes[i] >= 0 && touched[musicianNodes[i]]);
+                });
+                
+                result.scatterIndices = Uint32Array.from(scatterMusicians);
+                return result;
+            }
             
-            // After filtering links, remove nodes that have no connections
-            const connectedNodeNames = new Set();
-            filteredLinks.forEach(link => {
-                connectedNodeNames.add(link.source);
-                connectedNodeNames.add(link.target);
-            });
+            scope.onmessage = function(event) {
+                const message = event.data;
+                if (message.type === 'init') {
+                    init(message);
+                    return;
+                }
+                
+                // Requests that arrive while one is queued replace it, so only the newest is answered
+                const queued = pendingRequest !== null;
+                pendingRequest = message;
+                if (queued) return;
+                setTimeout(() => {
+                    const result = applyFilter(pendingRequest);
+                    pendingRequest = null;
+                    scope.postMessage(result, Object.values(result)
+                        .filter(value => ArrayBuffer.isView(value))
+                        .map(value => value.buffer));
+                }, 0);
+            };
+        }
+        
+        // Worker init message: compact copies of the data the filters read
+        function filterWorkerInit() {
+            return {
+                type: 'init',
+                nodeNames: fullNetworkData.nodes.map(node => node.name),
+                links: fullNetworkData.links.map(link => ({
+                    source: link.source,
+                    target: link.target,
+                    roles: link.roles
+                })),
+                linkAttributes: fullNetworkData.link_attributes,
+                musicians: musicianStatsData.map(musician => ({
+                    musician: musician.musician,
+                    total_records: musician.total_records,
+                    session_ratio: musician.session_ratio
+                })),
+                customValues: customFilterData,
+                ranks: {
+                    total_records: rankedMusicians('total_records'),
+                    session_ratio: rankedMusicians('session_ratio')
+                },
+                topCount: TOP_MUSICIANS_CHART_SIZE,
+                sessionRule: SESSION_RULE,
+                attributes: Object.fromEntries(Object.keys(artistAttributeColumns).map(
+                    column => [column, buildAttributeBitsets(artistAttributeColumns[column])]
+                )),
+                aggregates: musicianAggregates,
+                snapshots: periodSnapshots
+            };
+        }
+        
+        // Runs the worker code on the page, for browsers that block the worker
+        function createPageFilter(init) {
+            const scope = { postMessage: data => setTimeout(() => onFilterResult({ data: data }), 0) };
+            networkFilterWorker(scope);
+            const pageFilter = { postMessage: data => scope.onmessage({ data: data }) };
+            pageFilter.postMessage(init);
+            return pageFilter;
+        }
+        
+        function createFilterWorker() {
+            const init = filterWorkerInit();
+            let worker;
+            try {
+                const source = `${networkFilterWorker.toString()}\nnetworkFilterWorker(self);`;
+                worker = new Worker(URL.createObjectURL(new Blob([source], { type: 'text/javascript' })));
+            } catch (error) {
+                // Some browsers block workers for local files; run the same code on the page
+                console.warn('Filter worker unavailable, filtering on the page instead:', error);
+                return createPageFilter(init);
+            }
             
-            // Only keep nodes that have at least one connection
-            const finalFilteredNodes = filteredNodes.filter(node => connectedNodeNames.has(node.name));
+            worker.onmessage = onFilterResult;
+            worker.onerror = error => {
+                // The worker failed to load (e.g. a CSP blocking blob: workers) or threw;
+                // switch to filtering on the page and repeat the latest request
+                console.warn('Filter worker failed, filtering on the page instead:', error.message || error);
+                if (error.preventDefault) error.preventDefault();
+                worker.terminate();
+                if (filterWorker !== worker) return;
+                filterWorker = createPageFilter(init);
+                if (filterRequestId > 0) postFilterRequest();
+            };
+            worker.postMessage(init);
+            return worker;
+        }
+        
+        function getActiveCustomFilters() {
+            // Only filters that actually exclude some values
+            return customFilters.filter(filter => 
+                filter.column && 
+                filter.selectedValues.size > 0 && 
+                filter.selectedValues.size < (customFilterData[filter.column] ? customFilterData[filter.column].length : 0)
+            );
+        }
+        
+        function filterData(delay = FILTER_DEBOUNCE_MS) {
+            // Filtering runs in the worker; a newer request makes older results stale.
+            // Rapid checkbox toggles are debounced into a single request.
+            egoView = null;
+            filterRequestId++;
+            document.getElementById('container').style.cursor = 'progress';
+            clearTimeout(filterDebounceTimer);
+            filterDebounceTimer = setTimeout(postFilterRequest, delay);
+        }
+        
+        function postFilterRequest() {
+            filterWorker.postMessage({
+                type: 'filter',
+                requestId: filterRequestId,
+                period: selectedPeriod,
+                roles: selectedRoles.size > 0 ? [...selectedRoles] : null,
+                customFilters: getActiveCustomFilters().map(filter => ({
+                    column: filter.column,
+                    values: [...filter.selectedValues]
+                }))
+            });
+        }
+        
+        // Copy of a musician's statistics with record counts under the current filters
+        function withFilteredCounts(musician, total, asMain) {
+            const asSession = total - asMain;
+            return Object.assign({}, musician, {
+                total_records: total,
+                as_main_artist: asMain,
+                as_session_musician: asSession,
+                session_ratio: total > 0 ? asSession / total : 0
+            });
+        }
+        
+        function onFilterResult(event) {
+            const result = event.data;
+            if (result.requestId !== filterRequestId) {
+                return;
+            }
+            document.getElementById('container').style.cursor = '';
             
-            // Update current data
+            const nodes = fullNetworkData.nodes;
+            const links = fullNetworkData.links;
             currentData = {
-                nodes: finalFilteredNodes,
-                links: filteredLinks,
+                nodes: Array.from(result.nodeIndices, i => nodes[i]),
+                links: result.linkValues
+                    ? Array.from(result.linkIndices, (i, k) => getPeriodLink(i, result.linkValues[k]))
+                    : Array.from(result.linkIndices, i => links[i]),
                 categories: fullNetworkData.categories
             };
+            // In a time snapshot, record counts are those released up to the period
+            const musicianStats = result.periodTotals
+                ? i => withFilteredCounts(musicianStatsData[i], result.periodTotals[i], result.periodMain[i])
+                : i => musicianStatsData[i];
+            filteredMusicianStats = {
+                visible: Array.from(result.musicianIndices, musicianStats),
+                session: Array.from(result.sessionIndices, musicianStats),
+                top: Array.from(result.topIndices, musicianStats),
+                scatter: result.scatterTotals
+                    ? Array.from(result.scatterIndices, (i, k) => withFilteredCounts(
+                        musicianStatsData[i], result.scatterTotals[k], result.scatterMain[k]))
+                    : Array.from(result.scatterIndices, musicianStats)
+            };
             
             updateChart();
             updateStats();
@@ -1439,7 +2218,7 @@ def get_javascript_functions():
             // Show active filters
             const activeFilters = [];
             
-            if (selectedRoles.size < [...new Set(fullNetworkData.links.flatMap(link => link.roles || []))].length) {
+            if (selectedRoles.size < window.allRoles.length) {
                 activeFilters.push(`Roles: ${selectedRoles.size} selected`);
             }
             // Add active custom filters (only those that are actually filtering)
@@ -1452,6 +2231,13 @@ def get_javascript_functions():
                 }
             });
             
+            if (selectedPeriod !== null) {
+                activeFilters.push(`Released up to: ${periodSnapshots.labels[selectedPeriod]}`);
+            }
+            if (egoView) {
+                activeFilters.push(`Ego network: ${egoView.center} (${egoView.depth} hop${egoView.depth > 1 ? 's' : ''}${egoView.truncated ? ', capped' : ''})`);
+            }
+            
             document.getElementById('activeFilters').textContent = activeFilters.length > 0 ? activeFilters.join(', ') : 'None';
         }
         
@@ -1475,7 +2261,20 @@ def get_javascript_functions():
             customFilters = [];
             nextCustomFilterId = 1;
             
-            currentData = JSON.parse(JSON.stringify(fullNetworkData));
+            // Back to all years
+            if (periodSnapshots) {
+                selectedPeriod = null;
+                document.getElementById('periodSlider').value = periodSnapshots.labels.length;
+                document.getElementById('periodLabel').textContent = 'All years';
+            }
+            
+            // Drop any filter request still waiting or on its way from the worker
+            clearTimeout(filterDebounceTimer);
+            filterRequestId++;
+            document.getElementById('container').style.cursor = '';
+            filteredMusicianStats = null;
+            egoView = null;
+            currentData = getUnfilteredData();
             updateChart();
             updateStats();
             
@@ -1500,15 +2299,18 @@ def get_javascript_functions():
             let content = '<div class="info-section">';
             content += '<h4>Basic Information</h4>';
             content += '<div class="info-content">';
-            content += `<p><strong>Type:</strong> ${nodeData.category === 'musician' ? 'Musician' : 'Artist'}</p>`;
+            content += `<p><strong>Type:</strong> ${getNodeType(nodeData) === 'musician' ? 'Musician' : 'Artist'}</p>`;
             content += `<p><strong>Connections:</strong> ${nodeData.value}</p>`;
+            if (nodeData.community !== undefined && fullNetworkData.community_categories) {
+                content += `<p><strong>Community:</strong> ${getCommunityName(nodeData.community)}</p>`;
+            }
             content += '</div></div>';
             
             if (nodeData.genres && nodeData.genres.length > 0) {
                 content += '<div class="info-section">';
                 content += '<h4>Genres</h4>';
                 content += '<div class="info-content">';
-                nodeData.genres.forEach(genre => {
+                attributeNames(nodeData, 'genres').forEach(genre => {
                     content += `<span class="tag">${genre}</span>`;
                 });
                 content += '</div></div>';
@@ -1518,7 +2320,7 @@ def get_javascript_functions():
                 content += '<div class="info-section">';
                 content += '<h4>Styles</h4>';
                 content += '<div class="info-content">';
-                nodeData.styles.forEach(style => {
+                attributeNames(nodeData, 'styles').forEach(style => {
                     content += `<span class="tag">${style}</span>`;
                 });
                 content += '</div></div>';
@@ -1570,7 +2372,162 @@ def get_javascript_functions():
             document.getElementById('infoPanel').classList.remove('active');
         }
         
+        // Node coloring: by musician/artist type or by detected community
+        function setColorMode(mode) {
+            colorMode = mode;
+            updateChart();
+        }
+        
+        function getNodeType(node) {
+            // Chart nodes carry their original category in node_type when colored by community
+            return node.node_type || node.category;
+        }
+        
+        function getCommunityName(community) {
+            const categories = fullNetworkData.community_categories;
+            return categories[Math.min(community, categories.length - 1)].name;
+        }
+        
+        function getChartCategories() {
+            if (colorMode === 'community' && fullNetworkData.community_categories) {
+                return fullNetworkData.community_categories;
+            }
+            return currentData.categories;
+        }
+        
+        function getChartNodes(nodes) {
+            if (colorMode === 'community' && fullNetworkData.community_categories) {
+                // Small communities share the trailing 'Other communities' category
+                const lastCategory = fullNetworkData.community_categories.length - 1;
+                return nodes.map(node => Object.assign({}, node, {
+                    category: Math.min(node.community, lastCategory),
+                    node_type: node.category
+                }));
+            }
+            return nodes;
+        }
+        
+        function isNodeEvent(params) {
+            // graphGL events carry no dataType; its data items are the nodes
+            return params.dataType === 'node' || (params.seriesType === 'graphGL' && params.dataType !== 'edge');
+        }
+        
+        function getNetworkSeries(chartData) {
+            if (chartRenderer === 'webgl') {
+                // GPU force layout and WebGL drawing for networks beyond canvas limits
+                return {
+                    id: 'musicianNetwork',
+                    name: 'Musician Network',
+                    type: 'graphGL',
+                    data: getChartNodes(chartData.nodes),
+                    links: chartData.links,
+                    categories: getChartCategories(),
+                    roam: true,
+                    itemStyle: {
+                        opacity: 0.9
+                    },
+                    lineStyle: {
+                        color: 'rgba(255, 255, 255, 0.15)',
+                        width: 1
+                    },
+                    emphasis: {
+                        itemStyle: {
+                            opacity: 1
+                        }
+                    },
+                    forceAtlas2: {
+                        steps: 5,
+                        stopThreshold: 1,
+                        jitterTolerence: 10,
+                        edgeWeight: [0.2, 1],
+                        gravity: 1,
+                        edgeWeightInfluence: 1,
+                        scaling: 0.2
+                    }
+                };
+            }
+            
+            return {
+                id: 'musicianNetwork',
+                name: 'Musician Network',
+                type: 'graph',
+                layout: 'force',
+                data: getChartNodes(chartData.nodes),
+                links: chartData.links,
+                categories: getChartCategories(),
+                roam: true,
+                zoom: chartView.zoom || 1,
+                center: chartView.center,
+                focusNodeAdjacency: true,
+                itemStyle: {
+                    borderWidth: 0,
+                    shadowBlur: 10,
+                    shadowColor: 'rgba(0, 0, 0, 0.5)'
+                },
+                label: {
+                    show: true,
+                    position: 'right',
+                    formatter: '{b}',
+                    fontSize: 10,
+                    color: '#ffffff'
+                },
+                lineStyle: {
+                    color: 'source',
+                    curveness: 0.1,
+                    opacity: 0.6
+                },
+                emphasis: {
+                    focus: 'adjacency',
+                    lineStyle: {
+                        width: 3,
+                        opacity: 0.9
+                    }
+                },
+                force: {
+                    repulsion: 200,
+                    edgeLength: [50, 100],
+                    gravity: 0.1
+                }
+            };
+        }
+        
+        function sameItems(previous, next) {
+            // Chart arrays keep the order of fullNetworkData, so identity per index is enough
+            return previous.length === next.length && previous.every((item, i) => item === next[i]);
+        }
+        
         function updateChart() {
+            const chartData = getChartData();
+            updateDetailDisplay(chartData);
+            
+            if (!renderedChart) {
+                renderChart(chartData);
+                return;
+            }
+            
+            // Incremental update: send only what changed and let ECharts merge it into the
+            // existing series, which keeps the positions of nodes that stay visible
+            const nodesChanged = colorMode !== renderedChart.colorMode || !sameItems(renderedChart.nodes, chartData.nodes);
+            const linksChanged = !sameItems(renderedChart.links, chartData.links);
+            if (!nodesChanged && !linksChanged) {
+                return;
+            }
+            
+            const series = { id: 'musicianNetwork' };
+            const update = { series: [series] };
+            if (nodesChanged) {
+                series.data = getChartNodes(chartData.nodes);
+                series.categories = getChartCategories();
+                update.legend = { data: series.categories.map(category => category.name) };
+            }
+            if (linksChanged) {
+                series.links = chartData.links;
+            }
+            myChart.setOption(update);
+            renderedChart = { nodes: chartData.nodes, links: chartData.links, colorMode: colorMode };
+        }
+        
+        function renderChart(chartData) {
             const option = {
                 title: {
                     text: 'Musician-Artist Network',
@@ -1589,19 +2546,25 @@ def get_javascript_functions():
                 tooltip: {
                     trigger: 'item',
                     formatter: function(params) {
-                        if (params.dataType === 'node') {
+                        if (isNodeEvent(params)) {
                             const node = params.data;
                             let tooltip = `<strong>${node.name}</strong><br/>`;
-                            if (node.category === 'musician') {
+                            if (getNodeType(node) === 'musician') {
                                 tooltip += `Works with ${node.value} artists<br/>`;
                             } else {
                                 tooltip += `${node.value} musicians<br/>`;
                             }
-                            if (node.genres && node.genres.length > 0) {
-                                tooltip += `Genres: ${node.genres.slice(0, 3).join(', ')}${node.genres.length > 3 ? '...' : ''}<br/>`;
+                            if (egoView && egoView.hops.get(node.name) > 0) {
+                                const hop = egoView.hops.get(node.name);
+                                tooltip += `${hop} hop${hop > 1 ? 's' : ''} from ${egoView.center}<br/>`;
                             }
-                            if (node.styles && node.styles.length > 0) {
-                                tooltip += `Styles: ${node.styles.slice(0, 3).join(', ')}${node.styles.length > 3 ? '...' : ''}`;
+                            const genres = attributeNames(node, 'genres');
+                            const styles = attributeNames(node, 'styles');
+                            if (genres.length > 0) {
+                                tooltip += `Genres: ${genres.slice(0, 3).join(', ')}${genres.length > 3 ? '...' : ''}<br/>`;
+                            }
+                            if (styles.length > 0) {
+                                tooltip += `Styles: ${styles.slice(0, 3).join(', ')}${styles.length > 3 ? '...' : ''}`;
                             }
                             return tooltip;
                         } else if (params.dataType === 'edge') {
@@ -1620,7 +2583,7 @@ def get_javascript_functions():
                 legend: {
                     x: "center",
                     top: '10%',
-                    data: currentData.categories.map(function(a) {
+                    data: getChartCategories().map(function(a) {
                         return a.name;
                     }),
                     textStyle: {
@@ -1629,52 +2592,43 @@ def get_javascript_functions():
                 },
                 animationDuration: 1000,
                 animationEasingUpdate: 'quinticInOut',
-                series: [{
-                    name: 'Musician Network',
-                    type: 'graph',
-                    layout: 'force',
-                    data: currentData.nodes,
-                    links: currentData.links,
-                    categories: currentData.categories,
-                    roam: true,
-                    focusNodeAdjacency: true,
-                    itemStyle: {
-                        borderWidth: 0,
-                        shadowBlur: 10,
-                        shadowColor: 'rgba(0, 0, 0, 0.5)'
-                    },
-                    label: {
-                        show: true,
-                        position: 'right',
-                        formatter: '{b}',
-                        fontSize: 10,
-                        color: '#ffffff'
-                    },
-                    lineStyle: {
-                        color: 'source',
-                        curveness: 0.1,
-                        opacity: 0.6
-                    },
-                    emphasis: {
-                        focus: 'adjacency',
-                        lineStyle: {
-                            width: 3,
-                            opacity: 0.9
-                        }
-                    },
-                    force: {
-                        repulsion: 200,
-                        edgeLength: [50, 100],
-                        gravity: 0.1
-                    }
-                }]
+                series: [getNetworkSeries(chartData)]
             };
             
             myChart.setOption(option, true);
+            renderedChart = { nodes: chartData.nodes, links: chartData.links, colorMode: colorMode };
+        }
+        
+        // Stats positions ordered by a metric, highest first (ties keep stats order)
+        function rankedMusicians(metric) {
+            if (!musicianRanks[metric]) {
+                musicianRanks[metric] = musicianRanksData && musicianRanksData[metric]
+                    ? decodeTypedArray(musicianRanksData[metric])
+                    : Uint32Array.from(musicianStatsData.keys()).sort((a, b) =>
+                        musicianStatsData[b][metric] - musicianStatsData[a][metric] || a - b);
+            }
+            return musicianRanks[metric];
+        }
+        
+        // First limit musicians by a metric among those visible in the network,
+        // reading the ranking until enough are found
+        function topVisibleMusicians(metric, limit, keep = () => true) {
+            const visibleNodeNames = new Set(currentData.nodes.map(node => node.name));
+            const top = [];
+            for (const i of rankedMusicians(metric)) {
+                if (top.length >= limit) break;
+                const musician = musicianStatsData[i];
+                if (visibleNodeNames.has(musician.musician) && keep(musician)) top.push(musician);
+            }
+            return top;
         }
         
         // Calculate filtered musician statistics from current network data
         function calculateFilteredMusicianStats() {
+            if (filteredMusicianStats) {
+                return filteredMusicianStats.visible.slice();
+            }
+            
             // Get the list of all visible nodes (both musicians and artists)
             // because musicians who are also main artists appear as artist nodes
             const visibleNodeNames = new Set(
@@ -1701,8 +2655,9 @@ def get_javascript_functions():
         
         function updateTopMusiciansTab() {
             console.log(`updateTopMusiciansTab called. musicianStatsData has ${musicianStatsData.length} musicians`);
-            const filteredStats = calculateFilteredMusicianStats();
-            const topMusicians = filteredStats.sort((a, b) => b.total_records - a.total_records).slice(0, 15);
+            const topMusicians = filteredMusicianStats
+                ? filteredMusicianStats.top
+                : topVisibleMusicians('total_records', TOP_MUSICIANS_CHART_SIZE);
             
             // Update or create bar chart
             const barChartContainer = document.getElementById('topMusiciansChart');
@@ -1846,76 +2801,9 @@ def get_javascript_functions():
                 window.sessionScatterChart.dispose();
             }
             
-            // Apply filters directly to ALL musician data (bypass network node limitations)
-            let allFilteredStats = [...musicianStatsData];
-            console.log(`Starting with ${allFilteredStats.length} total musicians from musicianStatsData`);
-            
-            // Apply role filtering
-            if (selectedRoles.size < window.allRoles.length && selectedRoles.size > 0) {
-                const musiciansWithSelectedRoles = new Set();
-                fullNetworkData.links.forEach(link => {
-                    if (link.roles && link.roles.some(role => selectedRoles.has(role))) {
-                        musiciansWithSelectedRoles.add(link.source);
-                        musiciansWithSelectedRoles.add(link.target);
-                    }
-                });
-                allFilteredStats = allFilteredStats.filter(m => musiciansWithSelectedRoles.has(m.musician));
-            }
-            
-            // Apply custom filters
-            if (customFilters.length > 0) {
-                const activeCustomFilters = customFilters.filter(filter => 
-                    filter.column && 
-                    filter.selectedValues.size > 0 && 
-                    filter.selectedValues.size < (customFilterData[filter.column] ? customFilterData[filter.column].length : 0)
-                );
-                
-                if (activeCustomFilters.length > 0) {
-                    allFilteredStats = allFilteredStats.filter(musician => {
-                        return activeCustomFilters.every(filter => {
-                            // Check if musician appears in any record that matches the filter
-                            if (!musician.records) return false;
-                            
-                            return musician.records.some(record => {
-                                // Get all the data for this record from all columns
-                                let recordMatches = false;
-                                
-                                // Search through the custom filter data to find this record
-                                Object.keys(customFilterData).forEach(dataKey => {
-                                    if (recordMatches) return; // Already found a match
-                                    
-                                    const columnData = customFilterData[dataKey];
-                                    if (Array.isArray(columnData)) {
-                                        columnData.forEach((rowData, index) => {
-                                            if (recordMatches) return; // Already found a match
-                                            
-                                            // Check if this row contains our record (album)
-                                            if (rowData && typeof rowData === 'object') {
-                                                const albumField = rowData['Artist'] + ' - ' + rowData['Album'];
-                                                if (albumField === record || rowData['Album'] === record.split(' - ')[1]) {
-                                                    // This is our record, check if it matches the filter
-                                                    const filterColumnData = rowData[filter.column];
-                                                    if (filterColumnData) {
-                                                        if (typeof filterColumnData === 'string' && filterColumnData.includes(',')) {
-                                                            // Handle comma-separated values
-                                                            const parts = filterColumnData.split(',').map(p => p.trim());
-                                                            recordMatches = parts.some(part => filter.selectedValues.has(part));
-                                                        } else {
-                                                            recordMatches = filter.selectedValues.has(String(filterColumnData));
-                                                        }
-                                                    }
-                                                }
-                                            }
-                                        });
-                                    }
-                                });
-                                
-                                return recordMatches;
-                            });
-                        });
-                    });
-                }
-            }
+            // Filters applied directly to ALL musician data (bypass network node limitations),
+            // prepared by the filter worker
+            const allFilteredStats = filteredMusicianStats ? filteredMusicianStats.scatter : [...musicianStatsData];
             
             console.log(`Total musicians in scatter plot: ${allFilteredStats.length} (direct filtering applied)`);
             
@@ -2264,11 +3152,11 @@ def get_javascript_functions():
         }
         
         function updateSessionMusiciansTab() {
-            const filteredStats = calculateFilteredMusicianStats();
-            // Filter for session musicians (70%+ session work, 2+ records)
-            const sessionMusicians = filteredStats.filter(m => 
-                m.total_records >= 2 && m.session_ratio >= 0.7
-            ).sort((a, b) => b.session_ratio - a.session_ratio);
+            // Session musicians (SESSION_RULE), prepared by the filter worker
+            const sessionMusicians = filteredMusicianStats
+                ? filteredMusicianStats.session
+                : topVisibleMusicians('session_ratio', Infinity,
+                    m => m.total_records >= SESSION_RULE.minRecords && m.session_ratio >= SESSION_RULE.minRatio);
             
             const listContainer = document.getElementById('sessionMusiciansList');
             listContainer.innerHTML = ''; // Clear existing content
@@ -2376,6 +3264,225 @@ def get_javascript_functions():
             resultsContainer.innerHTML = html;
         }
         
+        // Ego networks: k-hop neighbourhoods from the precomputed CSR arrays
+        function getEgoIndex() {
+            if (!egoIndex && egoIndexData) {
+                egoIndex = {
+                    indptr: decodeTypedArray(egoIndexData.indptr),
+                    indices: decodeTypedArray(egoIndexData.indices),
+                    linkIds: decodeTypedArray(egoIndexData.link_ids),
+                    nodeIndex: new Map(fullNetworkData.nodes.map((node, i) => [node.name, i]))
+                };
+            }
+            return egoIndex;
+        }
+        
+        function getEgoNetwork(center, depth, maxNodes) {
+            // Same search as graph_metrics.ego_network: breadth-first by hop; when a hop
+            // exceeds the node budget, keep the nodes most strongly attached so far
+            const index = getEgoIndex();
+            if (!index || !index.nodeIndex.has(center)) {
+                return null;
+            }
+            const links = fullNetworkData.links;
+            const hops = new Int32Array(fullNetworkData.nodes.length).fill(-1);
+            const start = index.nodeIndex.get(center);
+            hops[start] = 0;
+            
+            const selected = [start];
+            let frontier = [start];
+            let truncated = false;
+            for (let hop = 1; hop <= depth && frontier.length > 0 && !truncated; hop++) {
+                const attachment = new Map();
+                frontier.forEach(node => {
+                    for (let j = index.indptr[node]; j < index.indptr[node + 1]; j++) {
+                        const neighbour = index.indices[j];
+                        if (hops[neighbour] < 0) {
+                            attachment.set(neighbour, (attachment.get(neighbour) || 0) + links[index.linkIds[j]].value);
+                        }
+                    }
+                });
+                
+                let candidates = [...attachment.keys()].sort((a, b) => a - b);
+                const budget = Math.max(maxNodes - selected.length, 0);
+                if (candidates.length > budget) {
+                    candidates = candidates
+                        .sort((a, b) => attachment.get(b) - attachment.get(a) || a - b)
+                        .slice(0, budget)
+                        .sort((a, b) => a - b);
+                    truncated = true;
+                }
+                candidates.forEach(node => {
+                    hops[node] = hop;
+                    selected.push(node);
+                });
+                frontier = candidates;
+            }
+            
+            // Induced subgraph: every link between two selected nodes
+            const linkIds = new Set();
+            selected.forEach(node => {
+                for (let j = index.indptr[node]; j < index.indptr[node + 1]; j++) {
+                    if (hops[index.indices[j]] >= 0) linkIds.add(index.linkIds[j]);
+                }
+            });
+            
+            return {
+                center: center,
+                depth: depth,
+                nodes: selected.map(i => fullNetworkData.nodes[i]),
+                links: [...linkIds].sort((a, b) => a - b).map(i => links[i]),
+                hops: new Map(selected.map(i => [fullNetworkData.nodes[i].name, hops[i]])),
+                truncated: truncated
+            };
+        }
+        
+        function showEgoNetwork(center, depth) {
+            const ego = getEgoNetwork(center, depth, egoIndexData.max_nodes);
+            if (!ego) return;
+            
+            // Drop any filter request still waiting or on its way from the worker
+            clearTimeout(filterDebounceTimer);
+            filterRequestId++;
+            document.getElementById('container').style.cursor = '';
+            
+            egoView = { center: center, depth: depth, hops: ego.hops, truncated: ego.truncated };
+            currentData = {
+                nodes: ego.nodes,
+                links: ego.links,
+                categories: fullNetworkData.categories
+            };
+            updateChart();
+            updateStats();
+            document.querySelector(`.tab-btn[onclick="showTab('network')"]`).click();
+        }
+        
+        // Collaboration paths: shortest chains of shared records between two musicians
+        function getRecordGraph() {
+            if (!recordGraph && recordGraphData) {
+                recordGraph = {
+                    musicians: recordGraphData.musicians,
+                    records: recordGraphData.records,
+                    musicianIndex: new Map(recordGraphData.musicians.map((name, i) => [name, i])),
+                    musicianRecords: {
+                        indptr: decodeTypedArray(recordGraphData.musician_records.indptr),
+                        indices: decodeTypedArray(recordGraphData.musician_records.indices)
+                    },
+                    recordMusicians: {
+                        indptr: decodeTypedArray(recordGraphData.record_musicians.indptr),
+                        indices: decodeTypedArray(recordGraphData.record_musicians.indices)
+                    }
+                };
+            }
+            return recordGraph;
+        }
+        
+        function findCollaborationPath(source, target) {
+            // Bidirectional breadth-first search, as paths.shortest_path: expand whole
+            // musician layers from the smaller side until the two searches meet
+            const graph = getRecordGraph();
+            if (!graph || !graph.musicianIndex.has(source) || !graph.musicianIndex.has(target)) {
+                return null;
+            }
+            const start = graph.musicianIndex.get(source);
+            const goal = graph.musicianIndex.get(target);
+            if (start === goal) {
+                return { distance: 0, musicians: [source], records: [] };
+            }
+            
+            const count = graph.musicians.length;
+            const sides = [start, goal].map(origin => {
+                const side = {
+                    distance: new Int32Array(count).fill(-1),
+                    parentMusician: new Int32Array(count).fill(-1),
+                    parentRecord: new Int32Array(count).fill(-1),
+                    frontier: [origin],
+                    depth: 0
+                };
+                side.distance[origin] = 0;
+                return side;
+            });
+            
+            function trace(side, node) {
+                const musicians = [node];
+                const records = [];
+                while (side.parentMusician[node] >= 0) {
+                    records.push(side.parentRecord[node]);
+                    node = side.parentMusician[node];
+                    musicians.push(node);
+                }
+                return { musicians, records };
+            }
+            
+            const m2r = graph.musicianRecords;
+            const r2m = graph.recordMusicians;
+            while (sides[0].frontier.length > 0 && sides[1].frontier.length > 0) {
+                const sideIndex = sides[0].frontier.length <= sides[1].frontier.length ? 0 : 1;
+                const side = sides[sideIndex];
+                const other = sides[1 - sideIndex];
+                
+                const next = [];
+                const seenRecords = new Set();
+                side.depth++;
+                side.frontier.forEach(musician => {
+                    for (let j = m2r.indptr[musician]; j < m2r.indptr[musician + 1]; j++) {
+                        const record = m2r.indices[j];
+                        if (seenRecords.has(record)) continue;
+                        seenRecords.add(record);
+                        for (let k = r2m.indptr[record]; k < r2m.indptr[record + 1]; k++) {
+                            const neighbour = r2m.indices[k];
+                            if (side.distance[neighbour] >= 0) continue;
+                            side.distance[neighbour] = side.depth;
+                            side.parentMusician[neighbour] = musician;
+                            side.parentRecord[neighbour] = record;
+                            next.push(neighbour);
+                        }
+                    }
+                });
+                side.frontier = next;
+                
+                const met = next.filter(musician => other.distance[musician] >= 0);
+                if (met.length > 0) {
+                    const meeting = met.reduce((best, musician) =>
+                        other.distance[musician] < other.distance[best] ? musician : best);
+                    const forward = trace(sides[0], meeting);
+                    const backward = trace(sides[1], meeting);
+                    const chain = forward.musicians.reverse().concat(backward.musicians.slice(1));
+                    const chainRecords = forward.records.reverse().concat(backward.records);
+                    return {
+                        distance: chainRecords.length,
+                        musicians: chain.map(i => graph.musicians[i]),
+                        records: chainRecords.map(i => graph.records[i])
+                    };
+                }
+            }
+            return { distance: null, musicians: [], records: [] };
+        }
+        
+        function showCollaborationPath(source) {
+            const target = document.getElementById('debugPathTarget').value.trim();
+            const output = document.getElementById('debugPathResult');
+            output.innerHTML = '';
+            if (!target) return;
+            
+            const path = findCollaborationPath(source, target);
+            const addItem = text => {
+                const item = document.createElement('li');
+                item.textContent = text;
+                output.appendChild(item);
+            };
+            if (!path) {
+                addItem(`'${target}' is not a credited musician`);
+            } else if (path.distance === null) {
+                addItem(`${source} and ${target} are not connected through shared records`);
+            } else {
+                addItem(`Degrees of separation: ${path.distance}`);
+                path.records.forEach((record, i) => {
+                    addItem(`${path.musicians[i]} → ${record} → ${path.musicians[i + 1]}`);
+                });
+            }
+        }
+        
         function showDebugDetails(musicianName) {
             const originalMusician = musicianStatsData.find(m => m.musician === musicianName);
             const filteredStats = calculateFilteredMusicianStats();
@@ -2457,13 +3564,89 @@ def get_javascript_functions():
                 content += '</ul></div>';
             }
             
+            if (egoIndexData && networkNode) {
+                content += `
+                    <div class="debug-section">
+                        <h4>Ego Network</h4>
+                        <ul class="debug-list" id="debugEgoList"></ul>
+                    </div>
+                `;
+            }
+            
+            if (recordGraphData && getRecordGraph().musicianIndex.has(musicianName)) {
+                content += `
+                    <div class="debug-section">
+                        <h4>Degrees of Separation</h4>
+                        <input type="text" id="debugPathTarget" class="search-input" placeholder="Connect to musician..." list="debugPathMusicians">
+                        <datalist id="debugPathMusicians"></datalist>
+                        <button class="multi-select-control-btn" id="debugPathButton">Find path</button>
+                        <ul class="debug-list" id="debugPathResult"></ul>
+                    </div>
+                `;
+            }
+            
             infoElement.innerHTML = content;
+            
+            const pathButton = document.getElementById('debugPathButton');
+            if (pathButton) {
+                const suggestions = document.getElementById('debugPathMusicians');
+                getRecordGraph().musicians.slice(0, 2000).forEach(name => {
+                    const option = document.createElement('option');
+                    option.value = name;
+                    suggestions.appendChild(option);
+                });
+                pathButton.onclick = () => showCollaborationPath(musicianName);
+            }
+            
+            // k-hop neighbourhoods, with buttons to show them in the network tab
+            const egoList = document.getElementById('debugEgoList');
+            if (egoList) {
+                for (let depth = 1; depth <= egoIndexData.max_depth; depth++) {
+                    const ego = getEgoNetwork(musicianName, depth, egoIndexData.max_nodes);
+                    const item = document.createElement('li');
+                    item.textContent = `Within ${depth} hop${depth > 1 ? 's' : ''}: ${ego.nodes.length - 1} nodes, ${ego.links.length} links${ego.truncated ? ' (capped) ' : ' '}`;
+                    const button = document.createElement('button');
+                    button.className = 'multi-select-control-btn';
+                    button.textContent = 'Show in network';
+                    button.onclick = () => showEgoNetwork(musicianName, depth);
+                    item.appendChild(button);
+                    egoList.appendChild(item);
+                }
+            }
+            
             detailsContainer.style.display = 'block';
         }
 '''
 
 
-def generate_html_file(network_data, musician_stats_data, session_musicians_data, custom_filter_data, output_path):
+def _to_json(data, minify):
+    if minify:
+        return json.dumps(data, separators=(',', ':'))
+    return json.dumps(data, indent=2)
+
+
+def resolve_renderer(renderer, node_count, webgl_threshold):
+    """
+    Pick the chart renderer for a network.
+    
+    Args:
+        renderer: 'canvas', 'webgl', or 'auto' to switch to WebGL once the
+                  network has more than webgl_threshold nodes
+        node_count: Number of nodes in the network
+        webgl_threshold: Node count above which 'auto' picks WebGL
+        
+    Returns:
+        'canvas' or 'webgl'
+    """
+    if renderer == 'auto':
+        return 'webgl' if node_count > webgl_threshold else 'canvas'
+    return renderer
+
+
+def generate_html_file(network_data, musician_stats_data, session_musicians_data, custom_filter_data, output_path,
+                       assets='cdn', vendor_dir='vendor', minify=False, payload='json', musician_aggregates=None,
+                       renderer='canvas', ego_index=None, ego_max_nodes=500, ego_max_depth=3, record_graph=None,
+                       period_snapshots=None, metric_ranks=None, session_min_records=2, session_min_ratio=0.7):
     """
     Generate the complete HTML file with all data embedded.
     
@@ -2472,6 +3655,31 @@ def generate_html_file(network_data, musician_stats_data, session_musicians_data
         musician_stats_data: List of dictionaries with musician statistics
         session_musicians_data: List of dictionaries with session musician data
         output_path: Path where to save the HTML file
+        assets: How chart libraries are loaded: 'cdn', 'local' (copied next
+                to the output) or 'inline' (embedded in the page)
+        vendor_dir: Directory with the pinned library files for 'local'/'inline'
+        minify: Minify the page's CSS and JavaScript and emit compact JSON
+        payload: 'json' to embed the network as a JavaScript literal, or
+                 'binary' for base64 typed-array columns (see columnar.py)
+        musician_aggregates: Optional dictionary from
+                             analysis.build_musician_filter_matrices; lets the
+                             scatter plot show record counts under the filters
+        renderer: 'canvas' or 'webgl' (see resolve_renderer); 'webgl' also
+                  loads ECharts-GL
+        ego_index: Optional result of graph_metrics.build_ego_index; enables
+                   k-hop ego networks in the Debug tab
+        ego_max_nodes: Node budget for ego networks in the page
+        ego_max_depth: Deepest neighbourhood offered in the Debug tab
+        record_graph: Optional result of paths.build_record_graph; enables
+                      collaboration paths in the Debug tab
+        period_snapshots: Optional result of temporal.build_period_snapshots;
+                          enables the release period slider
+        metric_ranks: Optional result of analysis.build_metric_ranks; the
+                      Top Musicians and Session Musicians lists read it
+                      instead of sorting (the page sorts once without it)
+        session_min_records, session_min_ratio: Session musician rule the
+                                                page applies under filters,
+                                                as for get_session_musicians
     """
     # Get the base template
     html_template = get_html_template()
@@ -2479,26 +3687,81 @@ def generate_html_file(network_data, musician_stats_data, session_musicians_data
     # Get JavaScript functions
     js_functions = get_javascript_functions()
     
+    if minify:
+        html_template = minify_html_page(html_template)
+        js_functions = minify_js(js_functions)
+    
+    # Library tags go in first so data can never be mistaken for a placeholder
+    html_template = html_template.replace(
+        '{library_scripts}',
+        get_library_tags(assets, vendor_dir, output_path, get_page_libraries(renderer))
+    ).replace(
+        '{session_rule_placeholder}',
+        json.dumps({'minRecords': session_min_records, 'minRatio': session_min_ratio})
+    )
+    
+    if payload == 'binary':
+        network_literal = f"decodeNetworkPayload({_to_json(encode_network_payload(network_data), True)})"
+    else:
+        # Link attribute offset/code arrays become plain lists
+        link_attributes = {
+            column: {
+                'values': list(attribute['values']),
+                'offsets': [int(offset) for offset in attribute['offsets']],
+                'codes': [int(code) for code in attribute['codes']]
+            }
+            for column, attribute in network_data.get('link_attributes', {}).items()
+        }
+        network_literal = _to_json(dict(network_data, link_attributes=link_attributes), minify)
+    
     # Replace placeholders with actual data
     html_content = html_template.replace(
         '{network_data_placeholder}', 
-        json.dumps(network_data, indent=2)
+        network_literal
     ).replace(
         '{musician_stats_placeholder}', 
-        json.dumps(musician_stats_data, indent=2)
+        _to_json(musician_stats_data, minify)
     ).replace(
         '{session_musicians_placeholder}', 
-        json.dumps(session_musicians_data, indent=2)
+        _to_json(session_musicians_data, minify)
+    ).replace(
+        '{musician_ranks_placeholder}',
+        _to_json(encode_metric_ranks(metric_ranks, PAGE_RANK_METRICS), True) if metric_ranks else 'null'
     ).replace(
         '{custom_filter_data_placeholder}', 
-        json.dumps(custom_filter_data, indent=2)
+        _to_json(custom_filter_data, minify)
+    ).replace(
+        '{chart_renderer_placeholder}',
+        json.dumps(renderer)
+    ).replace(
+        '{period_snapshots_placeholder}',
+        _to_json(encode_period_snapshots(period_snapshots), True) if period_snapshots else 'null'
+    ).replace(
+        '{record_graph_placeholder}',
+        _to_json(encode_record_graph(record_graph), True) if record_graph else 'null'
+    ).replace(
+        '{ego_index_placeholder}',
+        _to_json(encode_ego_index(ego_index, ego_max_nodes, ego_max_depth), True) if ego_index else 'null'
+    ).replace(
+        '{musician_aggregates_placeholder}',
+        _to_json(encode_musician_aggregates(musician_aggregates), True) if musician_aggregates else 'null'
     ).replace(
         '{javascript_functions}',
         js_functions
     )
     
-    # Write to file
-    with open(output_path, 'w', encoding='utf-8') as f:
-        f.write(html_content)
+    # Write to a temporary file and rename it into place, so anyone viewing
+    # the page never sees a half-written file
+    output_dir = os.path.dirname(os.path.abspath(output_path))
+    fd, temp_path = tempfile.mkstemp(dir=output_dir, prefix='.', suffix='.html.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(html_content)
+        os.chmod(temp_path, 0o644)
+        os.replace(temp_path, output_path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.unlink(temp_path)
+        raise
     
     return output_path 
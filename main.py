@@ -4,25 +4,480 @@ Main script for musician network analysis.
 Orchestrates data processing, analysis, and HTML generation.
 """
 
+import os
 import sys
+import time
 import argparse
 from pathlib import Path
 
-from data_processor import (
-    load_collection_data, 
-    create_network_data, 
-    create_echarts_network_data,
-    get_custom_filter_data
-)
-from analysis import (
-    analyze_top_musicians,
-    get_session_musicians,
-    get_collaboration_stats
-)
-from html_generator import generate_html_file
+# Only light modules are imported up front, so --help and argument errors
+# return quickly; pandas, NumPy/SciPy and the HTML/JavaScript templates are
+# imported by the stage that needs them
+from assets import ASSET_MODES
 import config
 
 
+def _build_network(collection_df):
+    """Parse the credits and canonicalize musician names."""
+    from data_processor import create_network_data
+    from entity_resolution import canonicalize_musicians
+    
+    network_df = create_network_data(collection_df)
+    if not config.ENABLE_ENTITY_RESOLUTION:
+        return network_df, None
+    return canonicalize_musicians(
+        network_df,
+        rules=config.ENTITY_MERGE_RULES,
+        similarity_threshold=config.ENTITY_SIMILARITY_THRESHOLD,
+        max_block_size=config.ENTITY_MAX_BLOCK_SIZE
+    )
+
+
+def _build_echarts_data(network_df, collection_df):
+    """Network visualization data with communities and detail tiers."""
+    from data_processor import create_echarts_network_data
+    from graph_metrics import assign_communities, assign_detail_tiers
+    
+    echarts_data = create_echarts_network_data(network_df, collection_df)
+    if config.DETECT_COMMUNITIES:
+        assign_communities(
+            echarts_data,
+            max_iter=config.COMMUNITY_MAX_ITER,
+            seed=config.RANDOM_SEED,
+            max_categories=config.MAX_COMMUNITY_CATEGORIES,
+            colors=config.COMMUNITY_COLORS
+        )
+    if config.ENABLE_DETAIL_TIERS:
+        assign_detail_tiers(
+            echarts_data,
+            metric=config.LOD_NODE_METRIC,
+            tier_sizes=config.LOD_TIER_SIZES,
+            link_min_values=config.LOD_LINK_MIN_VALUES,
+            link_budget=config.LOD_LINK_BUDGET
+        )
+    return echarts_data
+
+
+def _build_musician_stats(network_df, collection_df):
+    """Musician statistics with centrality metrics."""
+    from analysis import analyze_top_musicians
+    from graph_metrics import add_centrality_metrics
+    
+    musician_stats_df = analyze_top_musicians(network_df, collection_df)
+    if config.COMPUTE_GRAPH_METRICS:
+        musician_stats_df = add_centrality_metrics(
+            musician_stats_df,
+            network_df,
+            damping=config.PAGERANK_DAMPING,
+            max_iter=config.CENTRALITY_MAX_ITER,
+            tol=config.CENTRALITY_TOLERANCE,
+            betweenness_samples=config.BETWEENNESS_SAMPLES,
+            seed=config.RANDOM_SEED
+        )
+    return musician_stats_df
+
+
+def _build_session_musicians(musician_stats_df):
+    from analysis import get_session_musicians
+    return get_session_musicians(
+        musician_stats_df,
+        min_records=config.SESSION_MUSICIAN_MIN_RECORDS,
+        min_session_ratio=config.SESSION_MUSICIAN_MIN_RATIO
+    )
+
+
+def _build_record_graph(network_df):
+    from paths import build_record_graph
+    return build_record_graph(network_df) if config.ENABLE_PATH_FINDER else None
+
+
+def _build_period_snapshots(network_df, echarts_data, musician_stats_df):
+    from temporal import build_period_snapshots
+    if not config.ENABLE_TIME_SNAPSHOTS:
+        return None
+    return build_period_snapshots(
+        network_df, echarts_data, musician_stats_df,
+        year_column=config.YEAR_COLUMN,
+        period_years=config.PERIOD_YEARS
+    )
+
+
+def _write_html(args, echarts_data, musician_stats_df, session_musicians_df, metric_ranks, custom_filter_data,
+                musician_aggregates, ego_index, record_graph, period_snapshots):
+    """Render the page; returns the output path and the chart renderer used."""
+    from html_generator import generate_html_file, resolve_renderer
+    
+    renderer = resolve_renderer(args.renderer, len(echarts_data['nodes']), config.WEBGL_NODE_THRESHOLD)
+    output_file = generate_html_file(
+        network_data=echarts_data,
+        # Convert DataFrames to dictionaries for JSON serialization
+        musician_stats_data=musician_stats_df.to_dict('records'),
+        session_musicians_data=session_musicians_df.to_dict('records'),
+        custom_filter_data=custom_filter_data,
+        metric_ranks=metric_ranks,
+        output_path=args.output,
+        assets=args.assets,
+        vendor_dir=args.vendor_dir,
+        minify=args.minify,
+        payload=args.payload,
+        musician_aggregates=musician_aggregates,
+        renderer=renderer,
+        ego_index=ego_index,
+        ego_max_nodes=config.EGO_MAX_NODES,
+        ego_max_depth=config.EGO_MAX_DEPTH,
+        record_graph=record_graph,
+        period_snapshots=period_snapshots,
+        session_min_records=config.SESSION_MUSICIAN_MIN_RECORDS,
+        session_min_ratio=config.SESSION_MUSICIAN_MIN_RATIO
+    )
+    return output_file, renderer
+
+
+def _print_stage_time(name, seconds, cached=False):
+    print(f"   ⏱️  {name}: {seconds:.2f} s{' (cached)' if cached else ''}")
+
+
+def open_cache(args):
+    """Stage cache for a run, or None with --no-cache."""
+    if args.no_cache:
+        return None
+    from pipeline import open_stage_cache, source_version
+    return open_stage_cache(
+        args.cache_dir, config, source_version(Path(__file__).resolve().parent), config.PIPELINE_CACHE_ENTRIES
+    )
+
+
+def build_analysis(input_path, verbose=False, jobs=1, executor='thread', cache=None):
+    """
+    Run the data processing and analysis stages (steps 1-4).
+    
+    The visualization data, musician statistics and custom filter lists
+    only depend on the parsed network, so they run concurrently when jobs
+    is above 1. With a stage cache, stages whose input file contents,
+    settings and code are unchanged are loaded from the cache.
+    
+    Returns:
+        Dictionary with collection_df, network_df, echarts_data,
+        musician_stats_df, session_musicians_df, metric_ranks,
+        custom_filter_data and aliases_df (None when entity resolution is
+        disabled)
+    """
+    from analysis import build_metric_ranks
+    from data_processor import load_collection_data, get_custom_filter_data
+    from pipeline import Stage, file_digest, run_stages
+    
+    stages = [
+        Stage('load', load_collection_data, ['input_path'], ['collection_df']),
+        Stage('network', _build_network, ['collection_df'], ['network_df', 'aliases_df'],
+              config=['ENABLE_ENTITY_RESOLUTION', 'ENTITY_MERGE_RULES', 'ENTITY_SIMILARITY_THRESHOLD',
+                      'ENTITY_MAX_BLOCK_SIZE']),
+        Stage('echarts', _build_echarts_data, ['network_df', 'collection_df'], ['echarts_data'],
+              config=['DETECT_COMMUNITIES', 'COMMUNITY_MAX_ITER', 'RANDOM_SEED', 'MAX_COMMUNITY_CATEGORIES',
+                      'COMMUNITY_COLORS', 'ENABLE_DETAIL_TIERS', 'LOD_NODE_METRIC', 'LOD_TIER_SIZES',
+                      'LOD_LINK_MIN_VALUES', 'LOD_LINK_BUDGET']),
+        Stage('musician_stats', _build_musician_stats, ['network_df', 'collection_df'], ['musician_stats_df'],
+              config=['COMPUTE_GRAPH_METRICS', 'PAGERANK_DAMPING', 'CENTRALITY_MAX_ITER',
+                      'CENTRALITY_TOLERANCE', 'BETWEENNESS_SAMPLES', 'RANDOM_SEED']),
+        Stage('session_musicians', _build_session_musicians, ['musician_stats_df'], ['session_musicians_df'],
+              config=['SESSION_MUSICIAN_MIN_RECORDS', 'SESSION_MUSICIAN_MIN_RATIO']),
+        Stage('metric_ranks', build_metric_ranks, ['musician_stats_df'], ['metric_ranks']),
+        Stage('custom_filters', get_custom_filter_data, ['collection_df'], ['custom_filter_data']),
+    ]
+    
+    if cache is not None:
+        # The input is addressed by its contents, not its path or timestamp
+        cache['digests']['input_path'] = file_digest(input_path)
+    
+    if verbose:
+        print(f"⚙️  Steps 1-4: Loading, processing and analyzing ({jobs} job{'s' if jobs != 1 else ''})...")
+    results, _ = run_stages(
+        stages,
+        {'input_path': input_path},
+        jobs=jobs,
+        executor=executor,
+        on_stage_done=_print_stage_time if verbose else None,
+        cache=cache
+    )
+    del results['input_path']
+    
+    if verbose:
+        collection_df = results['collection_df']
+        network_df = results['network_df']
+        aliases_df = results['aliases_df']
+        echarts_data = results['echarts_data']
+        musician_stats_df = results['musician_stats_df']
+        
+        print(f"✅ Loaded {len(collection_df)} records")
+        if aliases_df is not None:
+            merged = (aliases_df['alias'] != aliases_df['canonical']).sum()
+            print(f"🔗 Merged {merged} name variants into {aliases_df['canonical'].nunique()} musicians")
+        print(f"✅ Created network with {len(network_df)} connections")
+        print(f"   • {network_df['musician'].nunique()} unique musicians")
+        print(f"   • {network_df['main_artist'].nunique()} main artists")
+        
+        print(f"✅ Network data prepared:")
+        print(f"   • {len(echarts_data['nodes'])} nodes")
+        print(f"   • {len(echarts_data['links'])} links")
+        print(f"   • {len(echarts_data['genres'])} genres")
+        print(f"   • {len(echarts_data['styles'])} styles")
+        if config.DETECT_COMMUNITIES:
+            print(f"   • {echarts_data['community_count']} communities detected")
+        if config.ENABLE_DETAIL_TIERS:
+            print(f"   • {len(echarts_data['detail_levels']['tiers'])} detail tiers")
+        
+        print(f"✅ Analysis complete:")
+        print(f"   • {len(musician_stats_df)} musicians analyzed")
+        if config.COMPUTE_GRAPH_METRICS:
+            top_pagerank = musician_stats_df.iloc[results['metric_ranks']['pagerank'][0]]
+            print(f"   • Centrality metrics computed (top PageRank: {top_pagerank['musician']})")
+        print(f"   • {len(results['session_musicians_df'])} session musicians found")
+    
+    return results
+
+
+def write_outputs(args, results, cache=None):
+    """Generate the HTML file and optional CSV, database and index exports (steps 5-9)."""
+    from functools import partial
+    from analysis import build_musician_filter_matrices
+    from graph_metrics import build_ego_index
+    from assets import get_page_libraries, page_weight_report
+    from pipeline import Stage, run_stages
+    
+    collection_df = results['collection_df']
+    network_df = results['network_df']
+    musician_stats_df = results['musician_stats_df']
+    
+    # Step 5: Generate HTML
+    if args.verbose:
+        print("⚙️  Step 5: Generating interactive HTML...")
+    
+    # Page indexes are independent of each other; the page itself is
+    # always rendered, since it depends on the output options too
+    stages = [
+        Stage('musician_aggregates', build_musician_filter_matrices,
+              ['network_df', 'collection_df', 'musician_stats_df', 'custom_filter_data'], ['musician_aggregates']),
+        Stage('ego_index', build_ego_index, ['echarts_data'], ['ego_index']),
+        Stage('record_graph', _build_record_graph, ['network_df'], ['record_graph'],
+              config=['ENABLE_PATH_FINDER']),
+        Stage('period_snapshots', _build_period_snapshots,
+              ['network_df', 'echarts_data', 'musician_stats_df'], ['period_snapshots'],
+              config=['ENABLE_TIME_SNAPSHOTS', 'YEAR_COLUMN', 'PERIOD_YEARS']),
+        Stage('html', partial(_write_html, args),
+              ['echarts_data', 'musician_stats_df', 'session_musicians_df', 'metric_ranks', 'custom_filter_data',
+               'musician_aggregates', 'ego_index', 'record_graph', 'period_snapshots'],
+              ['output_file', 'renderer'],
+              config=['WEBGL_NODE_THRESHOLD', 'EGO_MAX_NODES', 'EGO_MAX_DEPTH',
+                      'SESSION_MUSICIAN_MIN_RECORDS', 'SESSION_MUSICIAN_MIN_RATIO'], cache=False),
+    ]
+    page_data, _ = run_stages(
+        stages,
+        results,
+        jobs=args.jobs,
+        executor=config.PIPELINE_EXECUTOR,
+        on_stage_done=_print_stage_time if args.verbose else None,
+        cache=cache
+    )
+    period_snapshots = page_data['period_snapshots']
+    output_file = page_data['output_file']
+    renderer = page_data['renderer']
+    
+    if args.verbose:
+        print(f"✅ HTML file generated: {output_file} ({renderer} renderer)")
+        if period_snapshots:
+            print(f"   • Time snapshots: {period_snapshots['labels'][0]} to {period_snapshots['labels'][-1]} "
+                  f"({len(period_snapshots['labels'])} periods)")
+        report = page_weight_report(
+            output_file, args.assets, get_page_libraries(renderer), bandwidth_mbps=config.REPORT_BANDWIDTH_MBPS
+        )
+        print(f"   • Page weight: {report['html_bytes'] / 1024:.0f} KB "
+              f"({report['gzip_bytes'] / 1024:.0f} KB gzipped)")
+        if report['asset_bytes']:
+            print(f"   • Local library assets: {report['asset_bytes'] / 1024:.0f} KB")
+        print(f"   • External requests: {report['external_requests']}")
+        print(f"   • Estimated transfer at {config.REPORT_BANDWIDTH_MBPS} Mbit/s: "
+              f"{report['estimated_transfer_ms']:.0f} ms")
+    
+    # Step 6: Save CSV files if requested
+    if args.save_csvs:
+        if args.verbose:
+            print("⚙️  Step 6: Saving CSV files...")
+        
+        # Save network data
+        network_df.to_csv(config.NETWORK_CSV_PATH, index=False)
+        
+        # Create triples format for graph export
+        triples = []
+        for _, row in network_df.iterrows():
+            triples.append({
+                'subject': row['musician'],
+                'predicate': row['role'],
+                'object': row['main_artist']
+            })
+        
+        import pandas as pd
+        triples_df = pd.DataFrame(triples)
+        triples_df.to_csv(config.TRIPLES_CSV_PATH, index=False)
+        
+        aliases_df = results['aliases_df']
+        if aliases_df is not None:
+            aliases_df.to_csv(config.ALIASES_CSV_PATH, index=False)
+        
+        if args.verbose:
+            print(f"✅ CSV files saved:")
+            print(f"   • {config.NETWORK_CSV_PATH}")
+            print(f"   • {config.TRIPLES_CSV_PATH}")
+            if aliases_df is not None:
+                print(f"   • {config.ALIASES_CSV_PATH}")
+    
+    # Step 7: Save SQLite database if requested
+    if args.db:
+        if args.verbose:
+            print("⚙️  Step 7: Saving SQLite database...")
+        from store import save_to_database
+        save_to_database(args.db, network_df, collection_df, musician_stats_df)
+        if args.verbose:
+            print(f"✅ Database saved: {args.db}")
+    
+    # Step 8: Save similar-musician index if requested
+    if args.similarity_index:
+        if args.verbose:
+            print("⚙️  Step 8: Building similar-musician index...")
+        from similarity import save_similarity_index
+        similarity_index = _build_similarity_index(network_df, collection_df)
+        save_similarity_index(similarity_index, args.similarity_index)
+        if args.verbose:
+            print(f"✅ Similarity index saved: {args.similarity_index} "
+                  f"({len(similarity_index['musicians'])} musicians)")
+    
+    # Step 9: Save memory-mapped network artifacts if requested
+    if args.artifacts:
+        if args.verbose:
+            print("⚙️  Step 9: Saving memory-mapped network artifacts...")
+        from artifacts import save_network_artifacts
+        save_network_artifacts(args.artifacts, results['echarts_data'], musician_stats_df, page_data['ego_index'],
+                               results['metric_ranks'])
+        if args.verbose:
+            print(f"✅ Network artifacts saved: {args.artifacts}")
+
+
+def _build_similarity_index(network_df, collection_df):
+    from similarity import build_similarity_index
+    return build_similarity_index(
+        network_df,
+        collection_df,
+        num_perm=config.SIMILARITY_PERMUTATIONS,
+        band_rows=config.SIMILARITY_BAND_ROWS,
+        seed=config.RANDOM_SEED
+    )
+
+
+def print_summary(args, results):
+    """Print the final summary of a completed run."""
+    network_df = results['network_df']
+    
+    if args.verbose:
+        from analysis import get_collaboration_stats
+        
+        print()
+        print("🎉 ANALYSIS COMPLETE!")
+        print("=" * 50)
+        
+        # Get collaboration stats
+        stats = get_collaboration_stats(network_df)
+        print("📊 Collection Statistics:")
+        print(f"   • Total connections: {stats['total_connections']}")
+        print(f"   • Unique musicians: {stats['unique_musicians']}")
+        print(f"   • Unique artists: {stats['unique_artists']}")
+        print(f"   • Unique albums: {stats['unique_albums']}")
+        print(f"   • Unique roles: {stats['unique_roles']}")
+        print()
+        print(f"🌟 Top collaborators:")
+        print(f"   • Most collaborative musician: {stats['most_collaborative_musician']}")
+        print(f"   • Most collaborative artist: {stats['most_collaborative_artist']}")
+        print()
+        print(f"🚀 Open '{args.output}' in your browser to explore!")
+    else:
+        print(f"✅ Analysis complete! Generated: {args.output}")
+
+
+def run_analysis(args):
+    """Run the complete pipeline once and write all outputs."""
+    cache = open_cache(args)
+    results = build_analysis(args.input, args.verbose, args.jobs, config.PIPELINE_EXECUTOR, cache)
+    write_outputs(args, results, cache)
+    print_summary(args, results)
+
+
+# Modules a batch worker imports before its first collection
+BATCH_WORKER_MODULES = (
+    'pandas', 'numpy', 'data_processor', 'entity_resolution', 'analysis', 'graph_metrics',
+    'paths', 'temporal', 'columnar', 'html_generator', 'pipeline'
+)
+
+
+def _run_collection(args, input_path, output_path):
+    """Generate one collection's page inside a batch worker."""
+    collection_args = argparse.Namespace(
+        **{**vars(args), 'input': input_path, 'output': output_path, 'verbose': False, 'jobs': 1}
+    )
+    results = build_analysis(input_path)
+    write_outputs(collection_args, results)
+    return len(results['collection_df'])
+
+
+def run_batch_analysis(args):
+    """
+    Generate the page of every collection in the --batch manifest.
+    
+    Collections run on --jobs warm worker processes, one collection per
+    worker at a time, without the stage cache (its entries are per stage,
+    not per collection).
+    
+    Returns:
+        Number of collections that failed
+    """
+    from functools import partial
+    from batch import load_manifest, run_batch, save_summary
+    
+    entries = load_manifest(args.batch)
+    print(f"📦 Batch: {len(entries)} collections on {args.jobs} worker{'s' if args.jobs != 1 else ''}")
+    
+    def report(row):
+        if row['status'] == 'ok':
+            print(f"   ✅ {row['input']} → {row['output']} ({row['records']} records, {row['seconds']:.2f} s)")
+        else:
+            print(f"   ❌ {row['input']}: {row['error']}")
+    
+    start = time.perf_counter()
+    summary = run_batch(
+        entries,
+        partial(_run_collection, args),
+        workers=args.jobs,
+        warm_modules=BATCH_WORKER_MODULES,
+        on_done=report
+    )
+    save_summary(summary, args.batch_summary)
+    
+    failed = sum(row['status'] != 'ok' for row in summary)
+    print(f"✅ Batch complete in {time.perf_counter() - start:.1f} s: "
+          f"{len(summary) - failed} succeeded, {failed} failed")
+    print(f"   • Summary: {args.batch_summary}")
+    return failed
+
+
+def _rerun_analysis(args, changed=True):
+    """Re-run the pipeline from watch mode, reporting errors without exiting."""
+    if changed:
+        print(f"🔄 '{args.input}' changed, regenerating...")
+    try:
+        run_analysis(args)
+    except Exception as e:
+        print(f"❌ Error during analysis: {str(e)}")
+        if args.verbose:
+            import traceback
+            traceback.print_exc()
+
+
 def main():
     """Main function to run the complete analysis pipeline."""
     parser = argparse.ArgumentParser(
@@ -50,8 +505,142 @@ def main():
         action='store_true',
         help='Enable verbose output'
     )
+    parser.add_argument(
+        '--serve',
+        action='store_true',
+        help='Serve JSON queries over HTTP instead of generating HTML'
+    )
+    parser.add_argument(
+        '--host',
+        type=str,
+        default=config.SERVER_HOST,
+        help=f'Host for --serve (default: {config.SERVER_HOST})'
+    )
+    parser.add_argument(
+        '--port',
+        type=int,
+        default=config.SERVER_PORT,
+        help=f'Port for --serve (default: {config.SERVER_PORT})'
+    )
+    parser.add_argument(
+        '--db',
+        type=str,
+        default=None,
+        help='Also save connections, artist info and stats to this SQLite database'
+    )
+    parser.add_argument(
+        '--similarity-index',
+        type=str,
+        default=None,
+        help='Also save the MinHash similar-musician index to this .npz file'
+    )
+    parser.add_argument(
+        '--artifacts',
+        type=str,
+        default=None,
+        help='Also save the network, adjacency and stats as memory-mappable .npy files to this directory'
+    )
+    parser.add_argument(
+        '--assets',
+        choices=ASSET_MODES,
+        default=config.ASSET_MODE,
+        help=f'How chart libraries are loaded: from the CDN, copied next to the output, '
+             f'or inlined (default: {config.ASSET_MODE})'
+    )
+    parser.add_argument(
+        '--vendor-dir',
+        type=str,
+        default=config.VENDOR_DIR,
+        help=f'Directory with pinned chart library files (default: {config.VENDOR_DIR})'
+    )
+    parser.add_argument(
+        '--minify',
+        action='store_true',
+        default=config.MINIFY_OUTPUT,
+        help='Minify the page CSS/JavaScript and emit compact JSON'
+    )
+    parser.add_argument(
+        '--payload',
+        choices=['json', 'binary'],
+        default=config.NETWORK_PAYLOAD,
+        help=f'How the network is embedded: a JSON literal or base64 typed-array columns '
+             f'decoded in the browser (default: {config.NETWORK_PAYLOAD})'
+    )
+    parser.add_argument(
+        '--renderer',
+        choices=['auto', 'canvas', 'webgl'],
+        default=config.CHART_RENDERER,
+        help=f'Network chart renderer; auto uses WebGL above {config.WEBGL_NODE_THRESHOLD} nodes '
+             f'(default: {config.CHART_RENDERER})'
+    )
+    parser.add_argument(
+        '--jobs', '-j',
+        type=int,
+        default=config.PIPELINE_JOBS,
+        help=f'Number of pipeline stages run concurrently; 0 uses one per CPU core '
+             f'(default: {config.PIPELINE_JOBS})'
+    )
+    parser.add_argument(
+        '--cache-dir',
+        type=str,
+        default=config.PIPELINE_CACHE_DIR,
+        help=f'Directory for memoized pipeline stage results (default: {config.PIPELINE_CACHE_DIR})'
+    )
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        default=not config.ENABLE_PIPELINE_CACHE,
+        help='Recompute every pipeline stage instead of reusing unchanged results'
+    )
+    parser.add_argument(
+        '--batch',
+        type=str,
+        default=None,
+        help='Generate one page per row of this manifest CSV (input and output columns) '
+             'on --jobs worker processes'
+    )
+    parser.add_argument(
+        '--batch-summary',
+        type=str,
+        default=config.BATCH_SUMMARY_PATH,
+        help=f'Per-collection timing and error summary for --batch (default: {config.BATCH_SUMMARY_PATH})'
+    )
+    parser.add_argument(
+        '--fetch-assets',
+        action='store_true',
+        help='Download the pinned chart libraries into --vendor-dir and exit'
+    )
+    parser.add_argument(
+        '--watch',
+        action='store_true',
+        help='Keep running and regenerate the output whenever the input file changes'
+    )
     
     args = parser.parse_args()
+    if args.serve and args.watch:
+        parser.error('--serve and --watch cannot be combined')
+    if args.batch and (args.serve or args.watch or args.save_csvs or args.db or args.similarity_index
+                       or args.artifacts):
+        parser.error('--batch cannot be combined with --serve, --watch, --save-csvs, --db, '
+                     '--similarity-index or --artifacts')
+    if args.jobs < 0:
+        parser.error('--jobs must be 0 (one per CPU core) or more')
+    if args.jobs == 0:
+        args.jobs = os.cpu_count() or 1
+    
+    if args.fetch_assets:
+        from assets import fetch_vendor_assets
+        for path in fetch_vendor_assets(args.vendor_dir):
+            print(f"✅ Downloaded {path}")
+        return
+    
+    if args.batch:
+        try:
+            failed = run_batch_analysis(args)
+        except (OSError, ValueError) as e:
+            print(f"❌ Error: {str(e)}")
+            sys.exit(1)
+        sys.exit(1 if failed else 0)
     
     # Validate input file exists
     if not Path(args.input).exists():
@@ -66,118 +655,42 @@ def main():
         print()
     
     try:
-        # Step 1: Load data
-        if args.verbose:
-            print("⚙️  Step 1: Loading collection data...")
-        collection_df = load_collection_data(args.input)
-        if args.verbose:
-            print(f"✅ Loaded {len(collection_df)} records")
-        
-        # Step 2: Create network data
-        if args.verbose:
-            print("⚙️  Step 2: Processing musician network...")
-        network_df = create_network_data(collection_df)
-        if args.verbose:
-            print(f"✅ Created network with {len(network_df)} connections")
-            print(f"   • {network_df['musician'].nunique()} unique musicians")
-            print(f"   • {network_df['main_artist'].nunique()} main artists")
-        
-        # Step 3: Create ECharts network data
-        if args.verbose:
-            print("⚙️  Step 3: Generating network visualization data...")
-        echarts_data = create_echarts_network_data(network_df, collection_df)
-        if args.verbose:
-            print(f"✅ Network data prepared:")
-            print(f"   • {len(echarts_data['nodes'])} nodes")
-            print(f"   • {len(echarts_data['links'])} links")
-            print(f"   • {len(echarts_data['genres'])} genres")
-            print(f"   • {len(echarts_data['styles'])} styles")
-        
-        # Step 4: Analyze musicians
-        if args.verbose:
-            print("⚙️  Step 4: Analyzing musician statistics...")
-        musician_stats_df = analyze_top_musicians(network_df, collection_df)
-        session_musicians_df = get_session_musicians(
-            musician_stats_df,
-            min_records=config.SESSION_MUSICIAN_MIN_RECORDS,
-            min_session_ratio=config.SESSION_MUSICIAN_MIN_RATIO
-        )
-        
-        if args.verbose:
-            print(f"✅ Analysis complete:")
-            print(f"   • {len(musician_stats_df)} musicians analyzed")
-            print(f"   • {len(session_musicians_df)} session musicians found")
-        
-        # Step 5: Generate HTML
-        if args.verbose:
-            print("⚙️  Step 5: Generating interactive HTML...")
-        
-        # Get custom filter data
-        custom_filter_data = get_custom_filter_data(collection_df)
-        
-        # Convert DataFrames to dictionaries for JSON serialization
-        musician_stats_data = musician_stats_df.to_dict('records')
-        session_musicians_data = session_musicians_df.to_dict('records')
-        
-        output_file = generate_html_file(
-            network_data=echarts_data,
-            musician_stats_data=musician_stats_data,
-            session_musicians_data=session_musicians_data,
-            custom_filter_data=custom_filter_data,
-            output_path=args.output
-        )
-        
-        if args.verbose:
-            print(f"✅ HTML file generated: {output_file}")
-        
-        # Step 6: Save CSV files if requested
-        if args.save_csvs:
-            if args.verbose:
-                print("⚙️  Step 6: Saving CSV files...")
-            
-            # Save network data
-            network_df.to_csv(config.NETWORK_CSV_PATH, index=False)
-            
-            # Create triples format for graph export
-            triples = []
-            for _, row in network_df.iterrows():
-                triples.append({
-                    'subject': row['musician'],
-                    'predicate': row['role'],
-                    'object': row['main_artist']
-                })
-            
-            import pandas as pd
-            triples_df = pd.DataFrame(triples)
-            triples_df.to_csv(config.TRIPLES_CSV_PATH, index=False)
-            
-            if args.verbose:
-                print(f"✅ CSV files saved:")
-                print(f"   • {config.NETWORK_CSV_PATH}")
-                print(f"   • {config.TRIPLES_CSV_PATH}")
-        
-        # Final summary
-        if args.verbose:
-            print()
-            print("🎉 ANALYSIS COMPLETE!")
-            print("=" * 50)
-            
-            # Get collaboration stats
-            stats = get_collaboration_stats(network_df)
-            print("📊 Collection Statistics:")
-            print(f"   • Total connections: {stats['total_connections']}")
-            print(f"   • Unique musicians: {stats['unique_musicians']}")
-            print(f"   • Unique artists: {stats['unique_artists']}")
-            print(f"   • Unique albums: {stats['unique_albums']}")
-            print(f"   • Unique roles: {stats['unique_roles']}")
-            print()
-            print(f"🌟 Top collaborators:")
-            print(f"   • Most collaborative musician: {stats['most_collaborative_musician']}")
-            print(f"   • Most collaborative artist: {stats['most_collaborative_artist']}")
-            print()
-            print(f"🚀 Open '{args.output}' in your browser to explore!")
+        if args.serve:
+            # Serve mode: keep everything in memory and answer queries
+            from server import run_server
+            results = build_analysis(
+                args.input, args.verbose, args.jobs, config.PIPELINE_EXECUTOR, open_cache(args)
+            )
+            print(f"🌐 Serving queries on http://{args.host}:{args.port} (Ctrl+C to stop)")
+            print("   Endpoints: /stats, /musician, /search, /top, /subgraph, /ego, /path, /similar")
+            run_server(
+                results['network_df'],
+                results['musician_stats_df'],
+                results['echarts_data'],
+                host=args.host,
+                port=args.port,
+                cache_size=config.SERVER_CACHE_SIZE,
+                ego_max_nodes=config.EGO_MAX_NODES,
+                ego_max_depth=config.EGO_MAX_DEPTH,
+                similarity_index=_build_similarity_index(results['network_df'], results['collection_df']),
+                similarity_limit=config.SIMILARITY_LIMIT,
+                similarity_max_k=config.SIMILARITY_MAX_K,
+                metric_ranks=results['metric_ranks'],
+                aliases_df=results['aliases_df']
+            )
+        elif args.watch:
+            # Watch mode: regenerate whenever the input file changes
+            from watcher import watch_file
+            _rerun_analysis(args, changed=False)
+            print(f"👀 Watching '{args.input}' for changes (Ctrl+C to stop)")
+            watch_file(
+                args.input,
+                lambda: _rerun_analysis(args),
+                poll_interval=config.WATCH_POLL_INTERVAL,
+                debounce=config.WATCH_DEBOUNCE
+            )
         else:
-            print(f"✅ Analysis complete! Generated: {args.output}")
+            run_analysis(args)
     
     except Exception as e:
         print(f"❌ Error during analysis: {str(e)}")
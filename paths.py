@@ -0,0 +1,225 @@
+"""
+Collaboration path module for musician network analysis.
+Finds shortest chains of shared records between two musicians on the
+bipartite musician-record graph, and estimates distances from landmarks.
+"""
+
+import numpy as np
+import pandas as pd
+
+from graph_metrics import csr_from_pairs, row_positions
+
+
+# Distance value for musicians a landmark cannot reach
+UNREACHABLE = np.iinfo(np.uint16).max
+
+
+def build_record_graph(network_df):
+    """
+    Build the bipartite musician-record graph as CSR arrays.
+
+    Records are keyed "Main Artist - Album" as in analyze_top_musicians; a
+    musician is linked to every record they are credited on.
+
+    Args:
+        network_df: DataFrame from create_network_data
+
+    Returns:
+        Dictionary with musicians and records (label arrays), musician_index
+        (name to row), and musician_records / record_musicians CSR arrays
+    """
+    record_keys = network_df['main_artist'].astype(str) + ' - ' + network_df['album'].astype(str)
+    musician_codes, musicians = pd.factorize(network_df['musician'])
+    record_codes, records = pd.factorize(record_keys)
+
+    musician_indptr, musician_records = csr_from_pairs(musician_codes, record_codes, len(musicians))
+    record_indptr, record_musicians = csr_from_pairs(record_codes, musician_codes, len(records))
+
+    return {
+        'musicians': np.asarray(musicians, dtype=object),
+        'records': np.asarray(records, dtype=object),
+        'musician_index': {name: i for i, name in enumerate(musicians)},
+        'musician_records': {'indptr': musician_indptr, 'indices': musician_records},
+        'record_musicians': {'indptr': record_indptr, 'indices': record_musicians},
+    }
+
+
+def _expand(graph, frontier):
+    """
+    One hop from a musician frontier: musicians -> records -> musicians.
+
+    Returns:
+        Tuple of (musicians, via_record, from_musician) arrays, one entry per
+        musician reached (first record and predecessor found)
+    """
+    m2r = graph['musician_records']
+    r2m = graph['record_musicians']
+
+    positions = row_positions(m2r['indptr'], frontier)
+    records = m2r['indices'][positions]
+    record_parent = np.repeat(frontier, m2r['indptr'][frontier + 1] - m2r['indptr'][frontier])
+    records, first = np.unique(records, return_index=True)
+    record_parent = record_parent[first]
+
+    positions = row_positions(r2m['indptr'], records)
+    musicians = r2m['indices'][positions]
+    counts = r2m['indptr'][records + 1] - r2m['indptr'][records]
+    via_record = np.repeat(records, counts)
+    from_musician = np.repeat(record_parent, counts)
+    musicians, first = np.unique(musicians, return_index=True)
+    return musicians, via_record[first], from_musician[first]
+
+
+def _trace(parent_musician, parent_record, node):
+    """Follow parent pointers back to the search origin."""
+    musicians = [node]
+    records = []
+    while parent_musician[node] >= 0:
+        records.append(parent_record[node])
+        node = parent_musician[node]
+        musicians.append(node)
+    return musicians, records
+
+
+def shortest_path(graph, source, target):
+    """
+    Find the shortest chain of shared records between two musicians.
+
+    Bidirectional breadth-first search over the bipartite graph: each step
+    expands whole musician layers from the side with the smaller frontier,
+    and stops at the first layer where the two searches meet.
+
+    Args:
+        graph: Dictionary from build_record_graph
+        source: Musician name
+        target: Musician name
+
+    Returns:
+        Dictionary with source, target, distance (number of records in the
+        chain), musicians (the chain, source first) and records (records[i]
+        connects musicians[i] and musicians[i + 1]); None if the two are not
+        connected. Raises KeyError for unknown musicians.
+    """
+    index = graph['musician_index']
+    start, goal = index[source], index[target]
+    names = graph['musicians']
+    labels = graph['records']
+    if start == goal:
+        return {'source': source, 'target': target, 'distance': 0, 'musicians': [source], 'records': []}
+
+    n_musicians = len(names)
+    sides = []
+    for origin in (start, goal):
+        distance = np.full(n_musicians, -1, dtype=np.int64)
+        distance[origin] = 0
+        sides.append({
+            'distance': distance,
+            'parent_musician': np.full(n_musicians, -1, dtype=np.int64),
+            'parent_record': np.full(n_musicians, -1, dtype=np.int64),
+            'frontier': np.array([origin], dtype=np.int64),
+            'depth': 0,
+        })
+
+    while len(sides[0]['frontier']) and len(sides[1]['frontier']):
+        # Expand the cheaper side
+        side_index = 0 if len(sides[0]['frontier']) <= len(sides[1]['frontier']) else 1
+        side, other = sides[side_index], sides[1 - side_index]
+
+        musicians, via_record, from_musician = _expand(graph, side['frontier'])
+        new = side['distance'][musicians] < 0
+        musicians, via_record, from_musician = musicians[new], via_record[new], from_musician[new]
+
+        side['depth'] += 1
+        side['distance'][musicians] = side['depth']
+        side['parent_musician'][musicians] = from_musician
+        side['parent_record'][musicians] = via_record
+        side['frontier'] = musicians
+
+        met = musicians[other['distance'][musicians] >= 0]
+        if len(met):
+            meeting = met[np.argmin(other['distance'][met])]
+            forward, forward_records = _trace(sides[0]['parent_musician'], sides[0]['parent_record'], meeting)
+            backward, backward_records = _trace(sides[1]['parent_musician'], sides[1]['parent_record'], meeting)
+            chain = forward[::-1] + backward[1:]
+            chain_records = forward_records[::-1] + backward_records
+            return {
+                'source': source,
+                'target': target,
+                'distance': len(chain_records),
+                'musicians': [names[i] for i in chain],
+                'records': [labels[i] for i in chain_records],
+            }
+
+    return None
+
+
+def _distances_from(graph, origin):
+    """Record-hop distances from one musician to every musician."""
+    distance = np.full(len(graph['musicians']), UNREACHABLE, dtype=np.uint16)
+    distance[origin] = 0
+    frontier = np.array([origin], dtype=np.int64)
+    depth = 0
+    while len(frontier):
+        depth += 1
+        musicians, _, _ = _expand(graph, frontier)
+        frontier = musicians[distance[musicians] == UNREACHABLE]
+        distance[frontier] = depth
+    return distance
+
+
+def build_landmark_distances(graph, n_landmarks=16):
+    """
+    Precompute distances from landmark musicians to every musician.
+
+    Landmarks are the musicians credited on the most records, which sit on
+    many shortest paths. The table allows distance estimates between any
+    two musicians without a search (see estimate_distances).
+
+    Args:
+        graph: Dictionary from build_record_graph
+        n_landmarks: Number of landmarks
+
+    Returns:
+        Dictionary with landmarks (musician rows) and distances
+        (n_landmarks x n_musicians uint16 array, UNREACHABLE where unreachable)
+    """
+    degrees = np.diff(graph['musician_records']['indptr'])
+    landmarks = np.argsort(-degrees, kind='stable')[:n_landmarks]
+    distances = np.stack([_distances_from(graph, landmark) for landmark in landmarks]) if len(landmarks) \
+        else np.empty((0, len(degrees)), dtype=np.uint16)
+    return {'landmarks': landmarks, 'distances': distances}
+
+
+def estimate_distances(graph, landmark_distances, sources, targets):
+    """
+    Bound the record-hop distance between many musician pairs at once.
+
+    Through any landmark L, d(a, L) + d(L, b) is an upper bound and
+    |d(a, L) - d(L, b)| a lower bound; the tightest over all landmarks is
+    returned. Pairs that no shared landmark reaches get -1 for both bounds.
+
+    Args:
+        graph: Dictionary from build_record_graph
+        landmark_distances: Dictionary from build_landmark_distances
+        sources: Musician names
+        targets: Musician names (same length as sources)
+
+    Returns:
+        Tuple of (lower, upper) integer arrays
+    """
+    index = graph['musician_index']
+    a = np.fromiter((index[name] for name in sources), dtype=np.int64)
+    b = np.fromiter((index[name] for name in targets), dtype=np.int64)
+    distances = landmark_distances['distances'].astype(np.int64)
+    to_a = distances[:, a]
+    to_b = distances[:, b]
+
+    both = (to_a != UNREACHABLE) & (to_b != UNREACHABLE)
+    upper = np.where(both, to_a + to_b, np.iinfo(np.int64).max).min(axis=0, initial=np.iinfo(np.int64).max)
+    lower = np.where(both, np.abs(to_a - to_b), 0).max(axis=0, initial=0)
+
+    reachable = both.any(axis=0)
+    upper = np.where(reachable, upper, -1)
+    lower = np.where(reachable, lower, -1)
+    same = a == b
+    return np.where(same, 0, lower), np.where(same, 0, upper)
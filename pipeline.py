@@ -0,0 +1,262 @@
+"""
+Stage scheduler module for musician network analysis.
+Runs pipeline stages as soon as the values they depend on are ready, on a
+thread or process pool, and records how long each stage took. Stage results
+can be memoized on disk under a hash of their inputs, settings and code, so
+a re-run only recomputes the stages a change actually affects.
+"""
+
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+import time
+from collections import namedtuple
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from pathlib import Path
+
+
+# A stage calls function with the named input values (in order) and stores
+# its result under the output names; with several outputs the function
+# returns a tuple. For process pools, function must be picklable (a
+# module-level function or a functools.partial of one).
+#
+# config lists the settings the stage reads; with a stage cache, they are
+# part of the stage's cache key. Stages with side effects (writing files)
+# set cache=False and always run.
+Stage = namedtuple('Stage', ['name', 'function', 'inputs', 'outputs', 'config', 'cache'], defaults=((), True))
+
+EXECUTORS = {'thread': ThreadPoolExecutor, 'process': ProcessPoolExecutor}
+
+
+def file_digest(path, chunk_size=1 << 20):
+    """SHA-256 hex digest of a file's contents."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def source_version(directory, exclude=('config.py',)):
+    """
+    Code version of a source tree: a digest of its Python files.
+
+    Settings files are excluded, since stages declare the settings they read.
+    """
+    digest = hashlib.sha256()
+    for path in sorted(Path(directory).glob('*.py')):
+        if path.name not in exclude:
+            digest.update(path.name.encode())
+            digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+def open_stage_cache(directory, settings, code_version, max_entries=4):
+    """
+    Create an on-disk stage cache for run_stages.
+
+    Each cached stage result is stored under a key hashed from the stage
+    name, the code version, the values of the stage's config settings and
+    the digests of its inputs. Output digests are derived from the key, so
+    a changed input invalidates every stage downstream of it, and nothing
+    else. Initial values are only cached through if the caller adds their
+    digest (e.g. file_digest of an input file) to cache['digests'].
+
+    Each stage keeps its max_entries most recently used results, so
+    alternating between a few inputs or settings stays cached.
+
+    Args:
+        directory: Directory holding the cached results
+        settings: Object whose attributes are the stage config settings
+        code_version: String from source_version
+        max_entries: Number of cached results kept per stage
+
+    Returns:
+        Dictionary with directory, settings, code_version, max_entries and
+        digests (value name -> digest, filled in as stages run)
+    """
+    return {
+        'directory': Path(directory),
+        'settings': settings,
+        'code_version': code_version,
+        'max_entries': max_entries,
+        'digests': {},
+    }
+
+
+def _stage_key(stage, cache):
+    """Cache key of a stage, or None if it cannot be cached."""
+    digests = cache['digests']
+    if not stage.cache or any(name not in digests for name in stage.inputs):
+        return None
+    description = {
+        'stage': stage.name,
+        'code': cache['code_version'],
+        'config': {key: repr(getattr(cache['settings'], key)) for key in stage.config},
+        'inputs': [digests[name] for name in stage.inputs],
+    }
+    return hashlib.sha256(json.dumps(description, sort_keys=True).encode()).hexdigest()
+
+
+def _cache_path(cache, stage, key):
+    return cache['directory'] / f"{stage.name}-{key[:24]}.pkl"
+
+
+def _load_cached(path):
+    """
+    Return (True, result) for a readable cache entry, else (False, None).
+
+    A hit refreshes the entry's modification time, which orders entries
+    by last use when old ones are pruned.
+    """
+    try:
+        with open(path, 'rb') as f:
+            result = pickle.load(f)
+    except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError):
+        return False, None
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+    return True, result
+
+
+def _save_cached(cache, stage, key, result):
+    """
+    Write a stage result, pruning the stage's least recently used entries
+    beyond cache['max_entries'].
+
+    A result that cannot be written is simply not cached.
+    """
+    directory = cache['directory']
+    path = _cache_path(cache, stage, key)
+    try:
+        directory.mkdir(parents=True, exist_ok=True)
+        older = sorted(
+            (entry for entry in directory.glob(f"{stage.name}-*.pkl") if entry != path),
+            key=lambda entry: entry.stat().st_mtime_ns, reverse=True
+        )
+        for old in older[max(cache['max_entries'] - 1, 0):]:
+            old.unlink(missing_ok=True)
+        # Write atomically so an interrupted run never leaves a truncated entry
+        fd, tmp = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(result, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+    except (OSError, pickle.PicklingError):
+        pass
+
+
+def _run_timed(function, args):
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+
+def _store_outputs(stage, result, values):
+    if len(stage.outputs) == 1:
+        values[stage.outputs[0]] = result
+    else:
+        values.update(zip(stage.outputs, result))
+
+
+def run_stages(stages, values=None, jobs=1, executor='thread', on_stage_done=None, cache=None):
+    """
+    Run stages in dependency order, independent stages concurrently.
+
+    Args:
+        stages: List of Stage tuples
+        values: Dictionary of initial values available as stage inputs
+        jobs: Number of workers; 1 runs every stage in the calling thread
+        executor: 'thread' or 'process' pool for jobs > 1
+        on_stage_done: Optional callback(stage name, seconds, cached), called
+                       in the calling thread as each stage finishes
+        cache: Optional stage cache from open_stage_cache; stages whose key
+               is found there are loaded instead of run
+
+    Returns:
+        Tuple of (dictionary of all values, dictionary of stage name -> seconds)
+    """
+    if executor not in EXECUTORS:
+        raise ValueError(f"Unknown executor '{executor}' (expected one of {', '.join(EXECUTORS)})")
+
+    values = dict(values or {})
+    timings = {}
+    pending = list(stages)
+
+    def ready_stages():
+        ready = [stage for stage in pending if all(name in values for name in stage.inputs)]
+        for stage in ready:
+            pending.remove(stage)
+        return ready
+
+    keys = {}
+
+    def finish(stage, result, seconds, cached=False):
+        _store_outputs(stage, result, values)
+        timings[stage.name] = seconds
+        key = keys.get(stage.name)
+        if key:
+            if not cached:
+                _save_cached(cache, stage, key, result)
+            for name in stage.outputs:
+                cache['digests'][name] = hashlib.sha256(f"{key}:{name}".encode()).hexdigest()
+        if on_stage_done:
+            on_stage_done(stage.name, seconds, cached)
+
+    def from_cache(stage):
+        """Finish a stage from the cache; False if it has to run."""
+        if cache is None:
+            return False
+        key = keys[stage.name] = _stage_key(stage, cache)
+        if key is None:
+            return False
+        start = time.perf_counter()
+        found, result = _load_cached(_cache_path(cache, stage, key))
+        if found:
+            finish(stage, result, time.perf_counter() - start, cached=True)
+        return found
+
+    def unresolved():
+        missing = sorted({name for stage in pending for name in stage.inputs if name not in values})
+        return ValueError(
+            f"Stages {', '.join(stage.name for stage in pending)} wait on values no stage "
+            f"produces: {', '.join(missing)}"
+        )
+
+    if jobs <= 1:
+        while pending:
+            ready = ready_stages()
+            if not ready:
+                raise unresolved()
+            for stage in ready:
+                if not from_cache(stage):
+                    finish(stage, *_run_timed(stage.function, [values[name] for name in stage.inputs]))
+        return values, timings
+
+    with EXECUTORS[executor](max_workers=jobs) as pool:
+        running = {}
+        while pending or running:
+            # Cache hits finish at once and can make further stages ready
+            ready = ready_stages()
+            while ready:
+                for stage in ready:
+                    if not from_cache(stage):
+                        args = [values[name] for name in stage.inputs]
+                        running[pool.submit(_run_timed, stage.function, args)] = stage
+                ready = ready_stages()
+            if not running:
+                if not pending:
+                    break
+                raise unresolved()
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                finish(running.pop(future), *future.result())
+
+    return values, timings
@@ -0,0 +1,406 @@
+"""
+Query server module for musician network analysis.
+Serves JSON queries over the processed network from memory using asyncio.
+"""
+
+import asyncio
+import json
+from collections import OrderedDict, defaultdict
+from urllib.parse import urlsplit, parse_qs
+
+import numpy as np
+
+from analysis import build_metric_ranks, get_top_musicians_by_metric, search_musicians, get_collaboration_stats
+from data_processor import attribute_bits, link_attribute_mask
+from graph_metrics import build_ego_index, ego_network
+from paths import build_record_graph, shortest_path
+from similarity import similar_musicians
+
+
+def _json_default(value):
+    """Convert NumPy scalars and arrays for JSON encoding."""
+    if isinstance(value, np.integer):
+        return int(value)
+    if isinstance(value, np.floating):
+        return float(value)
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, (set, frozenset)):
+        return sorted(value)
+    return str(value)
+
+
+class QueryError(Exception):
+    """Error returned to the client with an HTTP status code."""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class NetworkQueryServer:
+    """
+    In-memory query engine and HTTP server over the processed network.
+
+    The network, statistics and lookup indexes are built once at start-up;
+    each request is answered from them and the encoded response is kept in
+    an LRU cache keyed by path and query string. Musician names merged by
+    entity resolution are looked up under any of their spellings.
+    """
+
+    def __init__(self, network_df, musician_stats_df, network_data, cache_size=256, ego_max_nodes=500,
+                 similarity_index=None, similarity_limit=10, metric_ranks=None, aliases_df=None,
+                 ego_max_depth=3, similarity_max_k=100):
+        self.network_df = network_df
+        self.musician_stats_df = musician_stats_df
+        self.metric_ranks = metric_ranks if metric_ranks is not None else build_metric_ranks(musician_stats_df)
+        self.network_data = network_data
+        self.cache_size = cache_size
+        self.cache = OrderedDict()
+        self.ego_max_nodes = ego_max_nodes
+        self.ego_max_depth = ego_max_depth
+        self.similarity_index = similarity_index
+        self.similarity_limit = similarity_limit
+        self.similarity_max_k = similarity_max_k
+        self.canonical_names = {} if aliases_df is None else {
+            alias: canonical for alias, canonical in zip(aliases_df['alias'], aliases_df['canonical'])
+            if alias != canonical
+        }
+
+        # Row indexes for musician lookups
+        self.musician_rows = network_df.groupby('musician').indices
+        self.album_rows = network_df.groupby('album').indices
+        self.stats_by_musician = {
+            row['musician']: row for row in musician_stats_df.to_dict('records')
+        }
+
+        # Link indexes for subgraph queries
+        self.nodes_by_id = {node['id']: node for node in network_data['nodes']}
+        self.links_by_role = defaultdict(list)
+        self.links_by_node = defaultdict(list)
+        for i, link in enumerate(network_data['links']):
+            for role in set(link['roles']) | set(link['clean_roles']):
+                self.links_by_role[role].append(i)
+            self.links_by_node[link['source']].append(i)
+            self.links_by_node[link['target']].append(i)
+        # Genre/style bitsets per node; a link's genres/styles are its artist's
+        self.attribute_index = {
+            key: {value: i for i, value in enumerate(network_data[key])} for key in ('genres', 'styles')
+        }
+        self.attribute_bits = {
+            key: {node['id']: attribute_bits(node.get(key, [])) for node in network_data['nodes']}
+            for key in ('genres', 'styles')
+        }
+        self.ego_index = build_ego_index(network_data)
+        self.record_graph = build_record_graph(network_df)
+
+        self.routes = {
+            '/stats': self.query_stats,
+            '/musician': self.query_musician,
+            '/search': self.query_search,
+            '/top': self.query_top,
+            '/subgraph': self.query_subgraph,
+            '/ego': self.query_ego,
+            '/path': self.query_path,
+            '/similar': self.query_similar,
+        }
+
+    # Query handlers
+
+    def query_stats(self, params):
+        """General collaboration statistics."""
+        return get_collaboration_stats(self.network_df)
+
+    def query_musician(self, params):
+        """Detailed information for one musician, as get_musician_debug_info."""
+        name = self._canonical(_require(params, 'name'))
+        if name not in self.musician_rows:
+            raise QueryError(404, f"Musician '{name}' not found")
+
+        musician_data = self.network_df.iloc[self.musician_rows[name]]
+        albums = musician_data['album'].unique().tolist()
+
+        # Collaborators: other musicians on the same albums
+        collaborators = set()
+        musician_column = self.network_df['musician'].to_numpy()
+        for album in albums:
+            collaborators.update(musician_column[self.album_rows[album]])
+        collaborators.discard(name)
+
+        return {
+            'musician': name,
+            'albums': albums,
+            'collaborators': sorted(collaborators),
+            'roles': musician_data['role'].unique().tolist(),
+            'stats': self.stats_by_musician.get(name, {}),
+            'total_records': len(albums),
+            'total_collaborators': len(collaborators)
+        }
+
+    def query_search(self, params):
+        """Search musicians by name."""
+        term = _require(params, 'q')
+        limit = _int_param(params, 'limit', 10)
+        return search_musicians(self.musician_stats_df, term, limit).to_dict('records')
+
+    def query_top(self, params):
+        """Top musicians by a statistics column; offset pages through the ranking."""
+        metric = params.get('metric', 'total_records')
+        if metric not in self.metric_ranks:
+            raise QueryError(400, f"Unknown metric '{metric}'")
+        limit = _int_param(params, 'limit', 20)
+        offset = _int_param(params, 'offset', 0)
+        if limit < 0 or offset < 0:
+            raise QueryError(400, "Parameters 'limit' and 'offset' must not be negative")
+        return get_top_musicians_by_metric(
+            self.musician_stats_df, metric, limit, offset, self.metric_ranks
+        ).to_dict('records')
+
+    def query_subgraph(self, params):
+        """
+        Filtered subgraph of the network.
+
+        Supported filters: role, genre and style (of the link's artist), node
+        (links touching a musician or artist), min_value, and column/value for
+        custom columns.
+        """
+        links = self.network_data['links']
+
+        if 'role' in params:
+            candidates = self.links_by_role.get(params['role'], [])
+        elif 'node' in params:
+            candidates = self.links_by_node.get(params['node'], [])
+        else:
+            candidates = range(len(links))
+
+        # Bit masks of the requested genre and style (0 matches nothing)
+        masks = {}
+        for key, param in (('genres', 'genre'), ('styles', 'style')):
+            if params.get(param):
+                position = self.attribute_index[key].get(params[param])
+                masks[key] = 0 if position is None else 1 << position
+        node = params.get('node')
+        min_value = _int_param(params, 'min_value', 1)
+        column = params.get('column')
+        value = params.get('value')
+        if column and value is None:
+            raise QueryError(400, "Parameter 'value' is required with 'column'")
+        if column:
+            # Unknown columns match no links
+            attribute = self.network_data.get('link_attributes', {}).get(column)
+            column_mask = link_attribute_mask(attribute, [value]) if attribute else np.zeros(len(links), bool)
+
+        selected = []
+        for i in candidates:
+            link = links[i]
+            if link['value'] < min_value:
+                continue
+            if any(not self.attribute_bits[key][link['target']] & mask for key, mask in masks.items()):
+                continue
+            if node and node not in (link['source'], link['target']):
+                continue
+            if column and not column_mask[i]:
+                continue
+            selected.append(link)
+
+        limit = _int_param(params, 'limit', 2000)
+        if limit < 0:
+            raise QueryError(400, "Parameter 'limit' must not be negative")
+        truncated = len(selected) > limit
+        selected = sorted(selected, key=lambda link: link['value'], reverse=True)[:limit]
+
+        node_ids = set()
+        for link in selected:
+            node_ids.add(link['source'])
+            node_ids.add(link['target'])
+
+        return {
+            'nodes': [self._node_record(self.nodes_by_id[node_id]) for node_id in sorted(node_ids)],
+            'links': selected,
+            'truncated': truncated
+        }
+
+    def query_ego(self, params):
+        """k-hop ego network around a musician or artist, capped by a depth and node budget."""
+        node = self._canonical(_require(params, 'node'))
+        depth = _int_param(params, 'depth', 2)
+        if depth < 0:
+            raise QueryError(400, "Parameter 'depth' must not be negative")
+        depth = min(depth, self.ego_max_depth)
+        max_nodes = min(_int_param(params, 'max_nodes', self.ego_max_nodes), self.ego_max_nodes)
+        try:
+            ego = ego_network(self.network_data, node, depth, max_nodes, self.ego_index)
+        except KeyError:
+            raise QueryError(404, f"Node '{node}' not found") from None
+        ego['nodes'] = [self._node_record(record) for record in ego['nodes']]
+        return ego
+
+    def query_path(self, params):
+        """Shortest chain of shared records between two musicians."""
+        source = self._canonical(_require(params, 'from'))
+        target = self._canonical(_require(params, 'to'))
+        for name in (source, target):
+            if name not in self.record_graph['musician_index']:
+                raise QueryError(404, f"Musician '{name}' not found")
+        path = shortest_path(self.record_graph, source, target)
+        if path is None:
+            return {'source': source, 'target': target, 'distance': None, 'musicians': [], 'records': []}
+        return path
+
+    def query_similar(self, params):
+        """Musicians with similar collaborators, roles and genres/styles (MinHash LSH)."""
+        if self.similarity_index is None:
+            raise QueryError(404, "Similarity index not available")
+        name = self._canonical(_require(params, 'name'))
+        k = _int_param(params, 'k', self.similarity_limit)
+        if k < 0:
+            raise QueryError(400, "Parameter 'k' must not be negative")
+        k = min(k, self.similarity_max_k)
+        try:
+            neighbours = similar_musicians(self.similarity_index, name, k)
+        except KeyError:
+            raise QueryError(404, f"Musician '{name}' not found") from None
+        return {
+            'musician': name,
+            'similar': [{'musician': musician, 'similarity': score} for musician, score in neighbours]
+        }
+
+    def _canonical(self, name):
+        """Canonical spelling of a musician name merged by entity resolution."""
+        return self.canonical_names.get(name, name)
+
+    def _node_record(self, node):
+        """Node with its genre and style indices replaced by names."""
+        return dict(node, **{
+            key: [self.network_data[key][i] for i in node[key]] for key in ('genres', 'styles') if key in node
+        })
+
+    # Request handling
+
+    def dispatch(self, target):
+        """
+        Answer one request target (path plus query string).
+
+        Returns:
+            Tuple of (HTTP status, encoded JSON body)
+        """
+        cached = self.cache.get(target)
+        if cached is not None:
+            self.cache.move_to_end(target)
+            return cached
+
+        url = urlsplit(target)
+        params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        handler = self.routes.get(url.path.rstrip('/') or '/')
+
+        try:
+            if handler is None:
+                raise QueryError(404, f"Unknown endpoint '{url.path}'")
+            response = (200, _encode(handler(params)))
+        except QueryError as e:
+            # Errors are not cached so transient lookups can be retried
+            return e.status, _encode({'error': str(e)})
+        except Exception as e:
+            # A failing handler still gets an HTTP response instead of a dropped connection
+            return 500, _encode({'error': f"Internal error: {type(e).__name__}: {e}"})
+
+        self.cache[target] = response
+        if len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+        return response
+
+    async def handle_connection(self, reader, writer):
+        """Read one HTTP request from the stream and write the JSON response."""
+        try:
+            request_line = await reader.readline()
+            while True:
+                header = await reader.readline()
+                if header in (b'\r\n', b'\n', b''):
+                    break
+
+            parts = request_line.decode('latin-1').split()
+            if len(parts) < 2:
+                status, body = 400, _encode({'error': 'Malformed request'})
+            elif parts[0] != 'GET':
+                status, body = 405, _encode({'error': 'Only GET is supported'})
+            else:
+                status, body = self.dispatch(parts[1])
+
+            writer.write(_http_response(status, body))
+            await writer.drain()
+        finally:
+            writer.close()
+
+    async def serve(self, host, port):
+        """Serve requests until cancelled."""
+        server = await asyncio.start_server(self.handle_connection, host, port)
+        async with server:
+            await server.serve_forever()
+
+
+_STATUS_TEXT = {
+    200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed', 500: 'Internal Server Error'
+}
+
+
+def _http_response(status, body):
+    """Build a complete HTTP/1.1 response for a JSON body."""
+    head = (
+        f"HTTP/1.1 {status} {_STATUS_TEXT.get(status, 'Error')}\r\n"
+        "Content-Type: application/json; charset=utf-8\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        "Access-Control-Allow-Origin: *\r\n"
+        "Connection: close\r\n"
+        "\r\n"
+    )
+    return head.encode('latin-1') + body
+
+
+def _encode(payload):
+    return json.dumps(payload, default=_json_default).encode('utf-8')
+
+
+def _require(params, name):
+    if name not in params or not params[name]:
+        raise QueryError(400, f"Parameter '{name}' is required")
+    return params[name]
+
+
+def _int_param(params, name, default):
+    try:
+        return int(params.get(name, default))
+    except ValueError:
+        raise QueryError(400, f"Parameter '{name}' must be an integer") from None
+
+
+def run_server(network_df, musician_stats_df, network_data, host='127.0.0.1', port=8765, cache_size=256,
+               ego_max_nodes=500, similarity_index=None, similarity_limit=10, metric_ranks=None,
+               aliases_df=None, ego_max_depth=3, similarity_max_k=100):
+    """
+    Build the query indexes and serve the HTTP API until interrupted.
+
+    Args:
+        network_df: DataFrame from create_network_data
+        musician_stats_df: DataFrame from analyze_top_musicians
+        network_data: Dictionary from create_echarts_network_data
+        host: Interface to bind
+        port: Port to listen on
+        cache_size: Number of responses kept in the request cache
+        ego_max_nodes: Largest node budget accepted by /ego
+        similarity_index: Dictionary from similarity.build_similarity_index (enables /similar)
+        similarity_limit: Default number of neighbours returned by /similar
+        metric_ranks: Dictionary from analysis.build_metric_ranks (built if
+                      not given); the metrics /top accepts
+        aliases_df: DataFrame from entity_resolution.resolve_names; name
+                    variants in queries resolve to their canonical musician
+        ego_max_depth: Deepest neighbourhood returned by /ego
+        similarity_max_k: Most neighbours returned by /similar
+    """
+    query_server = NetworkQueryServer(
+        network_df, musician_stats_df, network_data, cache_size, ego_max_nodes,
+        similarity_index, similarity_limit, metric_ranks, aliases_df, ego_max_depth, similarity_max_k
+    )
+    try:
+        asyncio.run(query_server.serve(host, port))
+    except KeyboardInterrupt:
+        pass
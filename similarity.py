@@ -0,0 +1,254 @@
+"""
+Musician similarity module for musician network analysis.
+Builds MinHash signatures of each musician's collaborators, roles and
+genres/styles, indexes them with LSH banding, and answers approximate
+"similar musicians" queries.
+"""
+
+import numpy as np
+import pandas as pd
+
+from data_processor import build_artist_info, clean_role_name
+from graph_metrics import csr_from_pairs
+
+
+# Feature groups compared separately; a musician's similarity is the mean of
+# the per-group Jaccard estimates
+FEATURE_GROUPS = ('artists', 'roles', 'scene')
+
+MERSENNE_PRIME = (1 << 31) - 1
+EMPTY_SLOT = np.iinfo(np.uint32).max   # Signature value of an empty set
+_BAND_MULTIPLIER = np.uint64(0x9E3779B97F4A7C15)
+
+
+def build_feature_sets(network_df, collection_df):
+    """
+    Build each musician's feature sets as sparse rows.
+
+    Groups:
+        artists: main artists the musician played with
+        roles: cleaned role names
+        scene: genres and styles of those main artists
+
+    Args:
+        network_df: DataFrame from create_network_data
+        collection_df: Original collection DataFrame
+
+    Returns:
+        Tuple of (array of musician names, dictionary of group -> (indptr, indices))
+    """
+    musician_codes, musicians = pd.factorize(network_df['musician'])
+    artist_info = build_artist_info(collection_df)
+
+    group_tokens = {
+        'artists': (musician_codes, network_df['main_artist'].astype(str).to_numpy()),
+        'roles': (musician_codes, network_df['role'].map(clean_role_name).astype(str).to_numpy()),
+    }
+
+    pairs = pd.DataFrame({'musician': musician_codes, 'artist': network_df['main_artist']}).drop_duplicates()
+    scene = pairs.assign(tag=pairs['artist'].map(
+        lambda artist: [f"genre:{g}" for g in artist_info.get(artist, {}).get('genres', [])] +
+                       [f"style:{s}" for s in artist_info.get(artist, {}).get('styles', [])]
+    )).explode('tag').dropna(subset=['tag'])
+    group_tokens['scene'] = (scene['musician'].to_numpy(), scene['tag'].to_numpy())
+
+    features = {}
+    for group in FEATURE_GROUPS:
+        rows, tokens = group_tokens[group]
+        token_codes, _ = pd.factorize(tokens)
+        features[group] = csr_from_pairs(np.asarray(rows, dtype=np.int64), token_codes.astype(np.int64), len(musicians))
+
+    return np.asarray(musicians, dtype=object), features
+
+
+def minhash_signatures(indptr, indices, num_perm=64, seed=42, chunk_size=16):
+    """
+    Compute MinHash signatures for the sets stored as CSR rows.
+
+    Uses universal hashing h(x) = (a * x + b) mod p, evaluated for a chunk
+    of hash functions at a time over every set element, with a per-row
+    minimum via np.minimum.reduceat.
+
+    Args:
+        indptr, indices: CSR rows of integer set elements
+        num_perm: Number of hash functions
+        seed: Random seed for the hash parameters
+        chunk_size: Hash functions evaluated per pass (bounds memory)
+
+    Returns:
+        (n_rows x num_perm) uint32 array; rows of empty sets are EMPTY_SLOT
+    """
+    rng = np.random.default_rng(seed)
+    a = rng.integers(1, MERSENNE_PRIME, num_perm, dtype=np.int64)
+    b = rng.integers(0, MERSENNE_PRIME, num_perm, dtype=np.int64)
+
+    n_rows = len(indptr) - 1
+    signatures = np.full((n_rows, num_perm), EMPTY_SLOT, dtype=np.uint32)
+    nonempty = np.flatnonzero(np.diff(indptr) > 0)
+    if len(nonempty) == 0:
+        return signatures
+
+    elements = np.asarray(indices, dtype=np.int64)[:, None]
+    starts = indptr[nonempty]
+    for lo in range(0, num_perm, chunk_size):
+        hi = min(lo + chunk_size, num_perm)
+        hashes = (elements * a[None, lo:hi] + b[None, lo:hi]) % MERSENNE_PRIME
+        signatures[nonempty, lo:hi] = np.minimum.reduceat(hashes, starts, axis=0)
+    return signatures
+
+
+def _band_keys(signatures, band_rows):
+    """Hash each band of band_rows signature columns to one uint64 key."""
+    n_rows, n_columns = signatures.shape
+    bands = signatures[:, :n_columns - n_columns % band_rows].reshape(n_rows, -1, band_rows).astype(np.uint64)
+    keys = np.zeros(bands.shape[:2], dtype=np.uint64)
+    for column in range(band_rows):
+        keys = keys * _BAND_MULTIPLIER + bands[:, :, column]
+    return keys
+
+
+def _index_bands(signatures, group_slices, empty, band_rows):
+    """Sorted LSH band keys per group and band, leaving out empty sets."""
+    bands = []
+    for g, group in enumerate(group_slices):
+        members = np.flatnonzero(~empty[:, g])
+        keys = _band_keys(signatures[members, group], band_rows)
+        for band in range(keys.shape[1]):
+            order = np.argsort(keys[:, band], kind='stable')
+            bands.append((g, band, keys[order, band], members[order]))
+    return bands
+
+
+def _make_index(musicians, signatures, group_sizes, band_rows):
+    bounds = np.cumsum([0] + list(group_sizes))
+    group_slices = [slice(int(lo), int(hi)) for lo, hi in zip(bounds[:-1], bounds[1:])]
+    empty = np.stack([signatures[:, group.start] == EMPTY_SLOT for group in group_slices], axis=1)
+    return {
+        'musicians': np.asarray(musicians, dtype=object),
+        'musician_index': {name: i for i, name in enumerate(musicians)},
+        'signatures': signatures,
+        'group_sizes': list(group_sizes),
+        'group_slices': group_slices,
+        'band_rows': band_rows,
+        'empty': empty,
+        'bands': _index_bands(signatures, group_slices, empty, band_rows),
+    }
+
+
+def build_similarity_index(network_df, collection_df, num_perm=64, band_rows=4, seed=42):
+    """
+    Build a MinHash LSH index over musician feature sets.
+
+    Each feature group gets its own block of num_perm signature columns.
+    LSH bands never cross groups, and musicians with an empty group are left
+    out of that group's bands, so a missing genre list does not make every
+    such musician a candidate for every other.
+
+    Args:
+        network_df: DataFrame from create_network_data
+        collection_df: Original collection DataFrame
+        num_perm: Hash functions per feature group
+        band_rows: Signature columns per LSH band; fewer rows surface less
+                   similar candidates at the cost of more of them
+        seed: Random seed for the hash functions
+
+    Returns:
+        Dictionary with musicians, musician_index, signatures and the LSH bands
+    """
+    musicians, features = build_feature_sets(network_df, collection_df)
+    blocks = [
+        minhash_signatures(*features[group], num_perm=num_perm, seed=seed + i)
+        for i, group in enumerate(FEATURE_GROUPS)
+    ]
+    return _make_index(musicians, np.hstack(blocks), [num_perm] * len(blocks), band_rows)
+
+
+def _estimate_similarity(index, row, candidates):
+    """Mean per-group Jaccard estimate between one musician and candidate musicians."""
+    signatures = index['signatures']
+    empty = index['empty']
+    total = np.zeros(len(candidates))
+    for g, group in enumerate(index['group_slices']):
+        matches = (signatures[candidates, group] == signatures[row, group]).mean(axis=1)
+        # An empty set shares nothing with anything
+        matches[empty[candidates, g] | empty[row, g]] = 0.0
+        total += matches
+    return total / len(index['group_slices'])
+
+
+def similar_musicians(index, musician, k=10):
+    """
+    Find the musicians most similar to one musician.
+
+    Candidates are the musicians sharing at least one LSH band with the
+    query; they are ranked by the estimated similarity over all signature
+    columns, so only candidates are ever compared.
+
+    Args:
+        index: Dictionary from build_similarity_index
+        musician: Musician name
+        k: Number of neighbours
+
+    Returns:
+        List of (musician, estimated similarity) tuples, most similar first.
+        Raises KeyError for unknown musicians.
+    """
+    row = index['musician_index'][musician]
+    signatures = index['signatures']
+    query_keys = [
+        _band_keys(signatures[row:row + 1, group], index['band_rows'])[0]
+        for group in index['group_slices']
+    ]
+
+    found = []
+    for g, band, keys, members in index['bands']:
+        if index['empty'][row, g]:
+            continue
+        key = query_keys[g][band]
+        lo = np.searchsorted(keys, key, side='left')
+        hi = np.searchsorted(keys, key, side='right')
+        found.append(members[lo:hi])
+
+    candidates = np.unique(np.concatenate(found)) if found else np.empty(0, dtype=np.int64)
+    candidates = candidates[candidates != row]
+    if len(candidates) == 0:
+        return []
+
+    scores = _estimate_similarity(index, row, candidates)
+    top = np.argsort(-scores, kind='stable')[:k]
+    return [(index['musicians'][candidates[i]], float(scores[i])) for i in top]
+
+
+def save_similarity_index(index, path):
+    """
+    Write the signatures and parameters to a compressed .npz file.
+
+    Returns:
+        path
+    """
+    np.savez_compressed(
+        path,
+        musicians=np.asarray(index['musicians'], dtype=str),
+        signatures=index['signatures'],
+        group_sizes=np.asarray(index['group_sizes']),
+        band_rows=np.asarray(index['band_rows'])
+    )
+    return path
+
+
+def load_similarity_index(path):
+    """
+    Load an index written by save_similarity_index.
+
+    The LSH bands are rebuilt from the stored signatures.
+
+    Returns:
+        Dictionary as from build_similarity_index
+    """
+    with np.load(path, allow_pickle=False) as data:
+        return _make_index(
+            data['musicians'].tolist(),
+            data['signatures'],
+            data['group_sizes'].tolist(),
+            int(data['band_rows'])
+        )
@@ -0,0 +1,295 @@
+"""
+Persistent SQLite store for musician network analysis.
+Saves the parsed connections, artist information and musician statistics
+to an indexed SQLite database and answers analysis queries against it.
+"""
+
+import sqlite3
+
+import pandas as pd
+
+from data_processor import build_artist_info, clean_role_name
+
+
+# Indexes created on the connections table
+CONNECTION_INDEXES = {
+    'idx_connections_musician': ['musician'],
+    'idx_connections_main_artist': ['main_artist'],
+    'idx_connections_album': ['album'],
+    'idx_connections_role': ['role'],
+    'idx_connections_clean_role': ['clean_role'],
+}
+
+STATS_COLUMNS_EXCLUDED = {'records'}
+
+
+def connect(db_path):
+    """Open a connection to the SQLite store."""
+    return sqlite3.connect(db_path)
+
+
+def _quote(identifier):
+    """Quote a column or table name for use in SQL."""
+    return '"' + str(identifier).replace('"', '""') + '"'
+
+
+def save_to_database(db_path, network_df, collection_df, musician_stats_df):
+    """
+    Write the pipeline state to an SQLite database, replacing earlier contents.
+
+    Tables:
+        connections: one row per musician credit (network_df plus clean_role)
+        artist_genres, artist_styles: one row per artist/genre and artist/style
+        musician_stats: one row per musician (stats frame without record lists)
+        musician_records: one row per musician/record appearance
+
+    Args:
+        db_path: Path of the SQLite database file
+        network_df: DataFrame from create_network_data
+        collection_df: Original collection DataFrame
+        musician_stats_df: DataFrame from analyze_top_musicians
+
+    Returns:
+        db_path
+    """
+    connections_df = network_df.copy()
+    connections_df['clean_role'] = connections_df['role'].apply(clean_role_name)
+
+    artist_info = build_artist_info(collection_df)
+    genres_df = pd.DataFrame(
+        [(artist, genre) for artist, info in artist_info.items() for genre in info['genres']],
+        columns=['artist', 'genre']
+    )
+    styles_df = pd.DataFrame(
+        [(artist, style) for artist, info in artist_info.items() for style in info['styles']],
+        columns=['artist', 'style']
+    )
+
+    stats_columns = [col for col in musician_stats_df.columns if col not in STATS_COLUMNS_EXCLUDED]
+    stats_df = musician_stats_df[stats_columns]
+    records_df = (
+        musician_stats_df[['musician', 'records']]
+        .explode('records')
+        .dropna()
+        .rename(columns={'records': 'record'})
+    )
+
+    conn = connect(db_path)
+    try:
+        with conn:
+            connections_df.to_sql('connections', conn, if_exists='replace', index=False, chunksize=10000)
+            genres_df.to_sql('artist_genres', conn, if_exists='replace', index=False)
+            styles_df.to_sql('artist_styles', conn, if_exists='replace', index=False)
+            stats_df.to_sql('musician_stats', conn, if_exists='replace', index=False)
+            records_df.to_sql('musician_records', conn, if_exists='replace', index=False, chunksize=10000)
+
+            for name, columns in CONNECTION_INDEXES.items():
+                conn.execute(
+                    f"CREATE INDEX {name} ON connections ({', '.join(_quote(c) for c in columns)})"
+                )
+            conn.execute("CREATE UNIQUE INDEX idx_musician_stats_musician ON musician_stats (musician)")
+            conn.execute("CREATE INDEX idx_musician_records_musician ON musician_records (musician)")
+            conn.execute("CREATE INDEX idx_artist_genres_artist ON artist_genres (artist)")
+            conn.execute("CREATE INDEX idx_artist_genres_genre ON artist_genres (genre)")
+            conn.execute("CREATE INDEX idx_artist_styles_artist ON artist_styles (artist)")
+            conn.execute("CREATE INDEX idx_artist_styles_style ON artist_styles (style)")
+        conn.execute("ANALYZE")
+    finally:
+        conn.close()
+
+    return db_path
+
+
+def _table_columns(conn, table):
+    return [row[1] for row in conn.execute(f"PRAGMA table_info({_quote(table)})")]
+
+
+def find_connections(conn, musician=None, main_artist=None, album=None, role=None,
+                     clean_role=None, genre=None, style=None, **column_filters):
+    """
+    Find musician credits matching the given filters.
+
+    Named filters use the indexed columns. Any other collection column can
+    be filtered by keyword: a scalar matches exactly, a (low, high) tuple
+    matches an inclusive range. For example, everyone who played bass on
+    1960s Prestige records:
+
+        find_connections(conn, clean_role='Bass', Label='Prestige', Year=(1960, 1969))
+
+    Args:
+        conn: Connection from connect()
+        musician, main_artist, album, role, clean_role: Exact-match filters
+        genre, style: Restrict to main artists with this genre/style
+        **column_filters: Filters on other connection columns
+
+    Returns:
+        pandas.DataFrame of matching connection rows
+    """
+    columns = set(_table_columns(conn, 'connections'))
+    conditions = []
+    params = []
+
+    named = {
+        'musician': musician,
+        'main_artist': main_artist,
+        'album': album,
+        'role': role,
+        'clean_role': clean_role,
+    }
+    for column, value in named.items():
+        if value is not None:
+            conditions.append(f"{_quote(column)} = ?")
+            params.append(value)
+
+    if genre is not None:
+        conditions.append("main_artist IN (SELECT artist FROM artist_genres WHERE genre = ?)")
+        params.append(genre)
+    if style is not None:
+        conditions.append("main_artist IN (SELECT artist FROM artist_styles WHERE style = ?)")
+        params.append(style)
+
+    for column, value in column_filters.items():
+        if column not in columns:
+            raise ValueError(f"Unknown column '{column}'")
+        if isinstance(value, tuple):
+            low, high = value
+            conditions.append(f"{_quote(column)} BETWEEN ? AND ?")
+            params.extend([low, high])
+        else:
+            conditions.append(f"{_quote(column)} = ?")
+            params.append(value)
+
+    query = "SELECT * FROM connections"
+    if conditions:
+        query += " WHERE " + " AND ".join(conditions)
+    return pd.read_sql_query(query, conn, params=params)
+
+
+def get_top_musicians_by_metric(conn, metric='total_records', limit=20):
+    """
+    Get top musicians by a statistics column, as analysis.get_top_musicians_by_metric.
+
+    Returns:
+        pandas.DataFrame of top musicians (without record lists)
+    """
+    if metric not in _table_columns(conn, 'musician_stats'):
+        raise ValueError(f"Unknown metric '{metric}'")
+    return pd.read_sql_query(
+        f"SELECT * FROM musician_stats ORDER BY {_quote(metric)} DESC LIMIT ?",
+        conn,
+        params=[limit]
+    )
+
+
+def get_session_musicians(conn, min_records=2, min_session_ratio=0.7):
+    """
+    Get session musicians, as analysis.get_session_musicians.
+
+    Returns:
+        pandas.DataFrame of session musicians (without record lists)
+    """
+    return pd.read_sql_query(
+        """
+        SELECT * FROM musician_stats
+        WHERE total_records >= ? AND session_ratio >= ? AND as_session_musician >= 2
+        ORDER BY as_session_musician DESC
+        """,
+        conn,
+        params=[min_records, min_session_ratio]
+    )
+
+
+def search_musicians(conn, search_term, limit=10):
+    """
+    Search for musicians by name, as analysis.search_musicians.
+
+    Returns:
+        pandas.DataFrame of matching musicians (without record lists)
+    """
+    escaped = search_term.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+    return pd.read_sql_query(
+        """
+        SELECT * FROM musician_stats
+        WHERE musician LIKE ? ESCAPE '\\'
+        ORDER BY total_records DESC
+        LIMIT ?
+        """,
+        conn,
+        params=[f"%{escaped}%", limit]
+    )
+
+
+def get_musician_debug_info(conn, musician_name):
+    """
+    Get detailed information for one musician, as analysis.get_musician_debug_info.
+
+    Returns:
+        Dictionary with detailed musician information or None if not found
+    """
+    albums = [row[0] for row in conn.execute(
+        "SELECT DISTINCT album FROM connections WHERE musician = ?", (musician_name,)
+    )]
+    if not albums:
+        return None
+
+    collaborators = [row[0] for row in conn.execute(
+        """
+        SELECT DISTINCT musician FROM connections
+        WHERE album IN (SELECT album FROM connections WHERE musician = ?)
+          AND musician != ?
+        """,
+        (musician_name, musician_name)
+    )]
+    roles = [row[0] for row in conn.execute(
+        "SELECT DISTINCT role FROM connections WHERE musician = ?", (musician_name,)
+    )]
+
+    stats_df = pd.read_sql_query(
+        "SELECT * FROM musician_stats WHERE musician = ?", conn, params=[musician_name]
+    )
+    stats = stats_df.iloc[0].to_dict() if not stats_df.empty else {}
+    stats['records'] = [row[0] for row in conn.execute(
+        "SELECT record FROM musician_records WHERE musician = ?", (musician_name,)
+    )]
+
+    return {
+        'musician': musician_name,
+        'albums': albums,
+        'collaborators': collaborators,
+        'roles': roles,
+        'stats': stats,
+        'total_records': len(albums),
+        'total_collaborators': len(collaborators)
+    }
+
+
+def get_collaboration_stats(conn):
+    """
+    Get general collaboration statistics, as analysis.get_collaboration_stats.
+
+    Returns:
+        Dictionary with various network statistics
+    """
+    (total, musicians, artists, albums, roles), = conn.execute(
+        """
+        SELECT COUNT(*), COUNT(DISTINCT musician), COUNT(DISTINCT main_artist),
+               COUNT(DISTINCT album), COUNT(DISTINCT role)
+        FROM connections
+        """
+    )
+    top_musician = conn.execute(
+        "SELECT musician FROM connections GROUP BY musician ORDER BY COUNT(*) DESC LIMIT 1"
+    ).fetchone()
+    top_artist = conn.execute(
+        "SELECT main_artist FROM connections GROUP BY main_artist ORDER BY COUNT(*) DESC LIMIT 1"
+    ).fetchone()
+
+    return {
+        'total_connections': total,
+        'unique_musicians': musicians,
+        'unique_artists': artists,
+        'unique_albums': albums,
+        'unique_roles': roles,
+        'most_collaborative_musician': top_musician[0] if top_musician else None,
+        'most_collaborative_artist': top_artist[0] if top_artist else None
+    }
@@ -0,0 +1,204 @@
+"""
+Temporal snapshot module for musician network analysis.
+Buckets credits by release period (year or decade) and precomputes the
+per-period increments of link weights and musician record counts, so
+cumulative snapshots of the network are built by stepping from one period
+to the next instead of re-filtering every link.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+def assign_periods(years, period_years=10):
+    """
+    Map release years to the first year of their period.
+
+    Args:
+        years: Sequence of years (numbers or numeric strings)
+        period_years: Period length (1 for years, 10 for decades)
+
+    Returns:
+        pandas.Series of period start years (NaN where the year is unknown)
+    """
+    years = pd.to_numeric(pd.Series(years), errors='coerce')
+    return (years // period_years) * period_years
+
+
+def period_label(start, period_years=10):
+    """Display label of a period: "1959", "1950s" or "1950-1954"."""
+    if period_years == 1:
+        return str(start)
+    if period_years == 10 and start % 10 == 0:
+        return f"{start}s"
+    return f"{start}-{start + period_years - 1}"
+
+
+def _period_csr(periods, columns, n_periods, weights=()):
+    """
+    CSR rows per period of (column, count[, weight sums]) increments.
+
+    Returns:
+        Dictionary with indptr, indices, data (number of entries per period
+        and column) and one summed array per extra weight
+    """
+    n_columns = int(columns.max()) + 1 if len(columns) else 1
+    keys, inverse, counts = np.unique(periods * n_columns + columns, return_inverse=True, return_counts=True)
+    rows = keys // n_columns
+    indptr = np.zeros(n_periods + 1, dtype=np.int64)
+    np.cumsum(np.bincount(rows, minlength=n_periods), out=indptr[1:])
+    matrix = {'indptr': indptr, 'indices': keys % n_columns, 'data': counts}
+    for name, values in weights:
+        matrix[name] = np.bincount(inverse, weights=values, minlength=len(keys)).astype(np.int64)
+    return matrix
+
+
+def build_period_snapshots(network_df, network_data, musician_stats_df, year_column='Year', period_years=10):
+    """
+    Precompute cumulative network snapshots per release period.
+
+    A snapshot for period p contains every credit released up to the end of
+    p. Only increments are stored; a snapshot is the sum of the increments
+    of all periods up to it, and neighbouring snapshots differ by one
+    period's increments:
+
+        link_deltas: periods x links (network_data['links'] order), credits added
+        musician_deltas: periods x musicians (musician_stats_df order), records
+                         added (data) and records added as main artist (main)
+        record_periods: period index of each record, in the record order of
+                        analysis.build_musician_filter_matrices
+
+    Credits with an unknown year are left out of every snapshot; they only
+    appear in the full network.
+
+    Args:
+        network_df: DataFrame from create_network_data
+        network_data: Dictionary from create_echarts_network_data
+        musician_stats_df: DataFrame from analyze_top_musicians
+        year_column: Collection column holding the release year
+        period_years: Period length (1 for years, 10 for decades)
+
+    Returns:
+        Dictionary with periods, labels, summary (cumulative node/link/credit
+        counts per period) and the increment arrays; None if the column is
+        missing or holds no years
+    """
+    if year_column not in network_df.columns:
+        return None
+    starts = assign_periods(network_df[year_column], period_years).to_numpy()
+    known = ~np.isnan(starts)
+    if not known.any():
+        return None
+
+    first = int(starts[known].min())
+    periods = list(range(first, int(starts[known].max()) + 1, period_years))
+    n_periods = len(periods)
+    # Unknown years get the sentinel period n_periods
+    period_codes = np.full(len(network_df), n_periods, dtype=np.int64)
+    period_codes[known] = ((starts[known] - first) // period_years).astype(np.int64)
+
+    # Link weights: one credit per network row, as in create_echarts_network_data
+    links = network_data['links']
+    link_index = {(link['source'], link['target']): i for i, link in enumerate(links)}
+    link_codes = np.fromiter(
+        (link_index.get(pair, -1) for pair in zip(network_df['musician'], network_df['main_artist'])),
+        dtype=np.int64,
+        count=len(network_df)
+    )
+    counted = known & (link_codes >= 0)
+    link_deltas = _period_csr(period_codes[counted], link_codes[counted], n_periods)
+
+    # Musician record counts: each record counts once, in its earliest period
+    record_keys = network_df['main_artist'].astype(str) + ' - ' + network_df['album'].astype(str)
+    record_codes, record_labels = pd.factorize(record_keys)
+    record_periods = np.full(len(record_labels), n_periods, dtype=np.int64)
+    np.minimum.at(record_periods, record_codes, period_codes)
+
+    musician_index = pd.Series(np.arange(len(musician_stats_df)), index=musician_stats_df['musician'])
+    musician_codes = musician_index.reindex(network_df['musician']).to_numpy()
+    listed = ~np.isnan(musician_codes)
+    n_records = max(len(record_labels), 1)
+    pairs = np.unique(musician_codes[listed].astype(np.int64) * n_records + record_codes[listed])
+    pair_musicians = pairs // n_records
+    pair_records = pairs % n_records
+    pair_periods = record_periods[pair_records]
+    dated = pair_periods < n_periods
+
+    musician_names = musician_stats_df['musician'].to_numpy()
+    record_array = np.asarray(record_labels)
+    is_main = np.fromiter(
+        (record_array[r].startswith(f"{musician_names[m]} - ")
+         for m, r in zip(pair_musicians[dated], pair_records[dated])),
+        dtype=np.int64,
+        count=int(dated.sum())
+    )
+    musician_deltas = _period_csr(
+        pair_periods[dated], pair_musicians[dated], n_periods, weights=[('main', is_main)]
+    )
+
+    # Cumulative totals per period for the slider labels
+    link_first = np.full(len(links), n_periods, dtype=np.int64)
+    np.minimum.at(link_first, link_codes[counted], period_codes[counted])
+    node_index = {node['id']: i for i, node in enumerate(network_data['nodes'])}
+    node_first = np.full(len(node_index), n_periods, dtype=np.int64)
+    for i, link in enumerate(links):
+        for endpoint in (link['source'], link['target']):
+            if endpoint in node_index:
+                position = node_index[endpoint]
+                node_first[position] = min(node_first[position], link_first[i])
+
+    def cumulative(first_periods, weights=None):
+        counts = np.bincount(first_periods, weights=weights, minlength=n_periods + 1)[:n_periods]
+        return np.cumsum(counts).astype(np.int64).tolist()
+
+    summary = {
+        'nodes': cumulative(node_first),
+        'links': cumulative(link_first),
+        'credits': cumulative(period_codes[counted]),
+    }
+
+    return {
+        'year_column': year_column,
+        'period_years': period_years,
+        'periods': periods,
+        'labels': [period_label(start, period_years) for start in periods],
+        'summary': summary,
+        'link_deltas': link_deltas,
+        'musician_deltas': musician_deltas,
+        'record_periods': record_periods,
+    }
+
+
+def network_snapshot(network_data, snapshots, period):
+    """
+    Network as released up to the end of one period.
+
+    Args:
+        network_data: Dictionary from create_echarts_network_data
+        snapshots: Dictionary from build_period_snapshots
+        period: Period start year (e.g. 1960) or period index
+
+    Returns:
+        Dictionary with nodes and links (copies carrying the cumulative
+        link value for the period)
+    """
+    periods = snapshots['periods']
+    position = periods.index(period) if period in periods else int(period)
+    if not 0 <= position < len(periods):
+        raise ValueError(f"Unknown period {period}")
+
+    deltas = snapshots['link_deltas']
+    end = deltas['indptr'][position + 1]
+    values = np.bincount(
+        deltas['indices'][:end], weights=deltas['data'][:end], minlength=len(network_data['links'])
+    ).astype(np.int64)
+
+    links = [
+        dict(link, value=int(values[i]))
+        for i, link in enumerate(network_data['links']) if values[i] > 0
+    ]
+    node_ids = {link['source'] for link in links} | {link['target'] for link in links}
+    return {
+        'nodes': [node for node in network_data['nodes'] if node['id'] in node_ids],
+        'links': links,
+    }
@@ -0,0 +1,92 @@
+"""
+Landmark distance estimates: the bounds from estimate_distances must hold
+against exact breadth-first distances on a small musician-record graph.
+"""
+
+import sys
+from collections import deque
+from itertools import product
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+REPO_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_DIR))
+
+from paths import build_landmark_distances, build_record_graph, estimate_distances, shortest_path  # noqa: E402
+
+
+def _network(seed=7, n_musicians=40, n_records=25, credits=70):
+    """Random credits, plus a separate two-musician record so some pairs are unreachable."""
+    rng = np.random.default_rng(seed)
+    rows = [
+        {'musician': f"Player {m}", 'main_artist': f"Artist {r % 5}", 'album': f"Album {r}"}
+        for m, r in zip(rng.integers(0, n_musicians, credits), rng.integers(0, n_records, credits))
+    ]
+    rows += [
+        {'musician': 'Loner A', 'main_artist': 'Island', 'album': 'Alone'},
+        {'musician': 'Loner B', 'main_artist': 'Island', 'album': 'Alone'},
+    ]
+    return pd.DataFrame(rows)
+
+
+def _exact_distances(network_df):
+    """Record-hop distances between every pair of musicians by plain BFS (None if unreachable)."""
+    records = network_df['main_artist'] + ' - ' + network_df['album']
+    by_record = network_df.groupby(records)['musician'].apply(set).to_dict()
+    neighbours = {name: set() for name in network_df['musician']}
+    for members in by_record.values():
+        for name in members:
+            neighbours[name] |= members - {name}
+
+    distances = {}
+    for source in neighbours:
+        seen = {source: 0}
+        queue = deque([source])
+        while queue:
+            name = queue.popleft()
+            for other in neighbours[name]:
+                if other not in seen:
+                    seen[other] = seen[name] + 1
+                    queue.append(other)
+        for target in neighbours:
+            distances[source, target] = seen.get(target)
+    return distances
+
+
+def test_landmark_bounds_contain_exact_distances():
+    network_df = _network()
+    graph = build_record_graph(network_df)
+    exact = _exact_distances(network_df)
+    sources, targets = zip(*exact)
+
+    lower, upper = estimate_distances(graph, build_landmark_distances(graph, n_landmarks=4), sources, targets)
+
+    for source, target, low, high in zip(sources, targets, lower, upper):
+        distance = exact[source, target]
+        if distance is None:
+            assert (low, high) == (-1, -1), (source, target)
+        elif high >= 0:
+            assert low <= distance <= high, (source, target, low, distance, high)
+
+
+def test_every_musician_as_landmark_gives_exact_distances():
+    network_df = _network(seed=11)
+    graph = build_record_graph(network_df)
+    exact = _exact_distances(network_df)
+    names = list(graph['musicians'])
+    sources, targets = zip(*product(names, names))
+
+    lower, upper = estimate_distances(
+        graph, build_landmark_distances(graph, n_landmarks=len(names)), sources, targets
+    )
+
+    for source, target, low, high in zip(sources, targets, lower, upper):
+        distance = exact[source, target]
+        expected = -1 if distance is None else distance
+        assert low == high == expected, (source, target)
+        path = shortest_path(graph, source, target)
+        assert (path is None) == (distance is None)
+        if path is not None:
+            assert path['distance'] == distance
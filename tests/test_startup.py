@@ -0,0 +1,43 @@
+"""
+Start-up budget of the command line: main.py must not import the heavy
+modules (pandas, NumPy, the page templates) before a stage needs them.
+"""
+
+import subprocess
+import sys
+from pathlib import Path
+
+REPO_DIR = Path(__file__).resolve().parent.parent
+
+# Cumulative import time of main (its own imports included), in milliseconds
+MAIN_IMPORT_BUDGET_MS = 100
+HEAVY_MODULES = ('pandas', 'numpy', 'html_generator')
+
+
+def _import_times(*args):
+    """Run Python with -X importtime; returns {module: cumulative microseconds}."""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', *args],
+        cwd=REPO_DIR, capture_output=True, text=True, timeout=60
+    )
+    assert result.returncode == 0, result.stderr
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+def test_help_does_not_import_heavy_modules():
+    imported = _import_times('main.py', '--help')
+    for module in HEAVY_MODULES:
+        assert not any(name == module or name.startswith(module + '.') for name in imported), \
+            f"'main.py --help' imports {module}"
+
+
+def test_main_import_time_within_budget():
+    imported = _import_times('-c', 'import main')
+    assert imported['main'] / 1000 < MAIN_IMPORT_BUDGET_MS, \
+        f"importing main took {imported['main'] / 1000:.1f} ms (budget {MAIN_IMPORT_BUDGET_MS} ms)"
@@ -0,0 +1,79 @@
+"""
+File watching module for musician network analysis.
+Polls the input file and triggers a re-run once changes have settled.
+"""
+
+import os
+import time
+
+from pipeline import file_digest
+
+
+def file_signature(path):
+    """Return (mtime, size) for a file, or None if it does not exist."""
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _current_digest(path):
+    """Return the file's digest, or None if it was removed before it could be read."""
+    try:
+        return file_digest(path)
+    except FileNotFoundError:
+        return None
+
+
+def watch_file(path, callback, poll_interval=1.0, debounce=2.0):
+    """
+    Call callback every time the file at path changes, until interrupted.
+
+    Changes are detected by polling mtime and size. A change is only acted on
+    once the file has stayed unchanged for `debounce` seconds, so a sync job
+    that is still writing the file does not trigger a run on partial data.
+    Touches that leave the contents identical are ignored.
+
+    Args:
+        path: File to watch
+        callback: Function called with no arguments after each change
+        poll_interval: Seconds between polls
+        debounce: Seconds the file must be stable before callback runs
+    """
+    last_signature = file_signature(path)
+    last_digest = _current_digest(path) if last_signature else None
+
+    try:
+        while True:
+            time.sleep(poll_interval)
+            signature = file_signature(path)
+            if signature == last_signature:
+                continue
+
+            # Wait for the file to settle
+            stable_since = time.monotonic()
+            while time.monotonic() - stable_since < debounce:
+                time.sleep(poll_interval)
+                current = file_signature(path)
+                if current != signature:
+                    signature = current
+                    stable_since = time.monotonic()
+
+            last_signature = signature
+            if signature is None:
+                # File was removed; wait for it to come back
+                continue
+
+            digest = _current_digest(path)
+            if digest is None:
+                # File vanished after settling; treat it like a removal
+                last_signature = None
+                continue
+            if digest == last_digest:
+                continue
+            last_digest = digest
+
+            callback()
+    except KeyboardInterrupt:
+        pass